@@ -0,0 +1,50 @@
+"""
+Compare the throughput of the default and buffered file handlers
+
+Usage: python -m benchmarks.file_handler [records]
+"""
+
+import logging
+import os
+import sys
+import tempfile
+import time
+
+from styled_logging import create_file_handler
+
+
+def make_records(n: int):
+    levels = [logging.DEBUG, logging.INFO, logging.WARNING]
+    return [
+        logging.LogRecord(
+            "bench", levels[i % 3], __file__, 0, "record %d of %s", (i, "bench"), None
+        )
+        for i in range(n)
+    ]
+
+
+def run(records, **kwargs) -> float:
+    with tempfile.TemporaryDirectory() as tmp:
+        handler = create_file_handler(
+            os.path.join(tmp, "bench.log"), level=logging.DEBUG, **kwargs
+        )
+        start = time.perf_counter()
+        for record in records:
+            handler.handle(record)
+        handler.close()
+        return time.perf_counter() - start
+
+
+def main(n: int = 100_000):
+    records = make_records(n)
+
+    for name, kwargs in (
+        ("RawFileHandler", {}),
+        ("BufferedFileHandler", {"buffered": True}),
+    ):
+        elapsed = run(records, **kwargs)
+        print(f"{name:<20} {n / elapsed:>12,.0f} records/s  ({elapsed:.3f}s)")
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
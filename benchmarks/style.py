@@ -0,0 +1,36 @@
+"""
+Measure the cost of styling text with styled_logging.style
+
+Usage: python -m benchmarks.style [calls]
+"""
+
+import sys
+import timeit
+
+from styled_logging import style
+from styled_logging.color import _style_prefix
+
+CASES = {
+    "named fg": dict(fg="red"),
+    "fg, bg, bold": dict(fg="white", bg="red", bold=True),
+    "rgb fg, underline": dict(fg=(255, 128, 0), underline=True),
+}
+
+
+def main(n: int = 200_000):
+    for name, kwargs in CASES.items():
+        cached = timeit.timeit(lambda: style("message", **kwargs), number=n)
+
+        def uncached():
+            _style_prefix.cache_clear()
+            style("message", **kwargs)
+
+        rebuilt = timeit.timeit(uncached, number=n)
+        print(
+            f"{name:<20} cached {cached / n * 1e9:>6.0f} ns/call  "
+            f"uncached {rebuilt / n * 1e9:>6.0f} ns/call  ({rebuilt / cached:.1f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,270 @@
+"""
+Measure formatting, styling and handler throughput for realistic workloads
+
+Usage:
+    python -m benchmarks.suite                      run every benchmark
+    python -m benchmarks.suite -k file              run benchmarks whose name contains "file"
+    python -m benchmarks.suite --save base.json     save the results as a baseline
+    python -m benchmarks.suite --compare base.json  report changes against a baseline
+
+Each benchmark reports records per second, per-record latency percentiles, and the
+bytes allocated while handling one record, measured in a separate tracemalloc pass.
+"""
+
+import argparse
+import io
+import json
+import logging
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+import typing as t
+
+from styled_logging import (
+    MultiFormatter,
+    create_console_handler,
+    create_file_handler,
+    prettify,
+    style,
+)
+
+MIXED_LEVELS = [
+    logging.DEBUG,
+    logging.INFO,
+    logging.INFO,
+    logging.WARNING,
+    logging.ERROR,
+]
+
+
+def make_records(
+    n: int, levels: t.Sequence[int], exceptions: int = 0
+) -> t.List[logging.LogRecord]:
+    """Create records cycling through `levels`, with `exceptions` distinct exceptions"""
+    errors = []
+    for i in range(exceptions):
+        try:
+            raise ValueError(f"failure {i}")
+        except ValueError:
+            errors.append(sys.exc_info())
+
+    return [
+        logging.LogRecord(
+            "bench",
+            levels[i % len(levels)],
+            __file__,
+            i,
+            "request %d handled in %.2fms by %s",
+            (i, i / 7, "worker"),
+            errors[i % exceptions] if exceptions else None,
+        )
+        for i in range(n)
+    ]
+
+
+class Benchmark(t.NamedTuple):
+    records: t.Callable[[int], t.List[logging.LogRecord]]
+    setup: t.Callable[[str], t.Callable[[logging.LogRecord], t.Any]]
+
+
+def formatter(cls=MultiFormatter):
+    return lambda _: prettify(cls)().format
+
+
+def console_handler(_):
+    handler = create_console_handler(level=logging.DEBUG)
+    handler.setStream(io.StringIO())
+    return handler.handle
+
+
+def devnull_handler(tmp: str):
+    handler = create_console_handler(level=logging.DEBUG)
+    handler.setStream(open(os.devnull, "w", encoding="utf-8"))
+    return handler.handle
+
+
+def file_handler(**kwargs):
+    def setup(tmp: str):
+        handler = create_file_handler(
+            os.path.join(tmp, "bench.log"), level=logging.DEBUG, **kwargs
+        )
+        return handler.handle
+
+    return setup
+
+
+def styler(_):
+    return lambda record: style(record.msg, fg="red", bold=True)
+
+
+BENCHMARKS: t.Dict[str, Benchmark] = {
+    "format.info": Benchmark(lambda n: make_records(n, [logging.INFO]), formatter()),
+    "format.mixed": Benchmark(lambda n: make_records(n, MIXED_LEVELS), formatter()),
+    "format.exceptions": Benchmark(
+        lambda n: make_records(n, [logging.ERROR], exceptions=10), formatter()
+    ),
+    "style": Benchmark(lambda n: make_records(n, [logging.INFO]), styler),
+    "console.info": Benchmark(
+        lambda n: make_records(n, [logging.INFO]), console_handler
+    ),
+    "console.mixed": Benchmark(
+        lambda n: make_records(n, MIXED_LEVELS), console_handler
+    ),
+    "console.fd.mixed": Benchmark(
+        lambda n: make_records(n, MIXED_LEVELS), devnull_handler
+    ),
+    "file.mixed": Benchmark(lambda n: make_records(n, MIXED_LEVELS), file_handler()),
+    "file.buffered.mixed": Benchmark(
+        lambda n: make_records(n, MIXED_LEVELS), file_handler(buffered=True)
+    ),
+    "file.exceptions": Benchmark(
+        lambda n: make_records(n, [logging.ERROR], exceptions=10), file_handler()
+    ),
+    "file.binary.mixed": Benchmark(
+        lambda n: make_records(n, MIXED_LEVELS), file_handler(binary=True)
+    ),
+}
+
+
+def percentile(sorted_values: t.List[float], q: float) -> float:
+    return sorted_values[min(len(sorted_values) - 1, int(q * len(sorted_values)))]
+
+
+def measure(bench: Benchmark, n: int) -> t.Dict[str, float]:
+    records = bench.records(n)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        run = bench.setup(tmp)
+        latencies = []
+        clock = time.perf_counter_ns
+
+        start = clock()
+        for record in records:
+            before = clock()
+            run(record)
+            latencies.append(clock() - before)
+        elapsed = (clock() - start) / 1e9
+
+        # allocation pass, kept separate since tracing slows everything down
+        allocated = []
+        tracemalloc.start()
+        for record in records[: min(n, 1000)]:
+            tracemalloc.reset_peak()
+            base, _ = tracemalloc.get_traced_memory()
+            run(record)
+            allocated.append(tracemalloc.get_traced_memory()[1] - base)
+        tracemalloc.stop()
+
+    latencies.sort()
+    return {
+        "records_per_s": n / elapsed,
+        "p50_us": percentile(latencies, 0.50) / 1e3,
+        "p90_us": percentile(latencies, 0.90) / 1e3,
+        "p99_us": percentile(latencies, 0.99) / 1e3,
+        "alloc_bytes": statistics.mean(allocated),
+    }
+
+
+def measure_threads(n: int, threads: int = 4) -> t.Dict[str, float]:
+    """Throughput of several threads logging through one console handler"""
+    logger = logging.getLogger("bench.threads")
+    logger.propagate = False
+    logger.setLevel(logging.DEBUG)
+    handler = create_console_handler(level=logging.DEBUG)
+    handler.setStream(io.StringIO())
+    logger.addHandler(handler)
+
+    per_thread = n // threads
+    ready = threading.Barrier(threads + 1)
+
+    def work():
+        ready.wait()
+        for i in range(per_thread):
+            logger.log(MIXED_LEVELS[i % len(MIXED_LEVELS)], "request %d", i)
+
+    workers = [threading.Thread(target=work) for _ in range(threads)]
+    for worker in workers:
+        worker.start()
+
+    ready.wait()
+    start = time.perf_counter()
+    for worker in workers:
+        worker.join()
+    elapsed = time.perf_counter() - start
+
+    logger.removeHandler(handler)
+    return {"records_per_s": per_thread * threads / elapsed}
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> bool:
+    """Print changes against the baseline, returning whether anything regressed"""
+    regressed = False
+
+    for name, stats in results.items():
+        old = baseline.get(name)
+        if old is None:
+            continue
+
+        change = stats["records_per_s"] / old["records_per_s"] - 1
+        flag = ""
+        if change < -threshold:
+            flag = "  REGRESSION"
+            regressed = True
+
+        print(f"{name:<22} {change:>+8.1%} records/s{flag}")
+
+    return regressed
+
+
+def main(argv: t.Sequence[str] = None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("-n", type=int, default=20_000, help="records per benchmark")
+    parser.add_argument("-k", default="", help="only run benchmarks matching this")
+    parser.add_argument("--save", help="save the results to this file")
+    parser.add_argument("--compare", help="compare the results to this file")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.1,
+        help="slowdown that counts as a regression when comparing",
+    )
+    args = parser.parse_args(argv)
+
+    results = {}
+    print(
+        f"{'benchmark':<22} {'records/s':>12} {'p50 us':>8} {'p90 us':>8} "
+        f"{'p99 us':>8} {'alloc B':>8}"
+    )
+
+    for name, bench in BENCHMARKS.items():
+        if args.k not in name:
+            continue
+        stats = results[name] = measure(bench, args.n)
+        print(
+            f"{name:<22} {stats['records_per_s']:>12,.0f} {stats['p50_us']:>8.2f} "
+            f"{stats['p90_us']:>8.2f} {stats['p99_us']:>8.2f} "
+            f"{stats['alloc_bytes']:>8,.0f}"
+        )
+
+    if args.k in "threads.console":
+        stats = results["threads.console"] = measure_threads(args.n)
+        print(f"{'threads.console':<22} {stats['records_per_s']:>12,.0f}")
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(results, f, indent=2)
+
+    if args.compare:
+        with open(args.compare, "r") as f:
+            baseline = json.load(f)
+        print()
+        if compare(results, baseline, args.threshold):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
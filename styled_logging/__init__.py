@@ -1,11 +1,25 @@
 import logging
-from .handlers import create_console_handler, create_file_handler
+from .handlers import (
+    create_console_handler,
+    create_file_handler,
+    create_ring_buffer_handler,
+)
+from .background import BackgroundHandler
+from .aio import AsyncHandler
+from .buffered import BufferedFileHandler
 from .color import style
+from .dispatch import LevelDispatcher
+from .raw import RawFileHandler, RawStreamHandler
+from .ring import RingBufferHandler
+from .sampling import SamplingFilter
+from .stats import HandlerStats, instrument
+from .timestamps import set_time_format
 from .context import LoggingContext, MultiContext, logging_context
+from .scoped import ScopedLoggingContext
 from .formatters import (
     MultiFormatter,
     DEFAULT_FORMATS,
-    DEFAULT_FORMATTERS,
+    PLAIN_FORMATS,
     make_formatters,
     DEBUG_FMT,
     INFO_FMT,
@@ -13,18 +27,34 @@ from .formatters import (
     ERROR_FMT,
     CRITICAL_FMT,
 )
-from .decorator import prettify
+from .decorator import prettify, TracebackCache
 
 
 def setup(
     console_level: int = logging.INFO,
     filename: str = None,
     file_level: int = logging.WARNING,
+    background: bool = False,
+    collector: str = None,
 ):
-    """Quick logging setup. Supports setting log level, and logging to a file."""
-    handlers = [create_console_handler(level=console_level)]
-    if filename:
-        handlers.append(create_file_handler(filename, level=file_level))
+    """
+    Quick logging setup. Supports setting log level, and logging to a file.
+
+    Pass the address of a styled_logging.Collector as `collector` to send records to it
+    instead of writing them in this process. The levels still decide which records
+    are sent, and `filename` is left to the collector.
+    """
+    if collector:
+        from .collector import CollectorHandler
+
+        level = min(console_level, file_level) if filename else console_level
+        handlers = [CollectorHandler(collector, level=level)]
+    else:
+        handlers = [create_console_handler(level=console_level, background=background)]
+        if filename:
+            handlers.append(
+                create_file_handler(filename, level=file_level, background=background)
+            )
 
     logging_context(handlers=handlers).__enter__()
 
@@ -32,13 +62,37 @@ def setup(
 __all__ = [
     "create_console_handler",
     "create_file_handler",
+    "create_ring_buffer_handler",
+    "BackgroundHandler",
+    "AsyncHandler",
+    "BinaryFileHandler",
+    "read_binary_log",
+    "BufferedFileHandler",
+    "RotatingFileHandler",
     "style",
     "LoggingContext",
     "MultiContext",
+    "LevelDispatcher",
+    "RateLimitFilter",
+    "RawStreamHandler",
+    "RawFileHandler",
+    "RingBufferHandler",
+    "SamplingFilter",
+    "HandlerStats",
+    "instrument",
+    "set_time_format",
+    "ScopedLoggingContext",
+    "Collector",
+    "CollectorHandler",
     "logging_context",
+    "ConfigContext",
+    "ConfigError",
+    "from_config",
     "MultiFormatter",
     "DEFAULT_FORMATS",
     "DEFAULT_FORMATTERS",
+    "PLAIN_FORMATS",
+    "PLAIN_FORMATTERS",
     "make_formatters",
     "DEBUG_FMT",
     "INFO_FMT",
@@ -47,6 +101,38 @@ __all__ = [
     "CRITICAL_FMT",
     "setup",
     "prettify",
+    "TracebackCache",
+    "JsonFormatter",
 ]
 
 __version__ = "0.0.4"
+
+# modules with heavy imports, like json, gzip or mmap, are imported on first use
+_LAZY = {
+    "BinaryFileHandler": "binary",
+    "read_binary_log": "binary",
+    "RotatingFileHandler": "rotating",
+    "RateLimitFilter": "ratelimit",
+    "Collector": "collector",
+    "CollectorHandler": "collector",
+    "ConfigContext": "config",
+    "ConfigError": "config",
+    "from_config": "config",
+    "JsonFormatter": "structured",
+}
+
+
+def __getattr__(name: str):
+    # the default formatters are built on first use, see formatters.py
+    if name in ("DEFAULT_FORMATTERS", "PLAIN_FORMATTERS"):
+        return getattr(formatters, name)
+
+    module = _LAZY.get(name)
+    if module is not None:
+        import importlib
+
+        value = getattr(importlib.import_module(f".{module}", __name__), name)
+        globals()[name] = value
+        return value
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,98 @@
+"""
+Render binary logs written by styled_logging.BinaryFileHandler
+
+    python -m styled_logging app.log --level WARNING --since 2024-01-31T12:00
+"""
+
+import argparse
+import logging
+import sys
+import typing as t
+
+from .binary import read_binary_log
+from .color import NO_COLOR, detect_color_depth, set_color_depth
+from .decorator import prettify
+from .formatters import MultiFormatter, _plain_formatters
+from .structured import JsonFormatter
+
+
+def _level(value: str) -> int:
+    if value.isdigit():
+        return int(value)
+
+    level = logging.getLevelName(value.upper())
+    if not isinstance(level, int):
+        raise argparse.ArgumentTypeError(f"unknown level {value!r}")
+    return level
+
+
+def _formatter(output: str) -> logging.Formatter:
+    if output == "json":
+        return JsonFormatter()
+
+    if output == "plain":
+        return prettify(MultiFormatter, color=False, indent=4)(
+            formatters=_plain_formatters()
+        )
+
+    return prettify(MultiFormatter, color=True, indent=4)()
+
+
+def _format(formatter: logging.Formatter, record: logging.LogRecord) -> str:
+    try:
+        return formatter.format(record)
+    except Exception as e:
+        # like mismatched arguments, which logging would have reported while writing
+        return (
+            f"{record.levelname} | <unformattable record {record.msg!r} "
+            f"with {record.args!r}: {type(e).__name__}: {e}>"
+        )
+
+
+def main(argv: t.Sequence[str] = None):
+    parser = argparse.ArgumentParser(
+        prog="python -m styled_logging",
+        description="Render binary logs written by styled_logging.BinaryFileHandler",
+    )
+    parser.add_argument("files", nargs="+", help="the log files to render")
+    parser.add_argument(
+        "-o",
+        "--output",
+        choices=("color", "plain", "json"),
+        help="the output format, color if stdout is a terminal and plain otherwise",
+    )
+    parser.add_argument(
+        "-l", "--level", type=_level, default=logging.NOTSET, help="the lowest level"
+    )
+    parser.add_argument(
+        "--since", help="skip records before this timestamp or ISO-8601 time"
+    )
+    parser.add_argument(
+        "--until", help="skip records after this timestamp or ISO-8601 time"
+    )
+    args = parser.parse_args(argv)
+
+    output = args.output
+    if output is None:
+        depth = detect_color_depth(sys.stdout)
+        output = "plain" if depth == NO_COLOR else "color"
+        if depth != NO_COLOR:
+            set_color_depth(depth)
+
+    formatter = _formatter(output)
+    write = sys.stdout.write
+
+    try:
+        for filename in args.files:
+            for record in read_binary_log(
+                filename, level=args.level, since=args.since, until=args.until
+            ):
+                write(_format(formatter, record) + "\n")
+    except BrokenPipeError:  # pragma: no cover
+        sys.stderr.close()
+    except (OSError, ValueError) as e:
+        parser.exit(1, f"{parser.prog}: error: {e}\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+import logging
+import typing as t
+
+from .background import DROP_NEWEST, BackgroundHandler
+
+# asyncio is imported on first use, it is only loaded by asyncio applications
+
+
+async def flush_handlers(handlers: t.Iterable[logging.Handler]):
+    """Flush handlers without blocking the event loop"""
+    import asyncio
+
+    loop = asyncio.get_running_loop()
+    for handler in handlers:
+        aflush = getattr(handler, "aflush", None)
+        if aflush is not None:
+            await aflush()
+        else:
+            await loop.run_in_executor(None, handler.flush)
+
+
+class AsyncHandler(BackgroundHandler):
+    """
+    A background handler for asyncio applications
+
+    Logging from a coroutine only snapshots the record and queues it, the wrapped
+    handler formats and writes it on a writer thread, so the event loop never waits for
+    the terminal or the disk. When the queue is full, new records are dropped instead
+    of blocking the loop. Coroutines that log a lot can wait for room with `drain`, and
+    for everything queued to be written with `aflush`.
+
+    Parameters
+    ----------
+    `handler` : logging.Handler
+        The handler that will format and write the records
+    `maxsize` : int, default 10_000
+        The maximum number of records waiting to be written
+    `overflow` : str, default "drop_newest"
+        What to do when the queue is full, see styled_logging.BackgroundHandler
+    `low_water` : int, default None
+        The queue depth `drain` waits for, half of `maxsize` if None
+    """
+
+    def __init__(
+        self,
+        handler: logging.Handler,
+        maxsize: int = 10_000,
+        overflow: str = DROP_NEWEST,
+        low_water: int = None,
+    ):
+        super().__init__(handler, maxsize=maxsize, overflow=overflow)
+        self.low_water = maxsize // 2 if low_water is None else low_water
+
+    def _wait_below(self, depth: int):
+        with self._not_full:
+            while len(self._queue) > depth and self._thread.is_alive():
+                self._not_full.wait()
+
+    async def drain(self):
+        """Wait until the queue is down to `low_water` records"""
+        if len(self._queue) <= self.low_water:
+            return
+
+        import asyncio
+
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self._wait_below, self.low_water)
+
+    async def aflush(self):
+        """Wait for all queued records to be written, without blocking the event loop"""
+        import asyncio
+
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self.flush)
@@ -0,0 +1,254 @@
+import copy
+import logging
+import threading
+from collections import deque
+
+from .capture import CapturedException, capture_exception
+from .decorator import is_prettified
+
+BLOCK = "block"
+DROP_OLDEST = "drop_oldest"
+DROP_NEWEST = "drop_newest"
+
+OVERFLOW_POLICIES = (BLOCK, DROP_OLDEST, DROP_NEWEST)
+
+_IMMUTABLE = (str, int, float, complex, bool, bytes, type(None))
+_CONTAINERS = (list, tuple, set, frozenset)
+
+# copying the arguments stops here, and the message is interpolated instead
+_MAX_ITEMS = 1000
+_MAX_DEPTH = 16
+
+
+def _level_formatter(formatter: logging.Formatter, levelno: int) -> logging.Formatter:
+    """The formatter that renders records of the level, looking into MultiFormatter"""
+    formatter_for = getattr(formatter, "formatter_for", None)
+    return (formatter_for and formatter_for(levelno)) or formatter
+
+
+def _renders_captured(handler: logging.Handler, levelno: int) -> bool:
+    """Whether the handler's formatters render a CapturedException's traceback"""
+    handlers = getattr(handler, "handlers", None)
+    if handlers is not None:
+        # a LevelDispatcher formats with each of its handlers
+        return all(_renders_captured(h, levelno) for h in handlers)
+
+    formatter = handler.formatter or logging._defaultFormatter
+    return is_prettified(_level_formatter(formatter, levelno))
+
+
+class _NotPlain(Exception):
+    pass
+
+
+def _copy_plain(value):
+    """
+    Copy builtin values, raising _NotPlain for anything else, for containers that
+    contain themselves, and past _MAX_ITEMS items or _MAX_DEPTH levels of nesting
+    """
+    remaining = _MAX_ITEMS
+    path = set()
+
+    def copy(value, depth: int):
+        nonlocal remaining
+        if isinstance(value, _IMMUTABLE):
+            return value
+
+        cls = type(value)
+        if cls not in _CONTAINERS and cls is not dict:
+            raise _NotPlain
+
+        remaining -= len(value)
+        if remaining < 0 or depth >= _MAX_DEPTH or id(value) in path:
+            raise _NotPlain
+
+        path.add(id(value))
+        try:
+            if cls is dict:
+                return {
+                    copy(k, depth + 1): copy(v, depth + 1) for k, v in value.items()
+                }
+            return cls(copy(item, depth + 1) for item in value)
+        finally:
+            path.discard(id(value))
+
+    return copy(value, 0)
+
+
+def _snapshot(record: logging.LogRecord, handler: logging.Handler) -> logging.LogRecord:
+    """Copy the record for `handler` to format later, see BackgroundHandler.prepare"""
+    record = copy.copy(record)
+
+    if record.args:
+        try:
+            record.args = _copy_plain(record.args)
+        except _NotPlain:
+            record.msg = record.getMessage()
+            record.args = None
+
+    if record.exc_info and record.exc_info[1] is not None:
+        exc_text = None
+        if not _renders_captured(handler, record.levelno):
+            formatter = handler.formatter or logging._defaultFormatter
+            formatter = _level_formatter(formatter, record.levelno)
+            exc_text = formatter.formatException(record.exc_info)
+
+        captured = capture_exception(record.exc_info[1], record.exc_info[2])
+        record.exc_info = (CapturedException, captured, None)
+        record.exc_text = exc_text
+
+    return record
+
+
+class BackgroundHandler(logging.Handler):
+    """
+    Wrap a handler so records are formatted and written on a background thread
+
+    The calling thread only snapshots the record, see `prepare`. Interpolating the
+    message, styling and rendering tracebacks all happen on the writer thread.
+
+    Parameters
+    ----------
+    `handler` : logging.Handler
+        The handler that will format and write the records
+    `maxsize` : int, default 10_000
+        The maximum number of records waiting to be written
+    `overflow` : str, default "block"
+        What to do when the queue is full:
+        - "block": wait for the writer to make room
+        - "drop_oldest": discard the oldest queued record
+        - "drop_newest": discard the incoming record
+        Discarded records are counted in `dropped`.
+    """
+
+    def __init__(
+        self,
+        handler: logging.Handler,
+        maxsize: int = 10_000,
+        overflow: str = BLOCK,
+    ):
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(
+                f"Unknown overflow policy {overflow!r}, expected one of {OVERFLOW_POLICIES}"
+            )
+
+        super().__init__(level=handler.level)
+
+        self.handler = handler
+        self.maxsize = maxsize
+        self.overflow = overflow
+        self.dropped = 0
+
+        self._queue = deque()
+        self._unfinished = 0
+        self._closed = False
+
+        mutex = threading.Lock()
+        self._not_empty = threading.Condition(mutex)
+        self._not_full = threading.Condition(mutex)
+        self._all_done = threading.Condition(mutex)
+
+        self._thread = threading.Thread(
+            target=self._run, name=f"styled-logging-writer-{id(self):x}", daemon=True
+        )
+        self._thread.start()
+
+    @property
+    def queue_depth(self) -> int:
+        """The number of records waiting to be written"""
+        return len(self._queue)
+
+    def setFormatter(self, fmt: logging.Formatter):
+        self.handler.setFormatter(fmt)
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """
+        Copy the record, so it can be formatted later
+
+        Arguments made of builtin values are copied, so later changes by the caller
+        don't show up in the message. Any other argument could change too, so the
+        message is interpolated right away instead, like it is for arguments too large
+        or too deeply nested to copy cheaply.
+        The exception is reduced to a CapturedException, which doesn't keep the frames
+        and their locals alive while the record waits in the queue. Only prettified
+        formatters can render it, so for any other formatter the traceback text is
+        rendered right away, with that formatter.
+        """
+        return _snapshot(record, self.handler)
+
+    def emit(self, record: logging.LogRecord):
+        if threading.current_thread() is self._thread:
+            # a record logged while writing, queueing it could deadlock
+            self.handler.handle(record)
+            return
+
+        try:
+            record = self.prepare(record)
+        except RecursionError:  # pragma: no cover
+            raise
+        except Exception:
+            self.handleError(record)
+            return
+
+        with self._not_full:
+            if self._closed:
+                return
+
+            while len(self._queue) >= self.maxsize:
+                if self.overflow == DROP_NEWEST:
+                    self.dropped += 1
+                    return
+
+                if self.overflow == DROP_OLDEST:
+                    self._queue.popleft()
+                    self._unfinished -= 1
+                    self.dropped += 1
+                    break
+
+                self._not_full.wait()
+
+            self._queue.append(record)
+            self._unfinished += 1
+            self._not_empty.notify()
+
+    def _run(self):
+        while True:
+            with self._not_empty:
+                while not self._queue and not self._closed:
+                    self._not_empty.wait()
+
+                if not self._queue:
+                    return
+
+                batch = list(self._queue)
+                self._queue.clear()
+                self._not_full.notify_all()
+
+            for record in batch:
+                self.handler.handle(record)
+
+            with self._all_done:
+                self._unfinished -= len(batch)
+                if self._unfinished <= 0:
+                    self._all_done.notify_all()
+
+    def flush(self):
+        """Wait for all queued records to be written, then flush the wrapped handler"""
+        if threading.current_thread() is not self._thread:
+            with self._all_done:
+                while self._unfinished > 0 and self._thread.is_alive():
+                    self._all_done.wait()
+
+        self.handler.flush()
+
+    def close(self):
+        """Write all queued records, stop the writer and close the wrapped handler"""
+        with self._not_empty:
+            self._closed = True
+            self._not_empty.notify()
+
+        if threading.current_thread() is not self._thread:
+            self._thread.join()
+
+        self.handler.close()
+        super().close()
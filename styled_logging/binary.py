@@ -0,0 +1,418 @@
+import logging
+import mmap
+import os
+import struct
+import typing as t
+
+from .capture import CapturedException, capture_exception
+from .structured import _dumps, _loads
+
+# File layout, all little endian:
+#   header: magic, version, 3 padding bytes
+#   frames: a type byte, followed by
+#     STRING: id, length, utf-8 text. Defines an interned logger name or template.
+#     RECORD: flags, level, created, logger id, template id, payload length, payload
+#   the rest of the preallocated file is zeros, a zero type byte ends the log.
+# The payload is the packed arguments. When flags has HAS_EXC set, it starts with the
+# length of the captured exception as JSON, and the JSON.
+
+MAGIC = b"SLOG"
+VERSION = 1
+
+_HEADER = struct.Struct("<4sB3x")
+_STRING = struct.Struct("<BII")
+_RECORD = struct.Struct("<BBHdIII")
+
+_STRING_FRAME = 1
+_RECORD_FRAME = 2
+
+HAS_EXC = 1
+
+# argument tags
+_NONE = b"N"
+_TRUE = b"T"
+_FALSE = b"F"
+_INT = b"i"
+_BIGINT = b"I"
+_FLOAT = b"f"
+_STR = b"s"
+_BYTES = b"b"
+
+_I64 = struct.Struct("<q")
+_F64 = struct.Struct("<d")
+_U32 = struct.Struct("<I")
+
+_INT_MIN, _INT_MAX = -(2**63), 2**63 - 1
+
+
+class _NotPackable(Exception):
+    pass
+
+
+def _pack_value(value, out: t.List[bytes]):
+    cls = type(value)
+
+    if cls is str:
+        data = value.encode("utf-8", "surrogatepass")
+        out += (_STR, _U32.pack(len(data)), data)
+    elif cls is int:
+        if _INT_MIN <= value <= _INT_MAX:
+            out += (_INT, _I64.pack(value))
+        else:
+            data = str(value).encode()
+            out += (_BIGINT, _U32.pack(len(data)), data)
+    elif cls is float:
+        out += (_FLOAT, _F64.pack(value))
+    elif cls is bool:
+        out.append(_TRUE if value else _FALSE)
+    elif value is None:
+        out.append(_NONE)
+    elif cls is bytes:
+        out += (_BYTES, _U32.pack(len(value)), value)
+    else:
+        raise _NotPackable
+
+
+def _pack_args(args: t.Tuple) -> bytes:
+    out: t.List[bytes] = []
+    for value in args:
+        _pack_value(value, out)
+    return b"".join(out)
+
+
+def _unpack_args(payload: bytes, offset: int, end: int) -> t.Tuple:
+    args = []
+
+    while offset < end:
+        tag = payload[offset : offset + 1]
+        offset += 1
+
+        if tag == _INT:
+            args.append(_I64.unpack_from(payload, offset)[0])
+            offset += 8
+        elif tag == _FLOAT:
+            args.append(_F64.unpack_from(payload, offset)[0])
+            offset += 8
+        elif tag == _NONE:
+            args.append(None)
+        elif tag == _TRUE:
+            args.append(True)
+        elif tag == _FALSE:
+            args.append(False)
+        else:
+            (length,) = _U32.unpack_from(payload, offset)
+            offset += 4
+            data = bytes(payload[offset : offset + length])
+            offset += length
+
+            if tag == _STR:
+                args.append(data.decode("utf-8", "surrogatepass"))
+            elif tag == _BIGINT:
+                args.append(int(data))
+            elif tag == _BYTES:
+                args.append(data)
+            else:
+                raise ValueError(f"Unknown argument tag {tag!r}")
+
+    return tuple(args)
+
+
+class _Frame(t.NamedTuple):
+    levelno: int
+    created: float
+    logger: int
+    template: int
+    flags: int
+    start: int
+    end: int
+
+
+def _scan(
+    buffer, strings: t.Dict[int, str]
+) -> t.Iterator[t.Tuple[int, t.Optional[_Frame]]]:
+    """
+    Walk the frames of a log, filling `strings` with the interned strings
+
+    Yields the offset after each frame, and the frame if it is a record.
+    Stops at the end of the log, or at a frame that was not completely written.
+    """
+    size = len(buffer)
+
+    if size < _HEADER.size:
+        return
+
+    magic, version = _HEADER.unpack_from(buffer, 0)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError("Not a styled_logging binary log")
+
+    offset = _HEADER.size
+
+    while offset < size:
+        kind = buffer[offset]
+
+        if kind == _STRING_FRAME:
+            if offset + _STRING.size > size:
+                return
+            _, string_id, length = _STRING.unpack_from(buffer, offset)
+            start = offset + _STRING.size
+            if start + length > size:
+                return
+            strings[string_id] = bytes(buffer[start : start + length]).decode()
+            offset = start + length
+            yield offset, None
+
+        elif kind == _RECORD_FRAME:
+            if offset + _RECORD.size > size:
+                return
+            _, flags, levelno, created, logger, template, length = _RECORD.unpack_from(
+                buffer, offset
+            )
+            start = offset + _RECORD.size
+            if start + length > size:
+                return
+            offset = start + length
+            yield offset, _Frame(
+                levelno, created, logger, template, flags, start, offset
+            )
+
+        else:
+            return
+
+
+class BinaryFileHandler(logging.Handler):
+    """
+    Write records to a compact binary log, without formatting them
+
+    Logger names and message templates are written once and referred to by id, the
+    arguments are packed as binary values. The file is memory-mapped and grown by
+    `segment_size` at a time, so a record is written with a single copy into memory.
+    Arguments that are not builtin scalars are interpolated into the message when the
+    record is written, so later changes to them don't change the log.
+
+    Read the log with `read_binary_log`, or render it with:
+
+        python -m styled_logging <filename>
+
+    Only one handler should write to a file at a time.
+
+    Parameters
+    ----------
+    `filename` : path-like
+        The path to the log file. An existing log is appended to.
+    `segment_size` : int, default 1 MiB
+        How much to grow the file by when it is full
+    `level` : int, default logging.NOTSET
+        The logging level to set the handler to
+    """
+
+    def __init__(
+        self, filename, segment_size: int = 1 << 20, level: int = logging.NOTSET
+    ):
+        super().__init__(level)
+        self.baseFilename = os.path.abspath(filename)
+        self.segment_size = max(segment_size, mmap.PAGESIZE)
+
+        self._strings: t.Dict[str, int] = {}
+        self._fd = os.open(self.baseFilename, os.O_RDWR | os.O_CREAT, 0o644)
+
+        size = os.fstat(self._fd).st_size
+        if size:
+            self._map(size)
+            self._pos = self._find_end()
+        else:
+            self._map(self.segment_size)
+            self._mm[: _HEADER.size] = _HEADER.pack(MAGIC, VERSION)
+            self._pos = _HEADER.size
+
+    def _map(self, size: int):
+        os.ftruncate(self._fd, size)
+        self._mm = mmap.mmap(self._fd, size)
+
+    def _find_end(self) -> int:
+        """Load the interned strings of an existing log, and find where it ends"""
+        strings: t.Dict[int, str] = {}
+        end = _HEADER.size
+        for end, _ in _scan(self._mm, strings):
+            pass
+
+        self._strings = {text: string_id for string_id, text in strings.items()}
+        return end
+
+    def _reserve(self, length: int):
+        """Grow the file so `length` more bytes fit"""
+        needed = self._pos + length
+        if needed <= len(self._mm):
+            return
+
+        size = len(self._mm)
+        while size < needed:
+            size += self.segment_size
+
+        self._mm.close()
+        self._map(size)
+
+    def _intern(self, text: str, frames: t.List[bytes], new: t.Dict[str, int]) -> int:
+        string_id = self._strings.get(text, new.get(text))
+        if string_id is None:
+            data = text.encode()
+            string_id = new[text] = len(self._strings) + len(new)
+            frames += (_STRING.pack(_STRING_FRAME, string_id, len(data)), data)
+        return string_id
+
+    def encode(self, record: logging.LogRecord) -> t.Tuple[bytes, t.Dict[str, int]]:
+        """
+        The frames for a record, including any new interned strings
+
+        The new strings are returned with their ids, and are only known to the
+        handler once the frames are written, see `emit`.
+        """
+        frames: t.List[bytes] = []
+        new: t.Dict[str, int] = {}
+        template, args = record.msg, record.args or ()
+
+        try:
+            if type(template) is not str or type(args) is not tuple:
+                raise _NotPackable
+            payload = _pack_args(args)
+        except _NotPackable:
+            template, payload = "%s", _pack_args((record.getMessage(),))
+
+        flags = 0
+        if record.exc_info and record.exc_info[1] is not None:
+            captured = capture_exception(record.exc_info[1], record.exc_info[2])
+            data = _dumps(captured.tracebacks).encode()
+            payload = b"".join((_U32.pack(len(data)), data, payload))
+            flags |= HAS_EXC
+
+        header = _RECORD.pack(
+            _RECORD_FRAME,
+            flags,
+            record.levelno,
+            record.created,
+            self._intern(record.name, frames, new),
+            self._intern(template, frames, new),
+            len(payload),
+        )
+        frames += (header, payload)
+        return b"".join(frames), new
+
+    def emit(self, record: logging.LogRecord):
+        try:
+            data, new = self.encode(record)
+            self._reserve(len(data))
+
+            # the type byte is written last, so readers never see half a frame
+            end = self._pos + len(data)
+            self._mm[self._pos + 1 : end] = data[1:]
+            self._mm[self._pos] = data[0]
+            self._pos = end
+
+            # a record that failed to encode or write must not leave ids behind
+            self._strings.update(new)
+        except RecursionError:  # pragma: no cover
+            raise
+        except Exception:
+            self.handleError(record)
+
+    def flush(self):
+        """Write the mapped pages to disk"""
+        self.acquire()
+        try:
+            if self._mm is not None:
+                self._mm.flush()
+        finally:
+            self.release()
+
+    def close(self):
+        """Unmap the file and trim the unused preallocated space"""
+        self.acquire()
+        try:
+            if self._mm is not None:
+                self._mm.close()
+                self._mm = None
+                os.ftruncate(self._fd, self._pos)
+                os.close(self._fd)
+        finally:
+            self.release()
+
+        super().close()
+
+
+def _parse_time(value: t.Union[str, float, None]) -> t.Optional[float]:
+    if value is None or isinstance(value, (int, float)):
+        return value
+
+    import datetime
+
+    try:
+        return float(value)
+    except ValueError:
+        return datetime.datetime.fromisoformat(value).timestamp()
+
+
+def read_binary_log(
+    filename,
+    level: int = logging.NOTSET,
+    since: t.Union[str, float] = None,
+    until: t.Union[str, float] = None,
+) -> t.Iterator[logging.LogRecord]:
+    """
+    Read the records of a log written by BinaryFileHandler
+
+    Records are decoded only if they pass the filters.
+
+    Parameters
+    ----------
+    `filename` : path-like
+        The path to the log file
+    `level` : int, default logging.NOTSET
+        Skip records below this level
+    `since` : str or float, default None
+        Skip records before this time, as a timestamp or an ISO-8601 string
+    `until` : str or float, default None
+        Skip records after this time, as a timestamp or an ISO-8601 string
+    """
+    since, until = _parse_time(since), _parse_time(until)
+
+    with open(filename, "rb") as f:
+        if not os.fstat(f.fileno()).st_size:
+            return
+
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            strings: t.Dict[int, str] = {}
+
+            for _, frame in _scan(buffer, strings):
+                if frame is None or frame.levelno < level:
+                    continue
+                if since is not None and frame.created < since:
+                    continue
+                if until is not None and frame.created > until:
+                    continue
+
+                yield _decode(buffer, frame, strings)
+
+
+def _decode(buffer, frame: _Frame, strings: t.Dict[int, str]) -> logging.LogRecord:
+    start = frame.start
+    exc_info = None
+
+    if frame.flags & HAS_EXC:
+        (length,) = _U32.unpack_from(buffer, start)
+        start += 4
+        tracebacks = _loads(bytes(buffer[start : start + length]))
+        start += length
+        exc_info = (CapturedException, CapturedException(tracebacks), None)
+
+    created = frame.created
+    return logging.makeLogRecord(
+        {
+            "name": strings[frame.logger],
+            "levelno": frame.levelno,
+            "levelname": logging.getLevelName(frame.levelno),
+            "msg": strings[frame.template],
+            "args": _unpack_args(buffer, start, frame.end),
+            "created": created,
+            "msecs": int((created - int(created)) * 1000) + 0.0,
+            "exc_info": exc_info,
+        }
+    )
@@ -0,0 +1,123 @@
+import logging
+import os
+import threading
+from typing import List
+
+# the lowest common limit on the number of buffers in one writev call
+_IOV_MAX = 1024
+
+
+def _write_all(fd: int, chunks: List[bytes]):
+    """Write all chunks to the file descriptor, using one syscall per batch"""
+    for start in range(0, len(chunks), _IOV_MAX):
+        batch = chunks[start : start + _IOV_MAX]
+        written = os.writev(fd, batch) if hasattr(os, "writev") else 0
+
+        # a partial write is rare for regular files, but finish it off if it happens
+        if written < sum(map(len, batch)):
+            data = memoryview(b"".join(batch))[written:]
+            while data:
+                data = data[os.write(fd, data) :]
+
+
+class BufferedFileHandler(logging.FileHandler):
+    """
+    A file handler that collects formatted records and writes them in batches
+
+    Parameters
+    ----------
+    `filename` : path-like
+        The path to the log file
+    `mode` : str, default "a"
+        The mode to open the file with
+    `encoding` : str, default None
+        The file encoding
+    `capacity` : int, default 65536
+        Write the batch when this many bytes are buffered
+    `flush_interval` : float, default 1.0
+        Write the batch every this many seconds, from a background thread.
+        Set to 0 or None to only write on capacity, level, flush or close.
+    `flush_level` : int, default logging.ERROR
+        Records at or above this level are written immediately, along with the batch
+    """
+
+    def __init__(
+        self,
+        filename,
+        mode: str = "a",
+        encoding: str = None,
+        capacity: int = 64 * 1024,
+        flush_interval: float = 1.0,
+        flush_level: int = logging.ERROR,
+    ):
+        super().__init__(filename, mode=mode, encoding=encoding)
+        self.capacity = capacity
+        self.flush_interval = flush_interval
+        self.flush_level = flush_level
+
+        self._buffer: List[bytes] = []
+        self._buffered = 0
+        self._flusher = None
+        self._closing = threading.Event()
+
+    def emit(self, record: logging.LogRecord):
+        try:
+            if self.stream is None:
+                self.stream = self._open()
+
+            msg = self.format(record) + self.terminator
+            data = msg.encode(self.stream.encoding, self.stream.errors)
+
+            self._buffer.append(data)
+            self._buffered += len(data)
+
+            if record.levelno >= self.flush_level or self._buffered >= self.capacity:
+                self._write()
+            elif self._flusher is None and self.flush_interval:
+                # each flusher gets its own event, so one stopped by close stays stopped
+                self._closing = threading.Event()
+                self._flusher = threading.Thread(
+                    target=self._flush_periodically, args=(self._closing,)
+                )
+                self._flusher.daemon = True
+                self._flusher.start()
+        except RecursionError:  # pragma: no cover
+            raise
+        except Exception:
+            self.handleError(record)
+
+    def _write(self):
+        """Write the batch to the file. The handler lock must be held."""
+        if not self._buffer:
+            return
+
+        chunks = self._buffer
+        self._buffer = []
+        self._buffered = 0
+
+        # the text layer is never written to, but flush it in case someone else did
+        self.stream.flush()
+        _write_all(self.stream.fileno(), chunks)
+
+    def _flush_periodically(self, closing: threading.Event):
+        while not closing.wait(self.flush_interval):
+            self.flush()
+
+    def flush(self):
+        self.acquire()
+        try:
+            if self.stream is not None:
+                self._write()
+        finally:
+            self.release()
+
+    def close(self):
+        self.acquire()
+        try:
+            # a record logged after closing reopens the file and starts a new flusher
+            self._closing.set()
+            self._flusher = None
+        finally:
+            self.release()
+
+        super().close()
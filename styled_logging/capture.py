@@ -0,0 +1,86 @@
+import linecache
+import traceback as tb
+import typing as t
+
+# plain data for one exception in a chain, see pretty_traceback.common.Traceback.
+# The source line of an entry is None until the traceback is rendered.
+Entry = t.Tuple[str, str, str, t.Optional[str]]
+TracebackData = t.Tuple[str, str, t.List[Entry], bool, bool]
+
+
+def _with_line(entry: Entry) -> Entry:
+    module, call, lineno, line = entry
+    if line is None:
+        line = linecache.getline(module, int(lineno)).strip()
+    return module, call, lineno, line
+
+
+class CapturedException(Exception):
+    """
+    An exception reduced to the data needed to render its pretty traceback
+
+    It holds no frames, so it can outlive the original exception without keeping its
+    locals alive, and it can be sent to another process as plain data.
+    Source lines are read when it is rendered, not when it is captured.
+    Formatters decorated with `prettify` render it like the original exception.
+    """
+
+    def __init__(self, tracebacks: t.Sequence[TracebackData]):
+        self.tracebacks = [
+            (name, msg, [tuple(entry) for entry in entries], caused, context)
+            for name, msg, entries, caused, context in tracebacks
+        ]
+        name, msg = self.tracebacks[-1][:2] if self.tracebacks else ("", "")
+        super().__init__(f"{name}: {msg}")
+
+    def to_tracebacks(self):
+        """Convert to the tracebacks pretty_traceback formats"""
+        return to_tracebacks(self.tracebacks)
+
+
+def to_tracebacks(tracebacks: t.Sequence[TracebackData]):
+    """Convert captured data to the tracebacks pretty_traceback formats"""
+    from pretty_traceback import common
+
+    return [
+        common.Traceback(
+            exc_name=name,
+            exc_msg=msg,
+            entries=[common.Entry(*_with_line(entry)) for entry in entries],
+            is_caused=caused,
+            is_context=context,
+        )
+        for name, msg, entries, caused, context in tracebacks
+    ]
+
+
+def capture_exception(exc_value: BaseException, traceback=None) -> CapturedException:
+    """Capture an exception and its cause or context chain, oldest first"""
+    if isinstance(exc_value, CapturedException):
+        return exc_value
+
+    tracebacks = []
+
+    # walks the chain the same way as pretty_traceback.formatting.exc_to_traceback_str
+    while exc_value:
+        cause = getattr(exc_value, "__cause__", None)
+        context = getattr(exc_value, "__context__", None)
+        # lines are looked up later, lazycache keeps sources from zip imports available
+        summary = tb.StackSummary.extract(tb.walk_tb(traceback), lookup_lines=False)
+        entries = [
+            (frame.filename, frame.name, str(frame.lineno), None) for frame in summary
+        ]
+        tracebacks.append(
+            (
+                type(exc_value).__name__,
+                str(exc_value),
+                entries,
+                bool(cause),
+                bool(context),
+            )
+        )
+
+        exc_value = cause or context
+        traceback = getattr(exc_value, "__traceback__", None)
+
+    return CapturedException(tracebacks[::-1])
@@ -0,0 +1,278 @@
+import logging
+import os
+import threading
+import typing as t
+
+from .capture import CapturedException, capture_exception
+from .handlers import create_console_handler, create_file_handler
+from .structured import _RECORD_ATTRS, _dumps, _loads
+
+# multiprocessing is imported on first use, most applications never start a collector
+
+# the record attributes sent to the collector, besides the message and exception
+_FIELDS = (
+    "name",
+    "levelno",
+    "levelname",
+    "pathname",
+    "filename",
+    "module",
+    "lineno",
+    "funcName",
+    "created",
+    "msecs",
+    "relativeCreated",
+    "thread",
+    "threadName",
+    "processName",
+    "process",
+)
+
+_STOP = b"stop"
+
+
+def _encode(record: logging.LogRecord) -> bytes:
+    """Encode a record as JSON. The message is interpolated and the exception captured."""
+    data = {key: getattr(record, key, None) for key in _FIELDS}
+    data["msg"] = record.getMessage()
+
+    for key, value in vars(record).items():
+        if key not in _RECORD_ATTRS:
+            data[key] = value
+
+    if record.exc_info and record.exc_info[1] is not None:
+        data["exc"] = capture_exception(
+            record.exc_info[1], record.exc_info[2]
+        ).tracebacks
+
+    if record.stack_info:
+        data["stack_info"] = record.stack_info
+
+    return _dumps(data).encode()
+
+
+def _decode(payload: bytes) -> logging.LogRecord:
+    data = _loads(payload)
+    exc = data.pop("exc", None)
+    record = logging.makeLogRecord(data)
+
+    if exc is not None:
+        record.exc_info = (CapturedException, CapturedException(exc), None)
+
+    return record
+
+
+class CollectorHandler(logging.Handler):
+    """
+    A handler that sends records to a styled_logging.Collector
+
+    The connection is opened on first use, and again in a forked child process.
+
+    Parameters
+    ----------
+    `address` : str
+        The address of the collector, see Collector.address
+    `level` : int, default logging.NOTSET
+        The logging level to set the handler to
+    """
+
+    def __init__(self, address: str, level: int = logging.NOTSET):
+        super().__init__(level)
+        self.address = address
+        self._conn = None
+        self._pid = None
+
+    def _connection(self):
+        if self._conn is None or self._pid != os.getpid():
+            from multiprocessing.connection import Client
+
+            # a connection inherited through fork belongs to the parent, leave it be
+            self._conn = Client(self.address)
+            self._pid = os.getpid()
+
+        return self._conn
+
+    def emit(self, record: logging.LogRecord):
+        try:
+            self._connection().send_bytes(_encode(record))
+        except RecursionError:  # pragma: no cover
+            raise
+        except Exception:
+            self._conn = None
+            self.handleError(record)
+
+    def close(self):
+        self.acquire()
+        try:
+            if self._conn is not None and self._pid == os.getpid():
+                self._conn.close()
+            self._conn = None
+        finally:
+            self.release()
+
+        super().close()
+
+
+def _handle(payload: bytes, handlers: t.Sequence[logging.Handler]):
+    record = _decode(payload)
+    for handler in handlers:
+        if record.levelno >= handler.level:
+            handler.handle(record)
+
+
+def _receive(conn, handlers: t.Sequence[logging.Handler], stopping: threading.Event):
+    with conn:
+        while True:
+            # wake up now and then to see if the collector is stopping,
+            # it only stops once everything sent so far is handled
+            if not conn.poll(0.1):
+                if stopping.is_set():
+                    return
+                continue
+
+            try:
+                payload = conn.recv_bytes()
+            except (EOFError, OSError):
+                return
+
+            _handle(payload, handlers)
+
+
+def _serve(
+    address: str,
+    console_level: int,
+    filename: t.Optional[str],
+    file_level: int,
+    ready,
+):
+    from multiprocessing.connection import Listener
+
+    handlers = [create_console_handler(level=console_level)]
+    if filename:
+        handlers.append(create_file_handler(filename, level=file_level, buffered=True))
+
+    stopping = threading.Event()
+    receivers = []
+
+    with Listener(address) as listener:
+        ready.set()
+
+        while True:
+            conn = listener.accept()
+
+            # handlers connect when they send their first record, so this doesn't block
+            try:
+                payload = conn.recv_bytes()
+            except (EOFError, OSError):
+                conn.close()
+                continue
+
+            if payload == _STOP:
+                conn.close()
+                break
+
+            _handle(payload, handlers)
+            receiver = threading.Thread(
+                target=_receive, args=(conn, handlers, stopping), daemon=True
+            )
+            receiver.start()
+            receivers = [r for r in receivers if r.is_alive()] + [receiver]
+
+    stopping.set()
+    for receiver in receivers:
+        receiver.join()
+
+    for handler in handlers:
+        handler.close()
+
+
+class Collector:
+    """
+    A process that formats and writes the records of many processes
+
+    Workers send records with a CollectorHandler, for example through
+    `setup(collector=collector.address)`. Only the collector opens the log file, so
+    workers don't interleave writes. The file is written in batches.
+    Can be used as a context manager to start and stop it.
+
+    Parameters
+    ----------
+    `filename` : path-like, default None
+        The path to the log file. If None, only logs to the console.
+    `console_level` : int, default logging.INFO
+        The level of the collector's console handler
+    `file_level` : int, default logging.WARNING
+        The level of the collector's file handler
+    `address` : str, default None
+        The socket or named pipe to listen on. If None, a temporary one is used.
+    """
+
+    def __init__(
+        self,
+        filename: str = None,
+        console_level: int = logging.INFO,
+        file_level: int = logging.WARNING,
+        address: str = None,
+    ):
+        if address is None:
+            from multiprocessing.connection import arbitrary_address
+
+            family = "AF_UNIX" if hasattr(os, "fork") else "AF_PIPE"
+            address = arbitrary_address(family)
+
+        self.address = address
+        self.filename = filename
+        self.console_level = console_level
+        self.file_level = file_level
+        self._process = None
+
+    @property
+    def level(self) -> int:
+        """The lowest level the collector writes"""
+        if self.filename:
+            return min(self.console_level, self.file_level)
+        return self.console_level
+
+    def handler(self) -> CollectorHandler:
+        """Create a handler that sends records at `level` and above to the collector"""
+        return CollectorHandler(self.address, level=self.level)
+
+    def start(self):
+        """Start the collector process, returning once it accepts connections"""
+        import multiprocessing
+
+        ready = multiprocessing.Event()
+        self._process = multiprocessing.Process(
+            target=_serve,
+            args=(
+                self.address,
+                self.console_level,
+                self.filename,
+                self.file_level,
+                ready,
+            ),
+            name="styled-logging-collector",
+            daemon=True,
+        )
+        self._process.start()
+        ready.wait()
+        return self
+
+    def stop(self):
+        """Stop the collector, once the records already sent are written"""
+        if self._process is None:
+            return
+
+        from multiprocessing.connection import Client
+
+        with Client(self.address) as conn:
+            conn.send_bytes(_STOP)
+
+        self._process.join()
+        self._process = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
@@ -1,3 +1,5 @@
+import functools
+import os
 import typing as t
 
 _ansi_colors = {
@@ -21,48 +23,142 @@ _ansi_colors = {
 }
 _ansi_reset_all = "\033[0m"
 
+# approximate rgb values of the named colors, used to pick the closest one
+_ansi_rgb = {
+    30: (0, 0, 0),
+    31: (205, 0, 0),
+    32: (0, 205, 0),
+    33: (205, 205, 0),
+    34: (0, 0, 238),
+    35: (205, 0, 205),
+    36: (0, 205, 205),
+    37: (229, 229, 229),
+    90: (127, 127, 127),
+    91: (255, 0, 0),
+    92: (0, 255, 0),
+    93: (255, 255, 0),
+    94: (92, 92, 255),
+    95: (255, 0, 255),
+    96: (0, 255, 255),
+    97: (255, 255, 255),
+}
+_cube_levels = (0, 95, 135, 175, 215, 255)
+
 Color = t.Union[int, t.Tuple[int, int, int], str]
 
+# the number of colors a terminal can show
+NO_COLOR = 0
+COLORS_16 = 16
+COLORS_256 = 256
+TRUECOLOR = 1 << 24
+
+_color_depth = TRUECOLOR
+
+
+def detect_color_depth(stream: t.Any = None) -> int:
+    """
+    Detect how many colors a stream can show, from whether it is a terminal and the
+    `NO_COLOR`, `TERM` and `COLORTERM` environment variables
+    """
+    isatty = getattr(stream, "isatty", None)
+    term = os.environ.get("TERM", "")
+
+    if os.environ.get("NO_COLOR") or term == "dumb" or not (isatty and isatty()):
+        return NO_COLOR
+
+    if os.environ.get("COLORTERM") in ("truecolor", "24bit"):
+        return TRUECOLOR
+
+    if "256" in term:
+        return COLORS_256
+
+    return COLORS_16
+
+
+def set_color_depth(depth: int):
+    """Set the number of colors style() uses. Colors are downgraded to fit."""
+    global _color_depth
+    _color_depth = depth
+
+
+def _distance(a: t.Tuple[int, int, int], b: t.Tuple[int, int, int]) -> int:
+    return sum((x - y) ** 2 for x, y in zip(a, b))
+
+
+def _nearest(values: t.Sequence[int], value: int) -> int:
+    return min(range(len(values)), key=lambda i: abs(values[i] - value))
+
+
+def _rgb_to_256(rgb: t.Tuple[int, int, int]) -> int:
+    r, g, b = (_nearest(_cube_levels, c) for c in rgb)
+    cube = (_cube_levels[r], _cube_levels[g], _cube_levels[b])
 
-def _interpret_color(color: Color, offset: int = 0) -> str:
+    gray = min(23, max(0, round((sum(rgb) / 3 - 8) / 10)))
+    level = 8 + 10 * gray
+
+    if _distance(rgb, (level,) * 3) < _distance(rgb, cube):
+        return 232 + gray
+    return 16 + 36 * r + 6 * g + b
+
+
+def _256_to_rgb(color: int) -> t.Tuple[int, int, int]:
+    if color < 16:
+        return _ansi_rgb[(30 if color < 8 else 82) + color]
+    if color >= 232:
+        return (8 + 10 * (color - 232),) * 3
+
+    color -= 16
+    return tuple(_cube_levels[c] for c in (color // 36, color // 6 % 6, color % 6))
+
+
+def _rgb_to_16(rgb: t.Tuple[int, int, int]) -> int:
+    return min(_ansi_rgb, key=lambda code: _distance(rgb, _ansi_rgb[code]))
+
+
+def _interpret_color(color: Color, offset: int = 0, depth: int = TRUECOLOR) -> str:
     if isinstance(color, int):
-        return f"{38 + offset};5;{color:d}"
+        if depth >= COLORS_256:
+            return f"{38 + offset};5;{color:d}"
+        return str(_rgb_to_16(_256_to_rgb(color)) + offset)
 
     if isinstance(color, (tuple, list)):
         r, g, b = color
-        return f"{38 + offset};2;{r:d};{g:d};{b:d}"
+        if depth >= TRUECOLOR:
+            return f"{38 + offset};2;{r:d};{g:d};{b:d}"
+        if depth >= COLORS_256:
+            return f"{38 + offset};5;{_rgb_to_256((r, g, b)):d}"
+        return str(_rgb_to_16((r, g, b)) + offset)
 
     return str(_ansi_colors[color] + offset)
 
 
-def style(
-    text: t.Any,
-    fg: t.Optional[Color] = None,
-    bg: t.Optional[Color] = None,
-    bold: t.Optional[bool] = None,
-    dim: t.Optional[bool] = None,
-    underline: t.Optional[bool] = None,
-    overline: t.Optional[bool] = None,
-    italic: t.Optional[bool] = None,
-    blink: t.Optional[bool] = None,
-    reverse: t.Optional[bool] = None,
-    strikethrough: t.Optional[bool] = None,
-    reset: bool = True,
-):
-    if not isinstance(text, str):
-        text = str(text)
-
+@functools.lru_cache(maxsize=256)
+def _style_prefix(
+    fg: t.Optional[Color],
+    bg: t.Optional[Color],
+    bold: t.Optional[bool],
+    dim: t.Optional[bool],
+    underline: t.Optional[bool],
+    overline: t.Optional[bool],
+    italic: t.Optional[bool],
+    blink: t.Optional[bool],
+    reverse: t.Optional[bool],
+    strikethrough: t.Optional[bool],
+    depth: int,
+) -> str:
+    """Build the escape sequence for a combination of styles. Cached, since it does not
+    depend on the text."""
     bits = []
 
     if fg:
         try:
-            bits.append(f"\033[{_interpret_color(fg)}m")
+            bits.append(f"\033[{_interpret_color(fg, 0, depth)}m")
         except KeyError:
             raise TypeError(f"Unknown color {fg!r}") from None
 
     if bg:
         try:
-            bits.append(f"\033[{_interpret_color(bg, 10)}m")
+            bits.append(f"\033[{_interpret_color(bg, 10, depth)}m")
         except KeyError:
             raise TypeError(f"Unknown color {bg!r}") from None
 
@@ -82,7 +178,50 @@ def style(
         bits.append(f"\033[{7 if reverse else 27}m")
     if strikethrough is not None:
         bits.append(f"\033[{9 if strikethrough else 29}m")
-    bits.append(text)
-    if reset:
-        bits.append(_ansi_reset_all)
     return "".join(bits)
+
+
+def style(
+    text: t.Any,
+    fg: t.Optional[Color] = None,
+    bg: t.Optional[Color] = None,
+    bold: t.Optional[bool] = None,
+    dim: t.Optional[bool] = None,
+    underline: t.Optional[bool] = None,
+    overline: t.Optional[bool] = None,
+    italic: t.Optional[bool] = None,
+    blink: t.Optional[bool] = None,
+    reverse: t.Optional[bool] = None,
+    strikethrough: t.Optional[bool] = None,
+    reset: bool = True,
+):
+    if not isinstance(text, str):
+        text = str(text)
+
+    # lists are accepted for rgb colors, but can't be cached
+    if isinstance(fg, list):
+        fg = tuple(fg)
+    if isinstance(bg, list):
+        bg = tuple(bg)
+
+    depth = _color_depth
+    if depth == NO_COLOR:
+        return text
+
+    prefix = _style_prefix(
+        fg,
+        bg,
+        bold,
+        dim,
+        underline,
+        overline,
+        italic,
+        blink,
+        reverse,
+        strikethrough,
+        depth,
+    )
+
+    if reset:
+        return prefix + text + _ansi_reset_all
+    return prefix + text
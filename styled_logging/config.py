@@ -0,0 +1,601 @@
+import logging
+import os
+import threading
+import typing as t
+from collections import deque
+
+from .aio import AsyncHandler, flush_handlers
+from .background import BackgroundHandler
+from .decorator import prettify
+from .dispatch import LevelDispatcher
+from .handlers import (
+    create_console_handler,
+    create_file_handler,
+    create_ring_buffer_handler,
+)
+from .ratelimit import RateLimitFilter
+from .sampling import SamplingFilter
+from .timestamps import set_time_format
+
+# A configuration, as a dict or a TOML document:
+#
+#   background = true
+#
+#   [sampling]
+#   levels = { DEBUG = 0.01 }
+#
+#   [[handlers]]
+#   type = "console"
+#   level = "DEBUG"
+#   formats = { INFO = "%(message)s" }
+#
+#   [[handlers]]
+#   type = "file"
+#   path = "app.log"
+#   json = true
+#
+# Levels are names or numbers. See from_config for all the options.
+
+Config = t.Mapping[str, t.Any]
+Check = t.Callable[[t.Any, str], t.Any]
+
+
+class ConfigError(ValueError):
+    """A logging configuration is invalid"""
+
+
+def _fail(where: str, message: str) -> t.NoReturn:
+    raise ConfigError(f"{where}: {message}")
+
+
+def _typed(*types: type) -> Check:
+    names = " or ".join(cls.__name__ for cls in types)
+
+    def check(value, where: str):
+        # bool is an int, but true is not a number of bytes
+        if not isinstance(value, types) or (
+            isinstance(value, bool) and bool not in types
+        ):
+            _fail(where, f"expected {names}, got {type(value).__name__}")
+        return value
+
+    return check
+
+
+_BOOL = _typed(bool)
+_INT = _typed(int)
+_NUMBER = _typed(int, float)
+_STR = _typed(str)
+
+
+def _level(value, where: str) -> int:
+    if isinstance(value, int) and not isinstance(value, bool):
+        return value
+
+    if isinstance(value, str):
+        level = logging.getLevelName(value.upper())
+        if isinstance(level, int):
+            return level
+
+    _fail(where, f"unknown level {value!r}")
+
+
+def _by_level(check: Check) -> Check:
+    """A table of level to value, like { DEBUG = 0.01 }"""
+
+    def by_level(value, where: str) -> t.Dict[int, t.Any]:
+        if not isinstance(value, t.Mapping):
+            _fail(where, f"expected a table, got {type(value).__name__}")
+
+        return {
+            _level(level, f"{where}.{level}"): check(item, f"{where}.{level}")
+            for level, item in value.items()
+        }
+
+    return by_level
+
+
+_RATES = _by_level(_NUMBER)
+_FORMATS = _by_level(_STR)
+
+
+def _logger_rates(value, where: str) -> t.Dict[str, t.Dict[int, float]]:
+    if not isinstance(value, t.Mapping):
+        _fail(where, f"expected a table, got {type(value).__name__}")
+
+    return {name: _RATES(rates, f"{where}.{name}") for name, rates in value.items()}
+
+
+def _options(value, where: str, spec: t.Mapping[str, Check]) -> t.Dict[str, t.Any]:
+    if not isinstance(value, t.Mapping):
+        _fail(where, f"expected a table, got {type(value).__name__}")
+
+    for key in value:
+        if key not in spec:
+            _fail(where, f"unknown option {key!r}, expected one of {sorted(spec)}")
+
+    return {key: spec[key](item, f"{where}.{key}") for key, item in value.items()}
+
+
+def _table(spec: t.Mapping[str, Check]) -> Check:
+    return lambda value, where: _options(value, where, spec)
+
+
+def _handler(value, where: str) -> t.Dict[str, t.Any]:
+    kind = value.get("type", "console") if isinstance(value, t.Mapping) else None
+
+    if kind not in _HANDLERS:
+        _fail(
+            where, f"unknown handler type {kind!r}, expected one of {list(_HANDLERS)}"
+        )
+
+    options = _options(value, where, {"type": _STR, **_HANDLERS[kind]})
+    options["type"] = kind
+
+    if kind == "file" and "path" not in options:
+        _fail(where, "a file handler needs a path")
+
+    if kind == "file" and "format" in options and options.get("json"):
+        _fail(where, "a file handler can't use both format and json")
+
+    return options
+
+
+def _handlers(value, where: str) -> t.List[t.Dict[str, t.Any]]:
+    if not isinstance(value, t.Sequence) or isinstance(value, str):
+        _fail(where, f"expected a list, got {type(value).__name__}")
+
+    if not value:
+        _fail(where, "expected at least one handler")
+
+    return [_handler(item, f"{where}[{i}]") for i, item in enumerate(value)]
+
+
+_QUEUE = {
+    "level": _level,
+    "background": _BOOL,
+    "asynchronous": _BOOL,
+    "stats": _BOOL,
+}
+
+_HANDLERS: t.Dict[str, t.Dict[str, Check]] = {
+    "console": {**_QUEUE, "color": _BOOL, "formats": _FORMATS},
+    "file": {
+        **_QUEUE,
+        "path": _STR,
+        "format": _STR,
+        "json": _BOOL,
+        "binary": _BOOL,
+        "buffered": _BOOL,
+        "max_bytes": _INT,
+        "rotate_interval": _NUMBER,
+        "backup_count": _INT,
+    },
+    "ring": {
+        "handler": _handler,
+        "capacity": _INT,
+        "level": _level,
+        "trigger_level": _level,
+    },
+}
+
+_CONFIG = {
+    "handlers": _handlers,
+    "background": _BOOL,
+    "asynchronous": _BOOL,
+    "sampling": _table(
+        {
+            "levels": _RATES,
+            "loggers": _logger_rates,
+            "deterministic": _BOOL,
+            "seed": _INT,
+        }
+    ),
+    "rate_limit": _table(
+        {
+            "rate": _NUMBER,
+            "burst": _INT,
+            "summary_interval": _NUMBER,
+            "max_keys": _INT,
+        }
+    ),
+    "time_format": _table({"iso": _BOOL, "utc": _BOOL}),
+}
+
+
+def validate_config(config: Config) -> t.Dict[str, t.Any]:
+    """
+    Check a configuration, raising ConfigError for the first problem
+
+    Returns a copy with level names converted to numbers.
+    """
+    config = _options(config, "config", _CONFIG)
+    config.setdefault("handlers", [{"type": "console"}])
+    return config
+
+
+def load_config(path) -> t.Dict[str, t.Any]:
+    """Read a TOML configuration file, see from_config"""
+    try:
+        import tomllib
+    except ImportError:  # pragma: no cover
+        import tomli as tomllib
+
+    with open(path, "rb") as f:
+        try:
+            return tomllib.load(f)
+        except tomllib.TOMLDecodeError as exc:
+            raise ConfigError(f"{os.fspath(path)}: {exc}") from exc
+
+
+def _build_handler(options: t.Dict[str, t.Any], where: str) -> logging.Handler:
+    options = dict(options)
+    kind = options.pop("type")
+
+    try:
+        if kind == "console":
+            return create_console_handler(**options)
+
+        if kind == "file":
+            fmt = options.pop("format", None)
+            if fmt is not None:
+                options["formatter"] = prettify(
+                    logging.Formatter, color=False, indent=4
+                )(fmt)
+            return create_file_handler(**options)
+
+        nested = options.pop("handler", None)
+        if nested is not None:
+            nested = _build_handler(nested, f"{where}.handler")
+        return create_ring_buffer_handler(nested, **options)
+    except ConfigError:
+        raise
+    except ValueError as exc:
+        raise ConfigError(f"{where}: {exc}") from exc
+
+
+def build_config(config: t.Dict[str, t.Any]) -> LevelDispatcher:
+    """Create the handlers and filters of a validated configuration"""
+    handlers: t.List[logging.Handler] = []
+
+    try:
+        for i, options in enumerate(config["handlers"]):
+            handlers.append(_build_handler(options, f"config.handlers[{i}]"))
+
+        if config.get("asynchronous"):
+            handlers = [
+                h if isinstance(h, AsyncHandler) else AsyncHandler(h) for h in handlers
+            ]
+        elif config.get("background"):
+            handlers = [
+                h if isinstance(h, BackgroundHandler) else BackgroundHandler(h)
+                for h in handlers
+            ]
+
+        dispatcher = LevelDispatcher(handlers)
+
+        if "sampling" in config:
+            try:
+                dispatcher.addFilter(SamplingFilter(**config["sampling"]))
+            except ValueError as exc:
+                raise ConfigError(f"config.sampling: {exc}") from exc
+        if "rate_limit" in config:
+            dispatcher.addFilter(RateLimitFilter(**config["rate_limit"]))
+    except BaseException:
+        for handler in handlers:
+            handler.close()
+        raise
+
+    # applied every time, so a reload without `time_format` restores the default
+    set_time_format(**config.get("time_format", {}))
+
+    return dispatcher
+
+
+class _Hold:
+    """Keeps the records logged while handlers are being replaced"""
+
+    def __init__(self):
+        self.records: t.Deque[logging.LogRecord] = deque()
+
+    def handle(self, record: logging.LogRecord) -> bool:
+        self.records.append(record)
+        return True
+
+    def flush(self):
+        pass
+
+
+def _last_resort() -> LevelDispatcher:
+    """Write warnings to stderr, like logging does without handlers"""
+    handler = logging.StreamHandler()
+    handler.setLevel(logging.WARNING)
+    return LevelDispatcher([handler])
+
+
+class _Slot:
+    """A handler, and the records that are being given to it"""
+
+    def __init__(self, handler):
+        self.handler = handler
+        self.inflight = 0
+        self.closed = False
+        self.idle = threading.Condition(threading.Lock())
+
+    def close(self):
+        """Wait for the records in flight, new records must go to the next slot"""
+        with self.idle:
+            self.closed = True
+            while self.inflight:
+                self.idle.wait()
+
+
+class SwapHandler(logging.Handler):
+    """
+    A handler whose handlers can be replaced while records are being logged
+
+    Each record marks itself as in flight for the handlers it is given to. `swap` holds
+    new records, waits for the ones in flight, closes the old handlers so their queued
+    records are written, then gives the held records to the new handlers.
+
+    Parameters
+    ----------
+    `handler` : logging.Handler
+        The handler to start with
+    """
+
+    def __init__(self, handler: logging.Handler):
+        super().__init__(handler.level)
+        self._current = _Slot(handler)
+
+    @property
+    def handler(self) -> logging.Handler:
+        # while swapping, waits for the new handler instead of returning the hold
+        with self.lock:
+            return self._current.handler
+
+    def handle(self, record: logging.LogRecord) -> bool:
+        while True:
+            slot = self._current
+            with slot.idle:
+                # swapped out before this record got in, use the next slot
+                if not slot.closed:
+                    slot.inflight += 1
+                    break
+
+        try:
+            return slot.handler.handle(record)
+        finally:
+            with slot.idle:
+                slot.inflight -= 1
+                if not slot.inflight:
+                    slot.idle.notify_all()
+
+    def emit(self, record: logging.LogRecord):
+        self.handle(record)
+
+    def _resume(self, handler: logging.Handler, held: _Slot):
+        records = held.handler.records
+        # only the records held so far, busy threads could keep adding more
+        for _ in range(len(records)):
+            handler.handle(records.popleft())
+
+        self._current = _Slot(handler)
+        self.setLevel(handler.level)
+
+        # the records held since then
+        held.close()
+        while records:
+            handler.handle(records.popleft())
+
+    def swap(
+        self,
+        build: t.Callable[[], logging.Handler],
+        rebuild: t.Callable[[], logging.Handler],
+    ):
+        """
+        Replace the handler with the one returned by `build`
+
+        If `build` raises, the handler returned by `rebuild` is used instead, and the
+        exception is raised. If that fails too, warnings are written to stderr.
+        Must not be called while logging to this handler.
+        """
+        with self.lock:
+            old, held = self._current, _Slot(_Hold())
+            self._current = held
+
+            old.close()
+            old.handler.close()
+
+            try:
+                handler = build()
+            except BaseException:
+                try:
+                    handler = rebuild()
+                except Exception:
+                    handler = _last_resort()
+                self._resume(handler, held)
+                raise
+
+            self._resume(handler, held)
+
+    def flush(self):
+        self.handler.flush()
+
+    def close(self):
+        self.handler.close()
+        super().close()
+
+
+def _stat(path) -> t.Optional[t.Tuple[int, int]]:
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+class ConfigContext:
+    """
+    A context manager that installs the logging pipeline of a configuration
+
+    Created by `from_config`. The handlers are replaced without losing records with
+    `apply` and `reload`, or automatically when watching the configuration file.
+    Can also be used with `async with`, like LoggingContext.
+    """
+
+    def __init__(
+        self,
+        config: Config,
+        logger: logging.Logger = None,
+        path=None,
+        interval: float = None,
+    ):
+        self.logger = logger or logging.root
+        self.path = path
+        self.interval = interval
+        self.config = validate_config(config)
+        self.handler = SwapHandler(build_config(self.config))
+
+        self._entered = False
+        self._stat = _stat(path) if path is not None else None
+        self._stop = threading.Event()
+        self._watcher: t.Optional[threading.Thread] = None
+
+    @property
+    def handlers(self) -> t.Tuple[logging.Handler, ...]:
+        """The handlers currently in use"""
+        return self.handler.handler.handlers
+
+    def apply(self, config: Config):
+        """
+        Replace the handlers with the ones of another configuration
+
+        Raises ConfigError if the configuration is invalid, the handlers are left alone.
+        Records logged while the handlers are replaced are held and written by the new
+        handlers, the records queued by the old handlers are written first.
+        """
+        config = validate_config(config)
+        previous = self.config
+
+        self.handler.swap(lambda: build_config(config), lambda: build_config(previous))
+        self.config = config
+
+        if self._entered:
+            self.logger.setLevel(self.handler.level)
+
+    def reload(self):
+        """Read the configuration file again and apply it"""
+        if self.path is None:
+            raise ValueError("The configuration was not read from a file")
+
+        self._stat = _stat(self.path)
+        self.apply(load_config(self.path))
+
+    def _watch(self):
+        changed = None
+
+        while not self._stop.wait(self.interval):
+            stat = _stat(self.path)
+            # skip files that are being replaced, they come back with a new stat
+            if stat is None or stat == self._stat:
+                continue
+
+            # wait for the file to stay the same for an interval, it could still be
+            # being written
+            if stat != changed:
+                changed = stat
+                continue
+
+            try:
+                self.reload()
+            except Exception:
+                logging.getLogger(__name__).exception(
+                    "Could not reload the logging configuration from %s", self.path
+                )
+
+    def __enter__(self):
+        self.old_level = self.logger.level
+        self.logger.setLevel(self.handler.level)
+        self.logger.addHandler(self.handler)
+        self._entered = True
+
+        if self.interval is not None:
+            self._stop.clear()
+            self._watcher = threading.Thread(
+                target=self._watch, name="styled-logging-config", daemon=True
+            )
+            self._watcher.start()
+
+        return self
+
+    def __exit__(self, *exc_info):
+        if self._watcher is not None:
+            self._stop.set()
+            self._watcher.join()
+            self._watcher = None
+
+        self._entered = False
+        self.logger.setLevel(self.old_level)
+        self.logger.removeHandler(self.handler)
+        self.handler.close()
+
+    async def __aenter__(self):
+        return self.__enter__()
+
+    async def __aexit__(self, *exc_info):
+        await flush_handlers([self.handler])
+        self.__exit__(*exc_info)
+
+
+def from_config(
+    config,
+    logger: logging.Logger = None,
+    reload: bool = False,
+    interval: float = 1.0,
+) -> ConfigContext:
+    """
+    Create a logging context from a configuration
+
+    The configuration is validated first, errors are raised as ConfigError with the
+    location of the problem, like "config.handlers[1].level: unknown level 'VERBOSE'".
+
+    Options, all optional:
+    - `handlers`: a list of tables with a `type`, and the arguments of its factory:
+        - "console": `level`, `color`, `formats`, `background`, `asynchronous`,
+          `stats`. See create_console_handler
+        - "file": `path`, `level`, `format`, `json`, `binary`, `buffered`,
+          `max_bytes`, `rotate_interval`, `backup_count`, `background`,
+          `asynchronous`, `stats`. See create_file_handler
+        - "ring": `handler`, `capacity`, `level`, `trigger_level`.
+          See create_ring_buffer_handler
+      A console handler with default values if missing.
+    - `background`, `asynchronous`: like logging_context
+    - `sampling`: the arguments of SamplingFilter
+    - `rate_limit`: the arguments of RateLimitFilter
+    - `time_format`: the arguments of set_time_format, the defaults if missing
+
+    Parameters
+    ----------
+    `config` : dict or path-like
+        The configuration, or the path to a TOML file with it
+    `logger` : logging.Logger, default None
+        The logger to configure, defaults to the root logger
+    `reload` : bool, default False
+        Watch the file while the context is active, and apply it when it changes and
+        stays the same for `interval`. If the new configuration is invalid, the error
+        is logged and the handlers are left alone.
+    `interval` : float, default 1.0
+        How often to check the file for changes, in seconds
+    """
+    path = None
+
+    if isinstance(config, (str, os.PathLike)):
+        path = config
+        config = load_config(path)
+    elif reload:
+        raise ValueError("Only configuration files can be reloaded")
+
+    return ConfigContext(
+        config, logger=logger, path=path, interval=interval if reload else None
+    )
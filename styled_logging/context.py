@@ -1,11 +1,21 @@
 import logging
 from typing import Sequence
 
+from .aio import AsyncHandler, flush_handlers
+from .background import BackgroundHandler
+from .dispatch import LevelDispatcher
 from .handlers import create_console_handler
+from .sampling import SamplingFilter
+from .scoped import ScopedLoggingContext
 
 
 class LoggingContext:
-    """A context manager that will change the log settings temporarily"""
+    """
+    A context manager that will change the log settings temporarily
+
+    Can also be used with `async with`, which flushes the handler without blocking the
+    event loop before removing it.
+    """
 
     def __init__(
         self,
@@ -37,6 +47,15 @@ class LoggingContext:
         if self.handler and self.close:
             self.handler.close()
 
+    async def __aenter__(self):
+        return self.__enter__()
+
+    async def __aexit__(self, *exc_info):
+        if self.handler:
+            await flush_handlers([self.handler])
+
+        self.__exit__(*exc_info)
+
 
 class MultiContext:
     """Can be used to dynamically combine context managers"""
@@ -51,6 +70,13 @@ class MultiContext:
         for ctx in self.contexts:
             ctx.__exit__(*exc_info)
 
+    async def __aenter__(self):
+        return tuple([await ctx.__aenter__() for ctx in self.contexts])
+
+    async def __aexit__(self, *exc_info):
+        for ctx in self.contexts:
+            await ctx.__aexit__(*exc_info)
+
 
 def create_base_context(
     handlers: Sequence[logging.Handler],
@@ -63,6 +89,13 @@ def create_base_context(
 def logging_context(
     logger: logging.Logger = None,
     handlers: Sequence[logging.Handler] = None,
+    background: bool = False,
+    dispatch: bool = False,
+    scoped: bool = False,
+    collector: str = None,
+    filters: Sequence[logging.Filter] = None,
+    sampling: SamplingFilter = None,
+    asynchronous: bool = False,
 ):
     """
     Create a logging context
@@ -77,9 +110,68 @@ def logging_context(
         Create a console handler with create_console_handler
         Create a file handler with styled_logging.create_file_handler
         If None, creates a console handler with default values.
+
+    `background` : bool, default False
+        Format and write records on a background thread.
+        Handlers are flushed and closed when the context exits.
+
+    `dispatch` : bool, default False
+        Install the handlers behind a single styled_logging.LevelDispatcher, so each
+        record only visits the handlers whose level accepts it.
+        This pays off when there are many handlers with different levels.
+
+    `scoped` : bool, default False
+        Only use the handlers in the current thread or asyncio task.
+        See styled_logging.ScopedLoggingContext
+
+    `collector` : str, default None
+        The address of a styled_logging.Collector.
+        If given and `handlers` is None, sends INFO and above to the collector.
+
+    `filters` : sequence of logging.Filter, default None
+        Filters to run once per record, before any handler formats it.
+        For example styled_logging.RateLimitFilter.
+        The handlers are installed behind a styled_logging.LevelDispatcher.
+
+    `sampling` : styled_logging.SamplingFilter, default None
+        Keep only a fraction of the records at some levels.
+        Runs before `filters`, so sampled out records are not seen by them.
+
+    `asynchronous` : bool, default False
+        For asyncio applications, use with `async with`. Records are written on a
+        background thread that never blocks the event loop, see
+        styled_logging.AsyncHandler. Exiting waits for them without blocking the loop.
     """
+    if not handlers and collector:
+        from .collector import CollectorHandler
+
+        handlers = [CollectorHandler(collector, level=logging.INFO)]
+
     handlers = handlers or [create_console_handler()]
 
+    if asynchronous:
+        handlers = [
+            h if isinstance(h, AsyncHandler) else AsyncHandler(h) for h in handlers
+        ]
+
+    if background:
+        handlers = [
+            h if isinstance(h, BackgroundHandler) else BackgroundHandler(h)
+            for h in handlers
+        ]
+
+    if sampling is not None:
+        filters = [sampling, *(filters or ())]
+
+    if dispatch or filters:
+        dispatcher = LevelDispatcher(handlers)
+        for f in filters or ():
+            dispatcher.addFilter(f)
+        handlers = [dispatcher]
+
+    if scoped:
+        return ScopedLoggingContext(logger=logger, handlers=handlers)
+
     contexts = [create_base_context(handlers, logger)]
 
     contexts.extend(
@@ -1,29 +1,288 @@
 import functools
+import itertools
 import logging
-import textwrap
-from typing import Type
-from pretty_traceback.formatting import exc_to_traceback_str
+import os
+import threading
+from collections import OrderedDict
+from typing import Callable, Hashable, Iterator, List, Optional, Sequence, Tuple, Type
 
+from .capture import Entry, TracebackData, capture_exception, to_tracebacks
+from .timestamps import _stock_time, format_time
 from .types import TFormatter
 
+# the attribute of an exception holding its cache token
+_TOKEN = "_styled_logging_token"
 
-def prettify(cls: Type[TFormatter] = None, /, *, color=True, indent=4) -> Type[TFormatter]:
-    """Decorator to prettify a logging.Formatter exception output"""
+
+def _token(exc_value: BaseException) -> Optional[object]:
+    """A unique object stored on the exception, standing in for it in cache keys"""
+    try:
+        attrs = vars(exc_value)
+        token = attrs.get(_TOKEN)
+        if token is None:
+            token = attrs[_TOKEN] = object()
+        return token
+    except TypeError:
+        return None
+
+
+def _identity(traceback) -> Tuple[int, int]:
+    """Tells tracebacks of the same exception apart, it grows each time it's re-raised"""
+    depth = 0
+    tb = traceback
+    while tb is not None:
+        depth += 1
+        tb = tb.tb_next
+    return id(traceback), depth
+
+
+class TracebackCache:
+    """
+    A bounded LRU cache of rendered tracebacks
+
+    Entries are keyed by a token stored on the exception, plus the rendering settings,
+    so each variant of a traceback is only rendered once, no matter how many handlers
+    format the record. Entries only keep the rendered text and the identity of the
+    traceback it was rendered from, the exception and its frames are freed as usual.
+    An exception that was re-raised since it was rendered is rendered again.
+
+    Parameters
+    ----------
+    `maxsize` : int, default 128
+        The maximum number of rendered tracebacks to keep
+    `maxchars` : int, default 4_000_000
+        The maximum total length of all rendered tracebacks.
+        Tracebacks longer than this are never cached.
+    """
+
+    def __init__(self, maxsize: int = 128, maxchars: int = 4_000_000):
+        self.maxsize = maxsize
+        self.maxchars = maxchars
+        self.chars = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(
+        self,
+        exc_value: BaseException,
+        traceback,
+        settings: Hashable,
+        render: Callable[[], str],
+    ) -> str:
+        """Get the rendered traceback, calling `render` on a cache miss"""
+        # a different traceback than the exception's could be freed and its id reused
+        token = _token(exc_value) if traceback is exc_value.__traceback__ else None
+        if token is None:
+            return render()
+
+        key = (token, settings)
+        identity = _identity(traceback)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == identity:
+                self._entries.move_to_end(key)
+                return entry[1]
+
+        text = render()
+
+        if len(text) > self.maxchars:
+            return text
+
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.chars -= len(old[1])
+
+            self._entries[key] = (identity, text)
+            self.chars += len(text)
+
+            while len(self._entries) > self.maxsize or self.chars > self.maxchars:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self.chars -= len(evicted)
+
+        return text
+
+    def clear(self):
+        """Remove all cached tracebacks"""
+        with self._lock:
+            self._entries.clear()
+            self.chars = 0
+
+
+DEFAULT_TRACEBACK_CACHE = TracebackCache()
+
+
+class _Prettified:
+    """Base of the formatter classes made by `prettify`"""
+
+
+def is_prettified(formatter: logging.Formatter) -> bool:
+    """Whether the formatter renders tracebacks with `prettify`"""
+    return isinstance(formatter, _Prettified)
+
+
+def made_by_prettify(cls: type) -> bool:
+    """
+    Whether the class itself was made by `prettify`
+
+    Its `format` only resets `exc_text` before formatting like the class it wraps.
+    """
+    return _Prettified in cls.__bases__
+
+
+def _marker(text: str) -> Entry:
+    """A traceback row standing in for omitted frames"""
+    return ("...", "", "", text)
+
+
+def _collapse_repeats(entries: Sequence[Entry], max_repeats: int) -> List[Entry]:
+    """Keep at most `max_repeats` of consecutive identical frames"""
+    collapsed = []
+    for _, group in itertools.groupby(entries):
+        run = list(group)
+        collapsed.extend(run[:max_repeats])
+        if len(run) > max_repeats:
+            collapsed.append(_marker(f"repeated {len(run) - max_repeats} more times"))
+    return collapsed
+
+
+def _cap_frames(entries: Sequence[Entry], max_frames: int) -> List[Entry]:
+    """Keep the outermost and innermost frames, `max_frames` in total"""
+    if len(entries) <= max_frames:
+        return list(entries)
+
+    head = max_frames // 2
+    tail = max_frames - head
+    omitted = len(entries) - max_frames
+    return [
+        *entries[:head],
+        _marker(f"{omitted} frames omitted"),
+        *entries[len(entries) - tail :],
+    ]
+
+
+def _limit(
+    tracebacks: Sequence[TracebackData],
+    max_frames: Optional[int],
+    max_repeats: Optional[int],
+    max_chain: Optional[int],
+) -> Tuple[int, List[TracebackData]]:
+    """Apply the limits to captured tracebacks, returning the number of dropped ones"""
+    omitted = 0
+    if max_chain is not None and len(tracebacks) > max_chain:
+        omitted = len(tracebacks) - max_chain
+        tracebacks = tracebacks[omitted:]
+
+    limited = []
+    for name, msg, entries, caused, context in tracebacks:
+        if max_repeats is not None:
+            entries = _collapse_repeats(entries, max_repeats)
+        if max_frames is not None:
+            entries = _cap_frames(entries, max_frames)
+        limited.append((name, msg, entries, caused, context))
+
+    return omitted, limited
+
+
+def _render_lines(
+    tracebacks: Sequence[TracebackData], omitted: int, color: bool
+) -> Iterator[str]:
+    """The lines of the pretty traceback, like pretty_traceback.format_tracebacks"""
+    # imported on first use to keep the package import fast
+    from pretty_traceback import common, formatting
+
+    if omitted:
+        yield f"... {omitted} earlier exceptions omitted"
+        yield ""
+
+    # reads source lines only for the frames that are kept
+    for i, traceback in enumerate(to_tracebacks(tracebacks)):
+        if i:
+            yield ""
+        if traceback.is_caused:
+            yield common.CAUSE_HEAD
+            yield ""
+        elif traceback.is_context:
+            yield common.CONTEXT_HEAD
+            yield ""
+        yield from formatting.format_traceback(traceback, color).splitlines()
+
+
+def prettify(
+    cls: Type[TFormatter] = None,
+    /,
+    *,
+    color=True,
+    indent=4,
+    cache: Optional[TracebackCache] = DEFAULT_TRACEBACK_CACHE,
+    max_frames: Optional[int] = None,
+    max_repeats: Optional[int] = None,
+    max_chain: Optional[int] = None,
+) -> Type[TFormatter]:
+    """
+    Decorator to prettify a logging.Formatter exception output
+
+    Rendered tracebacks are shared through `cache`, pass None to render on every call.
+    Times are rendered through a cache shared by all prettified formatters, see
+    styled_logging.set_time_format.
+
+    The limits keep huge tracebacks, like a RecursionError or a long chain of causes,
+    from rendering megabytes of text. None means no limit.
+
+    Parameters
+    ----------
+    `max_frames` : int, default None
+        The number of frames to show for each exception. The outermost and innermost
+        frames are kept, with a "... N frames omitted" row in between.
+    `max_repeats` : int, default None
+        Show a frame this many times in a row at most, then "... repeated N more times"
+    `max_chain` : int, default None
+        The number of chained exceptions to show, most recent first
+    """
+    limits = (max_frames, max_repeats, max_chain)
 
     def wrap(cls: Type[TFormatter]):
         @functools.wraps(cls, updated=())
-        class PrettyFormatter(cls):
+        class PrettyFormatter(cls, _Prettified):
             def formatException(self, ei):
                 _, exc_value, traceback = ei
-                return textwrap.indent(
-                    exc_to_traceback_str(exc_value, traceback, color=color),
-                    " " * indent,
-                )
+
+                def render():
+                    captured = capture_exception(exc_value, traceback)
+                    omitted, tracebacks = _limit(captured.tracebacks, *limits)
+                    lines = _render_lines(tracebacks, omitted, color)
+
+                    # indents while joining, like textwrap.indent without the copy
+                    prefix = " " * indent
+                    return os.linesep.join(
+                        prefix + line if line.strip() else line for line in lines
+                    )
+
+                if cache is None or exc_value is None:
+                    return render()
+
+                settings = (color, indent, limits)
+                return cache.get(exc_value, traceback, settings, render)
 
             def format(self, record: logging.LogRecord):
-                record.exc_text = None
+                # a MultiFormatter leaves the exception to the formatter of the level
+                formatter_for = getattr(self, "formatter_for", None)
+                if formatter_for is None or formatter_for(record.levelno) is None:
+                    record.exc_text = None
                 return super().format(record)
 
+            if cls.formatTime is logging.Formatter.formatTime:
+
+                def formatTime(self, record: logging.LogRecord, datefmt=None):
+                    # each second is formatted once, for all formatters
+                    if _stock_time(self):
+                        return format_time(record, datefmt)
+                    return super().formatTime(record, datefmt)
+
         return PrettyFormatter
 
     # See if we're being called as @prettify or @prettify().
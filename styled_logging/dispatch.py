@@ -0,0 +1,71 @@
+import logging
+from typing import Dict, Sequence, Tuple
+
+
+class LevelDispatcher(logging.Handler):
+    """
+    A handler that passes records only to the handlers whose level accepts them
+
+    The handlers for each level are looked up in an index, so a record does not visit
+    handlers that would reject it. The index is built from the handler levels when the
+    dispatcher is created. Call `refresh` after changing a handler's level.
+
+    Filters added to the dispatcher run once per record, before any of the handlers.
+
+    Parameters
+    ----------
+    `handlers` : sequence of logging.Handler
+        The handlers to dispatch to
+    """
+
+    def __init__(self, handlers: Sequence[logging.Handler]):
+        self.handlers = tuple(handlers)
+        super().__init__()
+        self.refresh()
+
+    def refresh(self):
+        """Rebuild the level index from the current handler levels"""
+        self.setLevel(min(h.level for h in self.handlers))
+        self._index = [self._accepting(level) for level in range(logging.CRITICAL + 1)]
+        self._custom: Dict[int, Tuple[logging.Handler, ...]] = {}
+
+    def _accepting(self, levelno: int) -> Tuple[logging.Handler, ...]:
+        return tuple(h for h in self.handlers if levelno >= h.level)
+
+    def handle(self, record: logging.LogRecord):
+        if self.filters and not self.filter(record):
+            return False
+
+        levelno = record.levelno
+
+        if 0 <= levelno <= logging.CRITICAL:
+            handlers = self._index[levelno]
+        else:
+            handlers = self._custom.get(levelno)
+            if handlers is None:
+                handlers = self._custom[levelno] = self._accepting(levelno)
+
+        for handler in handlers:
+            handler.handle(record)
+
+        return bool(handlers)
+
+    def emit(self, record: logging.LogRecord):
+        self.handle(record)
+
+    def flush(self):
+        for handler in self.handlers:
+            handler.flush()
+
+    def close(self):
+        # filters like RateLimitFilter may still have records to report
+        for f in self.filters:
+            drain = getattr(f, "drain", None)
+            if drain is not None:
+                for record in drain():
+                    self.handle(record)
+
+        for handler in self.handlers:
+            handler.close()
+
+        super().close()
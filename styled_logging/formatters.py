@@ -1,11 +1,14 @@
+import functools
 import logging
+import operator
+import re
+import threading
 import typing as t
 
-from .decorator import prettify
+from .decorator import made_by_prettify, prettify
 from .color import style
 from .types import TFormatter
 
-
 DEBUG_FMT = style("DEBUG", fg="cyan") + " | " + style("%(message)s", fg="cyan")
 INFO_FMT = "%(message)s"
 WARNING_FMT = style("WARN ", fg="yellow") + " | " + style("%(message)s", fg="yellow")
@@ -24,6 +27,15 @@ DEFAULT_FORMATS = {
     logging.CRITICAL: CRITICAL_FMT,
 }
 
+# the default formats without color, for streams that aren't terminals
+PLAIN_FORMATS = {
+    logging.DEBUG: "DEBUG | %(message)s",
+    logging.INFO: "%(message)s",
+    logging.WARNING: "WARN  | %(message)s",
+    logging.ERROR: "ERROR | %(message)s",
+    logging.CRITICAL: "FATAL | %(message)s",
+}
+
 
 def make_formatters(
     formats: t.Dict[int, str], cls: t.Union[t.Type[TFormatter], None] = None, **kwargs
@@ -40,7 +52,237 @@ def make_formatters(
     return {level: cls(fmt, **kwargs) for level, fmt in formats.items()}
 
 
-DEFAULT_FORMATTERS: t.Dict[int, logging.Formatter] = make_formatters(DEFAULT_FORMATS)
+_lazy_lock = threading.Lock()
+
+
+def _lazy(name: str, build: t.Callable[[], t.Any]):
+    """Build a module attribute the first time it is used"""
+    with _lazy_lock:
+        if name not in globals():
+            globals()[name] = build()
+
+    return globals()[name]
+
+
+def _default_formatters() -> t.Dict[int, logging.Formatter]:
+    return _lazy("DEFAULT_FORMATTERS", lambda: make_formatters(DEFAULT_FORMATS))
+
+
+def _plain_formatters() -> t.Dict[int, logging.Formatter]:
+    return _lazy(
+        "PLAIN_FORMATTERS",
+        lambda: make_formatters(
+            PLAIN_FORMATS, prettify(logging.Formatter, color=False)
+        ),
+    )
+
+
+def __getattr__(name: str):
+    if name == "DEFAULT_FORMATTERS":
+        return _default_formatters()
+
+    if name == "PLAIN_FORMATTERS":
+        return _plain_formatters()
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+Renderer = t.Callable[[logging.LogRecord], str]
+
+_FIELD = re.compile(r"%\((\w+)\)")
+
+# a printf-style conversion without a mapping key or `*`, see _parse_template
+_CONVERSION = re.compile(r"%[#0\- +]*\d*(?:\.\d*)?[hlL]?([diouxXeEfFgGcrsa%])")
+
+# a message template that can't be spliced, see _parse_template
+_UNSPLICEABLE = (None, -1)
+
+
+class TemplateCacheInfo(t.NamedTuple):
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+    hit_rate: float
+
+
+def _parse_template(
+    prefix: str, msg: str, suffix: str
+) -> t.Tuple[t.Optional[str], int]:
+    """
+    Splice a message template into the level format around it
+
+    Returns the combined template and the number of arguments it takes, or
+    _UNSPLICEABLE when the message uses anything besides positional conversions.
+    """
+    count = 0
+    for match in _CONVERSION.finditer(msg):
+        if match[1] != "%":
+            count += 1
+
+    if "%" in _CONVERSION.sub("", msg):
+        return _UNSPLICEABLE
+
+    return prefix + msg + suffix, count
+
+
+def _has_stock_format(formatter: logging.Formatter) -> bool:
+    """Whether the formatter renders records exactly like logging.Formatter"""
+    cls = type(formatter)
+
+    for klass in cls.__mro__:
+        format = vars(klass).get("format")
+        # the format of a prettified class only resets exc_text, look past it
+        if format is None or made_by_prettify(klass):
+            continue
+        if format is not logging.Formatter.format:
+            return False
+        break
+
+    return (
+        cls.formatMessage is logging.Formatter.formatMessage
+        and cls.usesTime is logging.Formatter.usesTime
+        and type(formatter._style) is logging.PercentStyle
+        and not getattr(formatter._style, "_defaults", None)
+    )
+
+
+def _compile(formatter: logging.Formatter, template_cache_size: int = None) -> Renderer:
+    """
+    Compile a formatter into a function that renders records without an exception.
+
+    The format string is converted to a positional template once, so rendering a record
+    only reads the fields it references. Records with exception or stack info, and
+    formatters that can't be compiled, are rendered by the formatter itself.
+
+    When the format only contains the message, message templates are spliced into it
+    and the last `template_cache_size` are cached, so a record is rendered with a single
+    interpolation.
+    """
+    if not _has_stock_format(formatter):
+        return formatter.format
+
+    fmt = formatter._style._fmt
+    keys = tuple(_FIELD.findall(fmt))
+    template = _FIELD.sub("%", fmt)
+
+    # anything the conversion can't represent exactly is left to the formatter
+    rest = logging.PercentStyle.validation_pattern.sub("", fmt).replace("%%", "")
+    if "%" in rest or "*" in fmt:
+        return formatter.format
+
+    uses_time = formatter.usesTime()
+    format_time = formatter.formatTime
+    datefmt = formatter.datefmt
+    slow = formatter.format
+
+    if keys == ("message",) and "%(message)s" in fmt and template_cache_size:
+        return _compile_spliced(fmt, slow, template_cache_size)
+
+    if keys == ("message",) and template == "%s":
+
+        def interpolate(values):
+            return values["message"]
+
+    elif len(keys) == 1:
+        key = keys[0]
+
+        def interpolate(values):
+            return template % (values[key],)
+
+    else:
+        getter = operator.itemgetter(*keys)
+
+        def interpolate(values):
+            return template % getter(values)
+
+    def render(record: logging.LogRecord) -> str:
+        if record.exc_info or record.exc_text or record.stack_info:
+            return slow(record)
+
+        record.message = record.getMessage()
+        if uses_time:
+            record.asctime = format_time(record, datefmt)
+
+        try:
+            return interpolate(record.__dict__)
+        except KeyError as e:
+            raise ValueError("Formatting field not found in record: %s" % e)
+
+    return render
+
+
+def _compile_spliced(fmt: str, slow: Renderer, template_cache_size: int) -> Renderer:
+    """Render formats like DEFAULT_FORMATS, which only wrap the message"""
+    prefix, _, suffix = fmt.partition("%(message)s")
+    # the literal text around the message, for records without arguments
+    before, after = prefix.replace("%%", "%"), suffix.replace("%%", "%")
+    start, stop = len(before), -len(after) or None
+
+    @functools.lru_cache(maxsize=template_cache_size)
+    def parse(msg: str) -> t.Tuple[t.Optional[str], int]:
+        return _parse_template(prefix, msg, suffix)
+
+    def render(record: logging.LogRecord) -> str:
+        if record.exc_info or record.exc_text or record.stack_info:
+            return slow(record)
+
+        msg, args = record.msg, record.args
+
+        if type(msg) is str:
+            if not args:
+                record.message = msg
+                return before + msg + after
+
+            if type(args) is tuple:
+                spliced, count = parse(msg)
+                if count == len(args):
+                    line = spliced % args
+                    record.message = line[start:stop]
+                    return line
+
+        record.message = message = record.getMessage()
+        return before + message + after
+
+    # pre-encoded `before` and `after`, by encoding and error handler
+    fragments: t.Dict[t.Tuple[str, str], t.Tuple[bytes, bytes]] = {}
+
+    def encode_into(
+        record: logging.LogRecord, buffer: bytearray, encoding: str, errors: str
+    ):
+        if record.exc_info or record.exc_text or record.stack_info:
+            buffer += slow(record).encode(encoding, errors)
+            return
+
+        msg, args = record.msg, record.args
+
+        if type(msg) is str and args and type(args) is tuple:
+            # the same template cache as render
+            spliced, count = parse(msg)
+            if count == len(args):
+                line = spliced % args
+                record.message = line[start:stop]
+                buffer += line.encode(encoding, errors)
+                return
+
+        encoded = fragments.get((encoding, errors))
+        if encoded is None:
+            encoded = fragments[encoding, errors] = (
+                before.encode(encoding, errors),
+                after.encode(encoding, errors),
+            )
+
+        if type(msg) is str and not args:
+            record.message = message = msg
+        else:
+            record.message = message = record.getMessage()
+        buffer += encoded[0]
+        buffer += message.encode(encoding, errors)
+        buffer += encoded[1]
+
+    render.cache_info = parse.cache_info
+    render.encode_into = encode_into
+    return render
 
 
 class MultiFormatter(logging.Formatter):
@@ -52,22 +294,108 @@ class MultiFormatter(logging.Formatter):
     `formatters` : dict of int to logging.Formatter
         This is a mapping of log level to its formatter.
         If a level is omitted, the base logging.Formatter will be used for that level.
+        The formatters are compiled when assigned, so changes to the dict afterwards
+        are not picked up. Assign a new dict instead.
+    `template_cache_size` : int, default 1024
+        How many message templates to keep spliced into each level format, for the
+        formats that only wrap the message, like DEFAULT_FORMATS. 0 disables splicing.
+        See `template_cache_info` for the hit rate.
     `kwargs` : dict
         Keyword arguments to forward to logging.Formatter.
     """
 
-    def __init__(self, formatters: t.Dict[int, logging.Formatter] = None, **kwargs):
+    def __init__(
+        self,
+        formatters: t.Dict[int, logging.Formatter] = None,
+        template_cache_size: int = 1024,
+        **kwargs,
+    ):
         super().__init__(**kwargs)
+        self.template_cache_size = template_cache_size
 
         if formatters is None:
-            formatters = DEFAULT_FORMATTERS
+            formatters = _default_formatters()
 
         self.formatters = formatters
 
+    @property
+    def formatters(self) -> t.Dict[int, logging.Formatter]:
+        return self._formatters
+
+    @formatters.setter
+    def formatters(self, formatters: t.Dict[int, logging.Formatter]):
+        # standard levels are looked up by index, custom levels fall back to a dict
+        dense: t.List[t.Optional[Renderer]] = [None] * (logging.CRITICAL + 1)
+        sparse: t.Dict[int, Renderer] = {}
+
+        for level, formatter in formatters.items():
+            if 0 <= level <= logging.CRITICAL:
+                dense[level] = _compile(formatter, self.template_cache_size)
+            else:
+                sparse[level] = _compile(formatter, self.template_cache_size)
+
+        self._formatters = formatters
+        self._dense = dense
+        self._sparse = sparse
+
+    def formatter_for(self, levelno: int) -> t.Optional[logging.Formatter]:
+        """The formatter of the level, or None if it falls back to logging.Formatter"""
+        return self._formatters.get(levelno)
+
+    def template_cache_info(self) -> TemplateCacheInfo:
+        """The hits, misses, size and hit rate of the message templates, for all levels"""
+        hits = misses = maxsize = currsize = 0
+
+        for render in {*self._dense, *self._sparse.values()}:
+            info = getattr(render, "cache_info", None)
+            if info is not None:
+                info = info()
+                hits += info.hits
+                misses += info.misses
+                maxsize += info.maxsize
+                currsize += info.currsize
+
+        total = hits + misses
+        return TemplateCacheInfo(
+            hits, misses, maxsize, currsize, hits / total if total else 0.0
+        )
+
+    def format_into(
+        self,
+        record: logging.LogRecord,
+        buffer: bytearray,
+        encoding: str = "utf-8",
+        errors: str = "strict",
+    ):
+        """
+        Append the encoded record to `buffer`
+
+        The styled text around the message is encoded once per level, so only the
+        message is encoded for each record. See styled_logging.RawStreamHandler
+        """
+        levelno = record.levelno
+
+        if 0 <= levelno <= logging.CRITICAL:
+            render = self._dense[levelno]
+        else:
+            render = self._sparse.get(levelno)
+
+        encode_into = getattr(render, "encode_into", None)
+
+        if encode_into is None:
+            buffer += self.format(record).encode(encoding, errors)
+        else:
+            encode_into(record, buffer, encoding, errors)
+
     def format(self, record: logging.LogRecord):
-        formatter = self.formatters.get(record.levelno)
+        levelno = record.levelno
+
+        if 0 <= levelno <= logging.CRITICAL:
+            render = self._dense[levelno]
+        else:
+            render = self._sparse.get(levelno)
 
-        if formatter is None:
+        if render is None:
             return super().format(record)
 
-        return formatter.format(record)
+        return render(record)
@@ -1,12 +1,32 @@
 import logging
+import typing as t
 
+from .aio import AsyncHandler
+from .background import BackgroundHandler
+from .buffered import BufferedFileHandler
+from .raw import RawFileHandler, RawStreamHandler
+from .ring import RingBufferHandler
+from .stats import instrument
+from .color import NO_COLOR, detect_color_depth, set_color_depth
 from .decorator import prettify
-from .formatters import MultiFormatter
+from .formatters import (
+    DEFAULT_FORMATS,
+    PLAIN_FORMATS,
+    MultiFormatter,
+    _plain_formatters,
+    make_formatters,
+)
 
 
 def create_console_handler(
     level: int = logging.INFO,
     formatter: logging.Formatter = None,
+    background: bool = False,
+    color: bool = None,
+    stats: bool = False,
+    asynchronous: bool = False,
+    formats: t.Dict[int, str] = None,
+    match_style: bool = False,
 ):
     """
     Create a logging handler to display messages in the console
@@ -18,20 +38,78 @@ def create_console_handler(
     `formatter` : logging.Formatter, default None
         Can be used to override the formatter.
         If None, uses styled_logging.MultiFormatter
+    `background` : bool, default False
+        Format and write records on a background thread.
+        See styled_logging.BackgroundHandler
+    `color` : bool, default None
+        Whether to use the colored formats, when `formatter` is None.
+        If None, detects if stderr supports color.
+        See styled_logging.color.detect_color_depth
+    `stats` : bool, default False
+        Measure the time spent formatting and writing records, see
+        styled_logging.instrument. The counters are available as `handler.stats`.
+    `asynchronous` : bool, default False
+        Like `background`, but never blocks an asyncio event loop, see
+        styled_logging.AsyncHandler
+    `formats` : dict of int to str, default None
+        Format strings for some levels, replacing the default formats of those levels
+        when `formatter` is None
+    `match_style` : bool, default False
+        Also make styled_logging.style fit stderr, for the whole process: colors are
+        downgraded for terminals with fewer colors than truecolor, and left out when
+        stderr is not a terminal. See styled_logging.color.set_color_depth
     """
-    formatter = formatter or prettify(MultiFormatter, color=True, indent=4)()
+    console_handler = RawStreamHandler()
+
+    if color is None or match_style:
+        depth = detect_color_depth(console_handler.stream)
+        if color is None:
+            color = depth != NO_COLOR
+        if match_style:
+            set_color_depth(depth)
+
+    if formatter is None:
+        if formats:
+            formatters = make_formatters(
+                {**(DEFAULT_FORMATS if color else PLAIN_FORMATS), **formats},
+                prettify(logging.Formatter, color=color),
+            )
+        else:
+            formatters = None if color else _plain_formatters()
+
+        formatter = prettify(MultiFormatter, color=color, indent=4)(
+            formatters=formatters
+        )
 
-    console_handler = logging.StreamHandler()
     console_handler.setFormatter(formatter)
     console_handler.setLevel(level)
 
-    return console_handler
+    if asynchronous:
+        handler = AsyncHandler(console_handler)
+    elif background:
+        handler = BackgroundHandler(console_handler)
+    else:
+        handler = console_handler
+
+    if stats:
+        instrument(handler)
+
+    return handler
 
 
 def create_file_handler(
     path: str,
     level: int = logging.WARNING,
     formatter: logging.Formatter = None,
+    background: bool = False,
+    buffered: bool = False,
+    json: bool = False,
+    binary: bool = False,
+    max_bytes: int = 0,
+    rotate_interval: float = None,
+    backup_count: int = 5,
+    stats: bool = False,
+    asynchronous: bool = False,
 ):
     """
     Create a file handler to log messages to a file
@@ -46,12 +124,114 @@ def create_file_handler(
         Can be used to override the formatter.
         If None, uses a prettified logging.Formatter with format:
         `"%(levelname)s:%(asctime)s:%(name)s:%(message)s"`
+    `background` : bool, default False
+        Format and write records on a background thread.
+        See styled_logging.BackgroundHandler
+    `buffered` : bool, default False
+        Write records to the file in batches.
+        Records at ERROR and above are written immediately.
+        See styled_logging.BufferedFileHandler
+    `json` : bool, default False
+        Write JSON lines instead of text, when `formatter` is None.
+        See styled_logging.JsonFormatter
+    `binary` : bool, default False
+        Write a compact binary log without formatting records, `formatter` is ignored.
+        Render it with `python -m styled_logging <path>`.
+        See styled_logging.BinaryFileHandler
+    `max_bytes` : int, default 0
+        Rotate the file before it grows past this size, 0 disables size rotation.
+    `rotate_interval` : float, default None
+        Rotate the file every this many seconds, None disables time rotation.
+    `backup_count` : int, default 5
+        How many rotated files to keep. Rotated files are gzipped in the background.
+        See styled_logging.RotatingFileHandler
+    `stats` : bool, default False
+        Measure the time spent formatting and writing records, see
+        styled_logging.instrument. The counters are available as `handler.stats`.
+    `asynchronous` : bool, default False
+        Like `background`, but never blocks an asyncio event loop, see
+        styled_logging.AsyncHandler
     """
+    if formatter is None and json:
+        from .structured import JsonFormatter
+
+        formatter = JsonFormatter()
+
     formatter = formatter or prettify(logging.Formatter, color=False, indent=4)(
         "%(levelname)s:%(asctime)s:%(name)s:%(message)s"
     )
-    file_handler = logging.FileHandler(path)
+    rotate = max_bytes or rotate_interval
+
+    if buffered and rotate:
+        raise ValueError("A file handler can't be both buffered and rotating")
+
+    if binary and (buffered or rotate or json):
+        raise ValueError("A binary file handler can't be buffered, rotating or JSON")
+
+    # the binary and rotating handlers are imported on first use, like asyncio in aio
+    if binary:
+        from .binary import BinaryFileHandler
+
+        file_handler = BinaryFileHandler(path)
+    elif rotate:
+        from .rotating import RotatingFileHandler
+
+        file_handler = RotatingFileHandler(
+            path,
+            max_bytes=max_bytes,
+            interval=rotate_interval,
+            backup_count=backup_count,
+        )
+    elif buffered:
+        file_handler = BufferedFileHandler(path)
+    else:
+        file_handler = RawFileHandler(path)
+
     file_handler.setFormatter(formatter)
     file_handler.setLevel(level)
 
-    return file_handler
+    if asynchronous:
+        handler = AsyncHandler(file_handler)
+    elif background:
+        handler = BackgroundHandler(file_handler)
+    else:
+        handler = file_handler
+
+    if stats:
+        instrument(handler)
+
+    return handler
+
+
+def create_ring_buffer_handler(
+    handler: logging.Handler = None,
+    capacity: int = 1000,
+    level: int = logging.DEBUG,
+    trigger_level: int = logging.ERROR,
+):
+    """
+    Create a handler that keeps recent records in memory, writing them on errors
+
+    Records below the level of `handler` are not formatted, just kept in a ring of the
+    last `capacity` records. When a record at `trigger_level` or above arrives, they
+    are written through `handler` before it.
+
+    Parameters
+    ----------
+    `handler` : logging.Handler, default None
+        The handler that will format and write the records.
+        If None, creates a console handler with default values.
+    `capacity` : int, default 1000
+        How many records to keep
+    `level` : int, default logging.DEBUG
+        The lowest level to keep
+    `trigger_level` : int, default logging.ERROR
+        Records at this level or above write the kept records
+        See styled_logging.RingBufferHandler
+    """
+    return RingBufferHandler(
+        handler or create_console_handler(),
+        capacity=capacity,
+        level=level,
+        trigger_level=trigger_level,
+    )
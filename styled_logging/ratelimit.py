@@ -0,0 +1,182 @@
+import logging
+import threading
+import time
+import typing as t
+from collections import OrderedDict
+
+Key = t.Tuple[str, int, t.Any, t.Optional[str], t.Optional[str], t.Optional[int]]
+
+
+def _record_key(record: logging.LogRecord) -> Key:
+    """Records with the same logger, level, message template and exception origin"""
+    exc_type = filename = lineno = None
+
+    if record.exc_info and record.exc_info[0] is not None:
+        exc_type = record.exc_info[0].__name__
+        traceback = record.exc_info[2]
+        while traceback is not None and traceback.tb_next is not None:
+            traceback = traceback.tb_next
+        if traceback is not None:
+            filename = traceback.tb_frame.f_code.co_filename
+            lineno = traceback.tb_lineno
+
+    # messages that aren't templates, like dicts, are grouped by type
+    msg = record.msg if isinstance(record.msg, str) else type(record.msg)
+    return (record.name, record.levelno, msg, exc_type, filename, lineno)
+
+
+def _summary(key: Key, suppressed: int) -> logging.LogRecord:
+    name, levelno, msg, *_ = key
+    return logging.makeLogRecord(
+        {
+            "name": name,
+            "levelno": levelno,
+            "levelname": logging.getLevelName(levelno),
+            "msg": "Suppressed %d similar messages: %s",
+            "args": (
+                suppressed,
+                f"{msg.__name__} messages" if isinstance(msg, type) else msg,
+            ),
+        }
+    )
+
+
+class _Bucket:
+    __slots__ = ("tokens", "updated", "suppressed", "since")
+
+    def __init__(self, tokens: float, now: float):
+        self.tokens = tokens
+        self.updated = now
+        self.suppressed = 0
+        self.since = now
+
+
+class RateLimitFilter(logging.Filter):
+    """
+    Drop repeated records during log storms, and report how many were dropped
+
+    Similar records share the same logger, level, message template, and exception type
+    and location. Each group gets a token bucket: `burst` records pass right away, then
+    `rate` per second. Dropped records are counted, and a "Suppressed N similar
+    messages" record is logged for the group every `summary_interval` seconds.
+
+    A group that stops logging still gets its summary, from a timer thread. Groups
+    forgotten because of `max_keys` are summarized right away, and a LevelDispatcher
+    logs the pending summaries when it closes, see `drain`.
+
+    Use with logging_context(filters=[RateLimitFilter()]), so each record is checked
+    once before it is formatted by any handler.
+
+    Parameters
+    ----------
+    `rate` : float, default 1.0
+        Records per second that pass for each group, after the burst
+    `burst` : int, default 10
+        Records that can pass at once for each group
+    `summary_interval` : float, default 10.0
+        How often to log the number of suppressed records of a group
+    `max_keys` : int, default 1024
+        How many groups to track. The least recently seen groups are forgotten.
+    """
+
+    def __init__(
+        self,
+        rate: float = 1.0,
+        burst: int = 10,
+        summary_interval: float = 10.0,
+        max_keys: int = 1024,
+    ):
+        super().__init__()
+        self.rate = rate
+        self.burst = burst
+        self.summary_interval = summary_interval
+        self.max_keys = max_keys
+        self.suppressed = 0
+
+        self._buckets: t.OrderedDict[Key, _Bucket] = OrderedDict()
+        self._lock = threading.Lock()
+        self._next_sweep = time.monotonic() + summary_interval
+        self._timer: t.Optional[threading.Timer] = None
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        key = _record_key(record)
+        now = time.monotonic()
+        summaries = []
+
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = self._buckets[key] = _Bucket(self.burst, now)
+                if len(self._buckets) > self.max_keys:
+                    evicted_key, evicted = self._buckets.popitem(last=False)
+                    if evicted.suppressed:
+                        summaries.append(_summary(evicted_key, evicted.suppressed))
+            else:
+                self._buckets.move_to_end(key)
+                bucket.tokens = min(
+                    self.burst, bucket.tokens + (now - bucket.updated) * self.rate
+                )
+                bucket.updated = now
+
+            allowed = bucket.tokens >= 1
+            if allowed:
+                bucket.tokens -= 1
+            else:
+                if not bucket.suppressed:
+                    bucket.since = now
+                bucket.suppressed += 1
+                self.suppressed += 1
+                self._schedule()
+
+            summaries += self._due_summaries(now)
+
+        _log(summaries)
+        return allowed
+
+    def _schedule(self):
+        """Make sure suppressed groups are summarized even if nothing else is logged"""
+        if self._timer is None:
+            self._timer = threading.Timer(self.summary_interval, self._on_timer)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _on_timer(self):
+        with self._lock:
+            self._timer = None
+            self._next_sweep = 0.0
+            summaries = self._due_summaries(time.monotonic())
+            if any(bucket.suppressed for bucket in self._buckets.values()):
+                self._schedule()
+
+        _log(summaries)
+
+    def _due_summaries(self, now: float, force=False) -> t.List[logging.LogRecord]:
+        """Collect summaries for groups that have been suppressed for a while"""
+        if now < self._next_sweep and not force:
+            return []
+
+        self._next_sweep = now + self.summary_interval
+        summaries = []
+
+        for key, bucket in self._buckets.items():
+            if bucket.suppressed and (
+                force or now - bucket.since >= self.summary_interval
+            ):
+                summaries.append(_summary(key, bucket.suppressed))
+                bucket.suppressed = 0
+
+        return summaries
+
+    def drain(self) -> t.List[logging.LogRecord]:
+        """Take the summaries of all groups with suppressed records, and stop the timer"""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+
+            return self._due_summaries(time.monotonic(), force=True)
+
+
+def _log(summaries: t.List[logging.LogRecord]):
+    for summary in summaries:
+        logging.getLogger(summary.name).handle(summary)
@@ -0,0 +1,122 @@
+import logging
+import os
+import typing as t
+
+# (fd, encoding, errors) for a stream, or None when it has to be written as text
+_Target = t.Optional[t.Tuple[int, str, str]]
+
+
+def _raw_target(stream) -> _Target:
+    """The file descriptor and encoding to write to a stream directly, if it has one"""
+    try:
+        fd = stream.fileno()
+    except (AttributeError, OSError, ValueError):
+        return None
+
+    # the Windows console needs the text layer to translate to its own encoding
+    if os.name == "nt" and stream.isatty():  # pragma: no cover
+        return None
+
+    return (
+        fd,
+        getattr(stream, "encoding", None) or "utf-8",
+        getattr(stream, "errors", None) or "strict",
+    )
+
+
+class _RawEmit:
+    """
+    Encode records into a reusable buffer and write it to the file descriptor
+    """
+
+    stream: t.Any
+    terminator: str
+
+    _buffer: bytearray
+    _target: _Target
+    _target_stream: t.Any = None
+
+    def format_into(
+        self, record: logging.LogRecord, buffer: bytearray, encoding: str, errors: str
+    ):
+        """Append the encoded record to `buffer`"""
+        formatter = self.formatter or logging._defaultFormatter
+        format_into = getattr(formatter, "format_into", None)
+
+        if format_into is None:
+            buffer += formatter.format(record).encode(encoding, errors)
+        else:
+            format_into(record, buffer, encoding, errors)
+
+    def emit(self, record: logging.LogRecord):
+        stream = self.stream
+
+        if stream is not self._target_stream:
+            self._target = _raw_target(stream) if stream is not None else None
+            self._target_stream = stream
+            self._buffer = bytearray()
+
+        if self._target is None:
+            return super().emit(record)
+
+        try:
+            fd, encoding, errors = self._target
+            buffer = self._buffer
+            del buffer[:]
+
+            self.format_into(record, buffer, encoding, errors)
+            buffer += self.terminator.encode(encoding, errors)
+
+            # anything written through the text layer goes first
+            stream.flush()
+
+            data = memoryview(buffer)
+            try:
+                while data:
+                    data = data[os.write(fd, data) :]
+            finally:
+                data.release()
+        except RecursionError:  # pragma: no cover
+            raise
+        except Exception:
+            self.handleError(record)
+
+
+class RawStreamHandler(_RawEmit, logging.StreamHandler):
+    """
+    A stream handler that writes encoded records straight to the file descriptor
+
+    Skips the copies of the text layer: the record is encoded into a reusable buffer
+    and written with one system call. Formatters with a `format_into` method, like
+    MultiFormatter, append pre-encoded fragments to the buffer, others are encoded
+    after formatting. Streams without a file descriptor, like io.StringIO, are written
+    as text like logging.StreamHandler.
+
+    Parameters
+    ----------
+    `stream` : TextIO, default sys.stderr
+        The stream to write to
+    """
+
+
+class RawFileHandler(_RawEmit, logging.FileHandler):
+    """
+    A file handler that writes encoded records straight to the file descriptor
+
+    See RawStreamHandler.
+    """
+
+    # set by close, so a record logged afterwards doesn't truncate a "w" file again
+    _was_closed = False
+
+    def emit(self, record: logging.LogRecord):
+        if self.stream is None:
+            if self.mode != "w" or not self._was_closed:
+                self.stream = self._open()
+
+        if self.stream:
+            super().emit(record)
+
+    def close(self):
+        self._was_closed = True
+        super().close()
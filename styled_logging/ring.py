@@ -0,0 +1,103 @@
+import logging
+import typing as t
+
+from .background import _snapshot
+
+
+class RingBufferHandler(logging.Handler):
+    """
+    Keep recent low level records in memory, and write them when something fails
+
+    Records the wrapped handler's level accepts are passed to it right away. The others
+    are kept unformatted in a fixed-size ring, overwriting the oldest one when it is
+    full. When a record at `trigger_level` or above arrives, the kept records are
+    written through the wrapped handler first, so the failure shows up with the
+    DEBUG context that led to it.
+
+    The kept records are written after the ones that were passed through while they
+    waited, so the output is not in time order. Include `%(asctime)s` in the format
+    to tell when each record was logged.
+    Kept records are snapshotted like BackgroundHandler.prepare, so they don't keep
+    the frames of an exception or later changes to their arguments.
+
+    Parameters
+    ----------
+    `handler` : logging.Handler
+        The handler that will format and write the records
+    `capacity` : int, default 1000
+        How many records to keep
+    `level` : int, default logging.DEBUG
+        The lowest level to keep
+    `trigger_level` : int, default logging.ERROR
+        Records at this level or above write the kept records
+    """
+
+    def __init__(
+        self,
+        handler: logging.Handler,
+        capacity: int = 1000,
+        level: int = logging.DEBUG,
+        trigger_level: int = logging.ERROR,
+    ):
+        if capacity < 1:
+            raise ValueError(f"capacity must be at least 1, got {capacity}")
+
+        super().__init__(level=level)
+
+        self.handler = handler
+        self.capacity = capacity
+        self.trigger_level = trigger_level
+
+        self._records: t.List[t.Optional[logging.LogRecord]] = [None] * capacity
+        self._next = 0
+        self._count = 0
+
+    def setFormatter(self, fmt: logging.Formatter):
+        self.handler.setFormatter(fmt)
+
+    def emit(self, record: logging.LogRecord):
+        if record.levelno >= self.trigger_level:
+            self.dump()
+
+        if record.levelno >= self.handler.level:
+            self.handler.handle(record)
+            return
+
+        try:
+            record = _snapshot(record, self.handler)
+        except RecursionError:  # pragma: no cover
+            raise
+        except Exception:
+            self.handleError(record)
+            return
+
+        self._records[self._next] = record
+        self._next = (self._next + 1) % self.capacity
+        self._count = min(self._count + 1, self.capacity)
+
+    def records(self) -> t.List[logging.LogRecord]:
+        """The kept records, oldest first"""
+        start = (self._next - self._count) % self.capacity
+        ordered = self._records[start:] + self._records[:start]
+        return ordered[: self._count]
+
+    def dump(self):
+        """Write the kept records through the wrapped handler, and forget them"""
+        self.acquire()
+        try:
+            records = self.records()
+            self._records[:] = [None] * self.capacity
+            self._next = self._count = 0
+        finally:
+            self.release()
+
+        for record in records:
+            self.handler.handle(record)
+
+    def flush(self):
+        self.handler.flush()
+
+    def close(self):
+        """Close the wrapped handler, dropping the kept records"""
+        self.handler.close()
+        super().close()
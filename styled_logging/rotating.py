@@ -0,0 +1,156 @@
+import gzip
+import logging
+import os
+import queue
+import re
+import shutil
+import threading
+import time
+
+
+class RotatingFileHandler(logging.FileHandler):
+    """
+    A file handler that starts a new file by size or time, compressing old files
+
+    The current file is closed, renamed to `<filename>.<timestamp>`, and a new one is
+    opened. Compressing and deleting old files happens on a background thread, so a
+    rotation only costs the emitting thread a close, a rename and an open.
+
+    Records are encoded once and written as bytes, so line endings are not translated
+    on Windows.
+
+    Parameters
+    ----------
+    `filename` : path-like
+        The path to the log file
+    `max_bytes` : int, default 0
+        Rotate before the file would grow past this size. 0 disables size rotation.
+    `interval` : float, default None
+        Rotate every this many seconds. None disables time rotation.
+    `backup_count` : int, default 5
+        How many rotated files to keep. 0 keeps all of them.
+    `compress` : bool, default True
+        Gzip rotated files
+    `encoding` : str, default None
+        The file encoding
+    """
+
+    def __init__(
+        self,
+        filename,
+        max_bytes: int = 0,
+        interval: float = None,
+        backup_count: int = 5,
+        compress: bool = True,
+        encoding: str = None,
+    ):
+        super().__init__(filename, mode="a", encoding=encoding)
+        self.max_bytes = max_bytes
+        self.interval = interval
+        self.backup_count = backup_count
+        self.compress = compress
+
+        self._size = os.path.getsize(self.baseFilename)
+        self._rollover_at = time.time() + interval if interval else None
+        self._pattern = re.compile(
+            re.escape(os.path.basename(self.baseFilename))
+            + r"\.(\d{8}-\d{6})(?:-(\d+))?(?:\.gz)?"
+        )
+        self._jobs = queue.Queue()
+        self._worker = None
+
+    def emit(self, record: logging.LogRecord):
+        try:
+            if self.stream is None:
+                self.stream = self._open()
+                self._size = os.path.getsize(self.baseFilename)
+
+            msg = self.format(record) + self.terminator
+            # max_bytes is about the file, so count the bytes that are written
+            data = msg.encode(self.stream.encoding, self.stream.errors or "strict")
+
+            if self._should_rollover(len(data)):
+                self._rollover()
+
+            buffer = self.stream.buffer
+            buffer.write(data)
+            buffer.flush()
+            self._size += len(data)
+        except RecursionError:  # pragma: no cover
+            raise
+        except Exception:
+            self.handleError(record)
+
+    def _should_rollover(self, length: int) -> bool:
+        if self.max_bytes and self._size and self._size + length > self.max_bytes:
+            return True
+
+        return self._rollover_at is not None and time.time() >= self._rollover_at
+
+    def _rotated_name(self) -> str:
+        name = f"{self.baseFilename}.{time.strftime('%Y%m%d-%H%M%S')}"
+        candidate, n = name, 0
+        while os.path.exists(candidate) or os.path.exists(candidate + ".gz"):
+            n += 1
+            candidate = f"{name}-{n}"
+        return candidate
+
+    def _rollover(self):
+        """Swap in a new file. The handler lock must be held."""
+        rotated = self._rotated_name()
+
+        # Windows can't rename an open file
+        self.stream.close()
+        try:
+            os.rename(self.baseFilename, rotated)
+        finally:
+            # if the rename failed, keep appending to the current file
+            self.stream = self._open()
+        self._size = 0
+
+        if self.interval:
+            self._rollover_at = time.time() + self.interval
+
+        if self._worker is None:
+            self._worker = threading.Thread(target=self._work, daemon=True)
+            self._worker.start()
+
+        self._jobs.put(rotated)
+
+    def _work(self):
+        while True:
+            rotated = self._jobs.get()
+            if rotated is None:
+                return
+
+            try:
+                if self.compress:
+                    with open(rotated, "rb") as src:
+                        with gzip.open(rotated + ".gz", "wb") as dst:
+                            shutil.copyfileobj(src, dst)
+                    os.remove(rotated)
+                self._prune()
+            except Exception:
+                self.handleError(
+                    logging.makeLogRecord({"msg": f"Failed to rotate {rotated}"})
+                )
+
+    def _prune(self):
+        if not self.backup_count:
+            return
+
+        directory = os.path.dirname(self.baseFilename)
+        matches = filter(None, map(self._pattern.fullmatch, os.listdir(directory)))
+        backups = sorted(matches, key=lambda m: (m[1], int(m[2] or 0)))
+
+        for match in backups[: -self.backup_count]:
+            os.remove(os.path.join(directory, match[0]))
+
+    def close(self):
+        """Close the file, waiting for rotated files to be compressed"""
+        if self._worker is not None:
+            self._jobs.put(None)
+            self._worker.join()
+            self._worker = None
+
+        super().close()
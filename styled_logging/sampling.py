@@ -0,0 +1,125 @@
+import logging
+import threading
+import typing as t
+from collections import Counter
+
+Rates = t.Mapping[int, float]
+
+
+class _Sampler:
+    """Keeps a record each time the count times the rate reaches a whole number"""
+
+    __slots__ = ("rate", "count")
+
+    def __init__(self, rate: float):
+        self.rate = rate
+        self.count = 0
+
+    def sample(self) -> bool:
+        n = self.count
+        self.count += 1
+        if n == 0:
+            return self.rate > 0
+        return int(n * self.rate) > int((n - 1) * self.rate)
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Keep only a fraction of the records at some levels
+
+    Rates are fractions between 0 and 1 for each level number. Levels without a rate
+    are not sampled. `loggers` overrides the rates for a logger and its children, for
+    example keep 1% of DEBUG, 10% of INFO from logger "x", and all WARNING and above:
+
+        SamplingFilter({logging.DEBUG: 0.01}, loggers={"x": {logging.INFO: 0.1}})
+
+    Use with logging_context(sampling=...), so records are dropped before any handler
+    formats them. The number of dropped records is counted in `sampled_out`, and per
+    logger and level in `counts`.
+
+    Parameters
+    ----------
+    `levels` : mapping of int to float, default None
+        The rate for each level, for all loggers
+    `loggers` : mapping of str to mapping of int to float, default None
+        The rates for each level, for a logger and its children.
+        The closest configured ancestor of a logger is used, falling back to `levels`.
+    `deterministic` : bool, default False
+        Keep exactly every n-th record of each logger and level, instead of a random
+        sample. With a rate of 0.1, the 1st, 11th, 21st... records are kept.
+    `seed` : int, default None
+        Seed for the random sample
+    """
+
+    def __init__(
+        self,
+        levels: Rates = None,
+        loggers: t.Mapping[str, Rates] = None,
+        deterministic: bool = False,
+        seed: int = None,
+    ):
+        super().__init__()
+        self.levels = dict(levels or {})
+        self.loggers = {name: dict(rates) for name, rates in (loggers or {}).items()}
+        self.deterministic = deterministic
+        self.sampled_out = 0
+        self.counts: t.Counter[t.Tuple[str, int]] = Counter()
+
+        for rates in (self.levels, *self.loggers.values()):
+            for levelno, rate in rates.items():
+                if not 0 <= rate <= 1:
+                    raise ValueError(
+                        f"Sampling rate for level {levelno} must be between 0 and 1, "
+                        f"got {rate}"
+                    )
+
+        # imported on first use to keep the package import fast
+        import random
+
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        # logger name -> (configured name, rates)
+        self._resolved: t.Dict[str, t.Tuple[str, Rates]] = {}
+        self._samplers: t.Dict[t.Tuple[str, int], _Sampler] = {}
+
+    def _rates(self, name: str) -> t.Tuple[str, Rates]:
+        """The rates for a logger, from its closest configured ancestor"""
+        resolved = self._resolved.get(name)
+        if resolved is not None:
+            return resolved
+
+        configured = name
+        while configured and configured not in self.loggers:
+            configured = configured.rpartition(".")[0]
+
+        if configured:
+            resolved = (configured, self.loggers[configured])
+        else:
+            resolved = ("", self.levels)
+
+        self._resolved[name] = resolved
+        return resolved
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        configured, rates = self._rates(record.name)
+        rate = rates.get(record.levelno, 1.0)
+
+        if rate >= 1:
+            return True
+
+        key = (configured, record.levelno)
+
+        with self._lock:
+            if self.deterministic:
+                sampler = self._samplers.get(key)
+                if sampler is None:
+                    sampler = self._samplers[key] = _Sampler(rate)
+                allowed = sampler.sample()
+            else:
+                allowed = self._random.random() < rate
+
+            if not allowed:
+                self.sampled_out += 1
+                self.counts[key] += 1
+
+        return allowed
@@ -0,0 +1,125 @@
+import logging
+import threading
+from contextvars import ContextVar
+from typing import Dict, Sequence, Tuple
+
+from .aio import flush_handlers
+
+Handlers = Tuple[logging.Handler, ...]
+
+# the handlers of the scoped contexts entered in the current thread or task, by logger
+_scopes: ContextVar[Dict[logging.Logger, Handlers]] = ContextVar(
+    "styled_logging_scopes", default={}
+)
+
+_install_lock = threading.Lock()
+
+
+class ScopeHandler(logging.Handler):
+    """
+    Pass records to the handlers of the scoped contexts in the current thread or task
+
+    One is added to a logger when its first ScopedLoggingContext is entered, and removed
+    when its last one exits. Records logged outside the contexts are ignored.
+    """
+
+    def __init__(self, logger: logging.Logger):
+        super().__init__()
+        self.logger = logger
+        self.users = 0
+
+    def handle(self, record: logging.LogRecord):
+        handlers = _scopes.get().get(self.logger)
+
+        if not handlers:
+            return False
+
+        for handler in handlers:
+            if record.levelno >= handler.level:
+                handler.handle(record)
+
+        return True
+
+    def emit(self, record: logging.LogRecord):
+        self.handle(record)
+
+
+# the scope handler of each logger with active scoped contexts
+_installed: Dict[logging.Logger, ScopeHandler] = {}
+
+
+def _acquire(logger: logging.Logger):
+    """Add the logger's scope handler when its first scoped context is entered"""
+    with _install_lock:
+        handler = _installed.get(logger)
+        if handler is None:
+            handler = _installed[logger] = ScopeHandler(logger)
+            logger.addHandler(handler)
+        handler.users += 1
+
+
+def _release(logger: logging.Logger):
+    """Remove the logger's scope handler when its last scoped context exits"""
+    with _install_lock:
+        handler = _installed[logger]
+        handler.users -= 1
+        if not handler.users:
+            del _installed[logger]
+            logger.removeHandler(handler)
+
+
+class ScopedLoggingContext:
+    """
+    A context manager that adds handlers for the current thread or asyncio task only
+
+    Other threads and tasks are not affected, and the logger's level and handlers are
+    left alone. Contexts can be nested, the handlers of the outer contexts stay active.
+
+    The logger's level still decides which records are created. For per-request debug
+    logging, set the logger to DEBUG and give the shared handlers their own levels.
+
+    Parameters
+    ----------
+    `logger` : logging.Logger, default None
+        The logger to configure, defaults to the root logger
+    `handlers` : sequence of logging.Handler
+        The handlers to use while the context is active
+    `close` : bool, default True
+        Close the handlers when the context exits
+    """
+
+    def __init__(
+        self,
+        logger: logging.Logger = None,
+        handlers: Sequence[logging.Handler] = (),
+        close: bool = True,
+    ):
+        self.logger = logger or logging.root
+        self.handlers = tuple(handlers)
+        self.close = close
+
+    def __enter__(self):
+        if self.handlers:
+            _acquire(self.logger)
+
+        scopes = _scopes.get()
+        self._token = _scopes.set(
+            {**scopes, self.logger: scopes.get(self.logger, ()) + self.handlers}
+        )
+
+    def __exit__(self, *exc_info):
+        _scopes.reset(self._token)
+
+        if self.handlers:
+            _release(self.logger)
+
+        if self.close:
+            for handler in self.handlers:
+                handler.close()
+
+    async def __aenter__(self):
+        return self.__enter__()
+
+    async def __aexit__(self, *exc_info):
+        await flush_handlers(self.handlers)
+        self.__exit__(*exc_info)
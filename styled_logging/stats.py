@@ -0,0 +1,112 @@
+import logging
+import threading
+import time
+import typing as t
+from collections import Counter
+
+from .background import BackgroundHandler
+
+
+class HandlerStats:
+    """
+    Counters for the records a handler wrote, see `instrument`
+
+    Attributes
+    ----------
+    `format_time` : float
+        Seconds spent formatting records, including tracebacks
+    `emit_time` : float
+        Seconds spent writing records, not counting formatting
+    `bytes` : int
+        Bytes of formatted text written, in the encoding of the stream
+    `records` : Counter
+        The number of records written for each level name
+    """
+
+    def __init__(self, queue: BackgroundHandler = None):
+        self.format_time = 0.0
+        self.emit_time = 0.0
+        self.bytes = 0
+        self.records: t.Counter[str] = Counter()
+        self._queue = queue
+        self._lock = threading.Lock()
+
+    def snapshot(self) -> t.Dict[str, t.Any]:
+        """
+        A copy of the counters, safe to read while records are being written
+
+        `queue_depth` and `dropped` are only included for background handlers.
+        """
+        with self._lock:
+            snapshot = {
+                "format_time": self.format_time,
+                "emit_time": self.emit_time,
+                "bytes": self.bytes,
+                "records": dict(self.records),
+            }
+
+        if self._queue is not None:
+            snapshot["queue_depth"] = self._queue.queue_depth
+            snapshot["dropped"] = self._queue.dropped
+
+        return snapshot
+
+
+def instrument(handler: logging.Handler) -> HandlerStats:
+    """
+    Measure the time a handler spends formatting and writing records
+
+    The stats are stored as `handler.stats` and returned. A background handler is
+    measured on its writer thread, and also reports its queue depth.
+    Handlers that are not instrumented pay nothing.
+    """
+    queue = handler if isinstance(handler, BackgroundHandler) else None
+    target = queue.handler if queue is not None else handler
+    stats = HandlerStats(queue)
+
+    perf_counter = time.perf_counter
+    format_record = target.format
+    emit_record = target.emit
+    # raw handlers encode records into a buffer instead of calling format
+    format_record_into = getattr(target, "format_into", None)
+    # the formatting of the record being emitted, emit runs under the handler lock
+    pending = [0.0, 0]
+
+    def format(record: logging.LogRecord) -> str:
+        start = perf_counter()
+        text = format_record(record)
+        pending[0] += perf_counter() - start
+
+        stream = getattr(target, "stream", None)
+        encoding = getattr(stream, "encoding", None) or "utf-8"
+        terminator = getattr(target, "terminator", "")
+        pending[1] += len((text + terminator).encode(encoding, "replace"))
+        return text
+
+    def format_into(record: logging.LogRecord, buffer: bytearray, *encoding):
+        size = len(buffer)
+        start = perf_counter()
+        format_record_into(record, buffer, *encoding)
+        pending[0] += perf_counter() - start
+        pending[1] += len(buffer) - size + len(target.terminator)
+
+    def emit(record: logging.LogRecord):
+        pending[:] = 0.0, 0
+        start = perf_counter()
+        try:
+            emit_record(record)
+        finally:
+            elapsed = perf_counter() - start
+            with stats._lock:
+                stats.format_time += pending[0]
+                stats.emit_time += elapsed - pending[0]
+                stats.bytes += pending[1]
+                stats.records[record.levelname] += 1
+
+    target.format = format
+    target.emit = emit
+    if format_record_into is not None:
+        target.format_into = format_into
+
+    handler.stats = stats
+    return stats
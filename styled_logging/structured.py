@@ -0,0 +1,68 @@
+import logging
+import typing as t
+
+from .decorator import prettify
+
+try:
+    import orjson
+
+    def _dumps(obj: t.Dict[str, t.Any]) -> str:
+        return orjson.dumps(obj, default=str).decode()
+
+    _loads = orjson.loads
+
+except ImportError:  # pragma: no cover
+    import json
+
+    _encoder = json.JSONEncoder(
+        default=str, ensure_ascii=False, separators=(",", ":"), check_circular=False
+    )
+    _dumps = _encoder.encode
+    _loads = json.loads
+
+
+# attributes every LogRecord has, anything else was passed with `extra`
+_RECORD_ATTRS = frozenset(
+    vars(logging.LogRecord("", 0, "", 0, "", None, None)).keys()
+) | {"message", "asctime"}
+
+
+@prettify(color=False, indent=0)
+class JsonFormatter(logging.Formatter):
+    """
+    Format records as JSON lines
+
+    Each line has the time, level, logger name and message of the record, any attributes
+    passed with `extra`, and the uncolored pretty traceback as `exc_info`.
+    Uses orjson when it is installed, and the json module otherwise.
+
+    Parameters
+    ----------
+    `datefmt` : str, default None
+        The time format, see logging.Formatter.formatTime
+    """
+
+    def __init__(self, datefmt: str = None):
+        super().__init__(datefmt=datefmt)
+
+    def format(self, record: logging.LogRecord):
+        data = {
+            "time": self.formatTime(record, self.datefmt),
+            "level": record.levelname,
+            "name": record.name,
+            "message": record.getMessage(),
+        }
+
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRS:
+                data[key] = value
+
+        if record.exc_info:
+            data["exc_info"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            data["exc_info"] = record.exc_text
+
+        if record.stack_info:
+            data["stack_info"] = self.formatStack(record.stack_info)
+
+        return _dumps(data)
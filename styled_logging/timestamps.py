@@ -0,0 +1,105 @@
+import functools
+import logging
+import time
+import typing as t
+
+_settings = {"iso": False, "utc": False}
+
+
+def set_time_format(iso: bool = False, utc: bool = False):
+    """
+    Change how styled_logging formatters render `%(asctime)s`
+
+    Parameters
+    ----------
+    `iso` : bool, default False
+        Use ISO-8601, like "2024-01-31T12:00:00.123+01:00".
+        Otherwise the format of logging.Formatter is used, "2024-01-31 12:00:00,123".
+    `utc` : bool, default False
+        Use UTC instead of local time. ISO-8601 times end with "Z".
+    """
+    _settings.update(iso=iso, utc=utc)
+
+
+class TimestampCache:
+    """
+    Renders record times, formatting each second only once
+
+    The formatted second is cached and the milliseconds appended to it, so records
+    logged in the same second don't call time.strftime again. Reading and replacing
+    the cached second is a single assignment, so the cache can be shared by threads.
+
+    Parameters
+    ----------
+    `datefmt` : str, default None
+        A time.strftime format. Milliseconds are only appended without one, like
+        logging.Formatter.formatTime
+    `utc` : bool, default False
+        Use UTC instead of local time
+    `iso` : bool, default False
+        Use ISO-8601, ignoring `datefmt`
+    """
+
+    def __init__(self, datefmt: str = None, utc: bool = False, iso: bool = False):
+        self.datefmt = datefmt
+        self.utc = utc
+        self.iso = iso
+        self._converter = time.gmtime if utc else time.localtime
+        self._last: t.Tuple[int, str, str] = (-1, "", "")
+
+    def _render(self, second: int) -> t.Tuple[int, str, str]:
+        struct = self._converter(second)
+
+        if self.iso:
+            if self.utc:
+                offset = "Z"
+            else:
+                minutes = struct.tm_gmtoff // 60
+                sign = "-" if minutes < 0 else "+"
+                offset = "%s%02d:%02d" % (sign, *divmod(abs(minutes), 60))
+            return second, time.strftime("%Y-%m-%dT%H:%M:%S", struct) + ".", offset
+
+        if self.datefmt:
+            return second, time.strftime(self.datefmt, struct), ""
+
+        return second, time.strftime(logging.Formatter.default_time_format, struct), ""
+
+    def format(self, created: float, msecs: float) -> str:
+        """Render the time of a record from its `created` and `msecs` attributes"""
+        last = self._last
+        second = int(created)
+
+        if last[0] != second:
+            last = self._last = self._render(second)
+
+        if self.iso:
+            return "%s%03d%s" % (last[1], msecs, last[2])
+
+        if self.datefmt:
+            return last[1]
+
+        return logging.Formatter.default_msec_format % (last[1], msecs)
+
+
+def _stock_time(formatter: logging.Formatter) -> bool:
+    """Whether the formatter renders times like logging.Formatter"""
+    return (
+        formatter.converter is time.localtime
+        and formatter.default_time_format == logging.Formatter.default_time_format
+        and formatter.default_msec_format == logging.Formatter.default_msec_format
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def _shared(datefmt: t.Optional[str], utc: bool, iso: bool) -> TimestampCache:
+    return TimestampCache(datefmt, utc=utc, iso=iso)
+
+
+def format_time(record: logging.LogRecord, datefmt: str = None) -> str:
+    """
+    Render the time of a record with a cache shared by all styled_logging formatters
+
+    Uses the format set with `set_time_format`.
+    """
+    cache = _shared(datefmt, _settings["utc"], _settings["iso"])
+    return cache.format(record.created, record.msecs)
@@ -1,5 +1,22 @@
+from .test_aio import *
+from .test_background import *
+from .test_binary import *
+from .test_buffered import *
+from .test_collector import *
+from .test_config import *
+from .test_color import *
 from .test_context import *
 from .test_decorator import *
 from .test_formatter import *
 from .test_handlers import *
+from .test_import import *
+from .test_ratelimit import *
+from .test_raw import *
+from .test_ring import *
+from .test_rotating import *
+from .test_sampling import *
+from .test_scoped import *
 from .test_setup import *
+from .test_stats import *
+from .test_structured import *
+from .test_timestamps import *
@@ -0,0 +1,17 @@
+import logging
+import threading
+
+
+class ListHandler(logging.Handler):
+    """Collects the messages of the records it handles"""
+
+    def __init__(self, level=logging.NOTSET):
+        super().__init__(level)
+        self.messages = []
+        # clear to make emit wait, like a slow terminal or disk
+        self.gate = threading.Event()
+        self.gate.set()
+
+    def emit(self, record):
+        self.gate.wait()
+        self.messages.append(record.getMessage())
@@ -0,0 +1,90 @@
+import asyncio
+import logging
+import unittest
+from styled_logging import AsyncHandler, logging_context
+from .helpers import ListHandler
+
+
+class TestAsyncHandler(unittest.IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        self.logger = logging.getLogger(f"{__name__}.{self.id()}")
+        self.logger.propagate = False
+        self.target = ListHandler(logging.DEBUG)
+
+    async def test_async_context(self):
+        async with logging_context(
+            self.logger, handlers=[self.target], asynchronous=True
+        ):
+            for i in range(100):
+                self.logger.info("%d", i)
+
+        self.assertListEqual(self.target.messages, [str(i) for i in range(100)])
+
+    async def test_scoped_async_context(self):
+        # scoped contexts don't change the logger level
+        self.logger.setLevel(logging.INFO)
+        async with logging_context(
+            self.logger, handlers=[self.target], asynchronous=True, scoped=True
+        ):
+            self.logger.info("message")
+
+        self.assertListEqual(self.target.messages, ["message"])
+
+    async def test_aflush(self):
+        handler = AsyncHandler(self.target)
+        self.target.gate.clear()
+        handler.handle(logging.makeLogRecord({"msg": "message"}))
+
+        flushed = asyncio.ensure_future(handler.aflush())
+        await asyncio.sleep(0.01)
+        self.assertFalse(flushed.done())
+        self.assertListEqual(self.target.messages, [])
+
+        self.target.gate.set()
+        await asyncio.wait_for(flushed, timeout=5)
+
+        self.assertListEqual(self.target.messages, ["message"])
+        handler.close()
+
+    async def test_never_blocks_loop(self):
+        handler = AsyncHandler(self.target, maxsize=5)
+        self.target.gate.clear()
+
+        for i in range(20):
+            handler.handle(logging.makeLogRecord({"msg": str(i)}))
+
+        self.assertGreater(handler.dropped, 0)
+
+        self.target.gate.set()
+        await handler.aflush()
+        handler.close()
+
+    async def test_drain(self):
+        handler = AsyncHandler(self.target, maxsize=10, low_water=2)
+        self.target.gate.clear()
+
+        # wait until the writer is stuck on the first record
+        handler.handle(logging.makeLogRecord({"msg": "first"}))
+        while handler.queue_depth:
+            await asyncio.sleep(0)
+
+        for i in range(5):
+            handler.handle(logging.makeLogRecord({"msg": str(i)}))
+
+        drained = asyncio.ensure_future(handler.drain())
+        await asyncio.sleep(0.01)
+        self.assertFalse(drained.done())
+
+        self.target.gate.set()
+        await asyncio.wait_for(drained, timeout=5)
+
+        self.assertLessEqual(handler.queue_depth, 2)
+        handler.close()
+
+    async def test_flush_blocks(self):
+        handler = AsyncHandler(self.target)
+        handler.handle(logging.makeLogRecord({"msg": "message"}))
+
+        self.assertIsNone(handler.flush())
+        self.assertListEqual(self.target.messages, ["message"])
+        handler.close()
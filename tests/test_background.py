@@ -0,0 +1,245 @@
+import contextlib
+import gc
+import io
+import logging
+import sys
+import unittest
+import weakref
+from styled_logging import (
+    BackgroundHandler,
+    MultiFormatter,
+    logging_context,
+    create_console_handler,
+    prettify,
+)
+from .helpers import ListHandler
+
+
+def make_record(msg: str):
+    return logging.LogRecord("test", logging.INFO, __file__, 0, msg, None, None)
+
+
+class TestBackgroundHandler(unittest.TestCase):
+    def test_flushes_on_close(self):
+        target = ListHandler()
+        handler = BackgroundHandler(target)
+
+        for i in range(100):
+            handler.handle(make_record(str(i)))
+
+        handler.close()
+
+        self.assertListEqual(target.messages, [str(i) for i in range(100)])
+
+    def test_flush_waits_for_writer(self):
+        target = ListHandler()
+        handler = BackgroundHandler(target)
+
+        handler.handle(make_record("message"))
+        handler.flush()
+
+        self.assertListEqual(target.messages, ["message"])
+        handler.close()
+
+    def stalled(self, overflow: str):
+        target = ListHandler()
+        target.gate.clear()
+        handler = BackgroundHandler(target, maxsize=2, overflow=overflow)
+
+        # wait until the writer has taken the first record and is stuck on it
+        handler.handle(make_record("first"))
+        while handler.queue_depth:
+            pass
+
+        for msg in ("a", "b", "c"):
+            handler.handle(make_record(msg))
+
+        target.gate.set()
+        handler.close()
+        return handler, target
+
+    def test_drop_newest(self):
+        handler, target = self.stalled("drop_newest")
+
+        self.assertListEqual(target.messages, ["first", "a", "b"])
+        self.assertEqual(handler.dropped, 1)
+
+    def test_drop_oldest(self):
+        handler, target = self.stalled("drop_oldest")
+
+        self.assertListEqual(target.messages, ["first", "b", "c"])
+        self.assertEqual(handler.dropped, 1)
+
+    def test_unknown_overflow(self):
+        with self.assertRaises(ValueError):
+            BackgroundHandler(ListHandler(), overflow="spill")
+
+    def test_logging_context(self):
+        with io.StringIO() as buf, contextlib.redirect_stderr(buf):
+            with logging_context(
+                handlers=[
+                    create_console_handler(
+                        level=logging.INFO,
+                        formatter=logging.Formatter("%(message)s"),
+                    )
+                ],
+                background=True,
+            ):
+                logging.info("message")
+
+            self.assertEqual(buf.getvalue().strip(), "message")
+
+
+class TestDeferredFormatting(unittest.TestCase):
+    def setUp(self) -> None:
+        self.target = ListHandler()
+        self.target.gate.clear()
+        self.handler = BackgroundHandler(self.target)
+
+    def tearDown(self) -> None:
+        self.target.gate.set()
+        self.handler.close()
+
+    def log(self, msg, args):
+        record = logging.LogRecord("test", logging.INFO, __file__, 0, msg, args, None)
+        self.handler.handle(record)
+        return record
+
+    def test_snapshots_mutable_args(self):
+        items = [1, 2]
+        self.log("items %s %s", (items, {"key": items}))
+        items.append(3)
+
+        self.target.gate.set()
+        self.handler.flush()
+
+        self.assertListEqual(self.target.messages, ["items [1, 2] {'key': [1, 2]}"])
+
+    def test_interpolates_other_args(self):
+        class Counter:
+            value = 0
+
+            def __str__(self):
+                return str(self.value)
+
+        counter = Counter()
+        record = self.log("count %s", (counter,))
+        counter.value = 1
+
+        self.target.gate.set()
+        self.handler.flush()
+
+        self.assertListEqual(self.target.messages, ["count 0"])
+        self.assertEqual(record.args, (counter,))
+
+    def test_interpolates_recursive_args(self):
+        items = [1]
+        items.append(items)
+        self.log("items %s", (items,))
+        items.append(2)
+
+        self.target.gate.set()
+        self.handler.flush()
+
+        self.assertListEqual(self.target.messages, ["items [1, [...]]"])
+
+    def test_interpolates_large_args(self):
+        items = list(range(10_000))
+        self.log("items %s", (items,))
+        items.clear()
+
+        self.target.gate.set()
+        self.handler.flush()
+
+        self.assertListEqual(self.target.messages, [f"items {list(range(10_000))}"])
+
+    def test_releases_frames(self):
+        class Big:
+            pass
+
+        refs = []
+
+        def fail():
+            big = Big()
+            refs.append(weakref.ref(big))
+            raise ValueError("error")
+
+        try:
+            fail()
+        except ValueError:
+            record = logging.LogRecord(
+                "test", logging.ERROR, __file__, 0, "failed", None, sys.exc_info()
+            )
+
+        self.handler.handle(record)
+        del record
+        gc.collect()
+
+        self.assertIsNone(refs[0]())
+
+        self.target.gate.set()
+        self.handler.flush()
+        self.assertListEqual(self.target.messages, ["failed"])
+
+    def test_renders_captured_traceback(self):
+        target = logging.StreamHandler(io.StringIO())
+        target.setFormatter(prettify(logging.Formatter, color=False, indent=0)())
+        handler = BackgroundHandler(target)
+
+        try:
+            raise ValueError("error")
+        except ValueError:
+            record = logging.LogRecord(
+                "test", logging.ERROR, __file__, 0, "failed", None, sys.exc_info()
+            )
+
+        handler.handle(record)
+        handler.close()
+
+        output = target.stream.getvalue()
+        self.assertIn('raise ValueError("error")', output)
+        self.assertIn("ValueError: error", output)
+
+    def test_stock_formatter_keeps_traceback(self):
+        target = logging.StreamHandler(io.StringIO())
+        target.setFormatter(logging.Formatter("%(message)s"))
+        handler = BackgroundHandler(target)
+
+        try:
+            raise ValueError("error")
+        except ValueError:
+            record = logging.LogRecord(
+                "test", logging.ERROR, __file__, 0, "failed", None, sys.exc_info()
+            )
+
+        handler.handle(record)
+        handler.close()
+
+        output = target.stream.getvalue()
+        self.assertIn("Traceback (most recent call last):", output)
+        self.assertIn('raise ValueError("error")', output)
+        self.assertIn("ValueError: error", output)
+
+    def test_stock_level_formatter_keeps_traceback(self):
+        target = logging.StreamHandler(io.StringIO())
+        target.setFormatter(
+            prettify(MultiFormatter)(
+                formatters={logging.ERROR: logging.Formatter("%(message)s")}
+            )
+        )
+        handler = BackgroundHandler(target)
+
+        try:
+            raise ValueError("error")
+        except ValueError:
+            record = logging.LogRecord(
+                "test", logging.ERROR, __file__, 0, "failed", None, sys.exc_info()
+            )
+
+        handler.handle(record)
+        handler.close()
+
+        output = target.stream.getvalue()
+        self.assertIn("Traceback (most recent call last):", output)
+        self.assertIn('raise ValueError("error")', output)
+        self.assertNotIn("CapturedException", output)
@@ -0,0 +1,174 @@
+import contextlib
+import io
+import json
+import logging
+import os
+import tempfile
+import unittest
+from styled_logging import (
+    BinaryFileHandler,
+    create_file_handler,
+    logging_context,
+    prettify,
+    read_binary_log,
+)
+from styled_logging.__main__ import main
+
+
+class TestBinaryFileHandler(unittest.TestCase):
+    def setUp(self) -> None:
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        self.path = os.path.join(tmpdir.name, "test.slog")
+
+        self.logger = logging.getLogger(f"{__name__}.{self.id()}")
+        self.logger.propagate = False
+
+    def write(self, *messages, segment_size=1 << 20):
+        handler = BinaryFileHandler(self.path, segment_size=segment_size)
+        handler.setLevel(logging.DEBUG)
+        with logging_context(self.logger, handlers=[handler]):
+            for level, msg, *args in messages:
+                self.logger.log(level, msg, *args)
+
+    def messages(self, **filters):
+        return [r.getMessage() for r in read_binary_log(self.path, **filters)]
+
+    def test_round_trip(self):
+        self.write(
+            (logging.INFO, "plain"),
+            (logging.INFO, "%d %s %r %s %s", 2**70, "text", 1.5, None, b"raw"),
+            (logging.WARNING, "%(key)s", {"key": "mapping"}),
+            (logging.ERROR, "%s", object.__new__(type("Custom", (), {}))),
+        )
+
+        messages = self.messages()
+
+        self.assertEqual(
+            messages[:3],
+            [
+                "plain",
+                f"{2**70} text 1.5 None b'raw'",
+                "mapping",
+            ],
+        )
+        self.assertIn("Custom object", messages[3])
+
+        record = next(read_binary_log(self.path))
+        self.assertEqual(record.name, self.logger.name)
+        self.assertEqual(record.levelname, "INFO")
+
+    def test_interns_templates(self):
+        self.write(*[(logging.INFO, "item %d", i) for i in range(100)])
+
+        with open(self.path, "rb") as f:
+            data = f.read()
+
+        self.assertEqual(data.count(b"item %d"), 1)
+        self.assertEqual(self.messages()[-1], "item 99")
+
+    def test_grows_and_appends(self):
+        self.write(*[(logging.INFO, "x" * 100 + "%d", i) for i in range(100)])
+        self.write((logging.INFO, "appended"), segment_size=4096)
+
+        messages = self.messages()
+
+        self.assertEqual(len(messages), 101)
+        self.assertEqual(messages[-1], "appended")
+
+    def test_filters(self):
+        self.write((logging.DEBUG, "debug"), (logging.ERROR, "error"))
+
+        self.assertEqual(self.messages(level=logging.WARNING), ["error"])
+        self.assertEqual(self.messages(since="2999-01-01T00:00"), [])
+        self.assertEqual(self.messages(until=0), [])
+
+    def test_exception(self):
+        handler = BinaryFileHandler(self.path)
+        with logging_context(self.logger, handlers=[handler]):
+            try:
+                raise ValueError("bad")
+            except ValueError:
+                self.logger.exception("failed")
+
+        record = next(read_binary_log(self.path))
+        text = prettify(logging.Formatter, color=False)().format(record)
+
+        self.assertIn('raise ValueError("bad")', text)
+        self.assertIn("ValueError: bad", text)
+
+    def test_ignores_unfinished_frames(self):
+        self.write((logging.INFO, "first"), (logging.INFO, "second"))
+
+        with open(self.path, "r+b") as f:
+            f.truncate(os.path.getsize(self.path) - 3)
+
+        self.assertEqual(self.messages(), ["first"])
+
+    def test_failed_record_leaves_no_ids(self):
+        handler = BinaryFileHandler(self.path)
+        with contextlib.redirect_stderr(io.StringIO()):
+            with logging_context(self.logger, handlers=[handler]):
+                self.logger.log(70000, "too high")
+                self.logger.warning("\ud800 %s", "lone surrogate")
+                self.logger.warning("too high")
+                self.logger.warning("after")
+
+        self.assertEqual(self.messages(), ["too high", "after"])
+
+    def test_factory(self):
+        handler = create_file_handler(self.path, binary=True)
+
+        self.assertIsInstance(handler, BinaryFileHandler)
+        handler.close()
+
+        with self.assertRaises(ValueError):
+            create_file_handler(self.path, binary=True, json=True)
+
+
+class TestReaderCli(unittest.TestCase):
+    def setUp(self) -> None:
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        self.path = os.path.join(tmpdir.name, "test.slog")
+
+        logger = logging.getLogger(f"{__name__}.{self.id()}")
+        logger.propagate = False
+        with logging_context(logger, handlers=[BinaryFileHandler(self.path)]):
+            logger.warning("careful %s", "now")
+            logger.error("failed")
+
+    def run_cli(self, *args):
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out):
+            main([self.path, *args])
+        return out.getvalue()
+
+    def test_plain(self):
+        self.assertEqual(
+            self.run_cli("-o", "plain"), "WARN  | careful now\nERROR | failed\n"
+        )
+
+    def test_color(self):
+        self.assertIn("\x1b[", self.run_cli("-o", "color"))
+
+    def test_unformattable_record(self):
+        logger = logging.getLogger(f"{__name__}.{self.id()}")
+        logger.propagate = False
+        with contextlib.redirect_stderr(io.StringIO()):
+            with logging_context(logger, handlers=[BinaryFileHandler(self.path)]):
+                logger.warning("%d items", "many")
+
+        self.assertEqual(
+            self.run_cli("-o", "plain").splitlines()[2:],
+            [
+                "WARNING | <unformattable record '%d items' with ('many',): "
+                "TypeError: %d format: a real number is required, not str>"
+            ],
+        )
+
+    def test_json_with_level(self):
+        lines = self.run_cli("-o", "json", "--level", "error").splitlines()
+
+        self.assertEqual(len(lines), 1)
+        self.assertEqual(json.loads(lines[0])["message"], "failed")
@@ -0,0 +1,102 @@
+import logging
+import time
+import unittest
+from click.testing import CliRunner
+from styled_logging import BufferedFileHandler, create_file_handler
+
+
+def make_record(msg: str, level: int = logging.INFO):
+    return logging.LogRecord("test", level, __file__, 0, msg, None, None)
+
+
+def read(filename: str):
+    with open(filename, "r") as f:
+        return f.read()
+
+
+class TestBufferedFileHandler(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.runner = CliRunner()
+
+    def make_handler(self, filename: str, **kwargs):
+        handler = BufferedFileHandler(filename, **kwargs)
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        return handler
+
+    def test_buffers_until_flush(self):
+        filename = "log.log"
+        with self.runner.isolated_filesystem():
+            handler = self.make_handler(filename, flush_interval=None)
+            handler.handle(make_record("a"))
+            handler.handle(make_record("b"))
+
+            self.assertEqual(read(filename), "")
+
+            handler.flush()
+            self.assertEqual(read(filename), "a\nb\n")
+            handler.close()
+
+    def test_writes_on_capacity(self):
+        filename = "log.log"
+        with self.runner.isolated_filesystem():
+            handler = self.make_handler(filename, capacity=4, flush_interval=None)
+            handler.handle(make_record("a"))
+            handler.handle(make_record("b"))
+
+            self.assertEqual(read(filename), "a\nb\n")
+            handler.close()
+
+    def test_writes_errors_immediately(self):
+        filename = "log.log"
+        with self.runner.isolated_filesystem():
+            handler = self.make_handler(filename, flush_interval=None)
+            handler.handle(make_record("a"))
+            handler.handle(make_record("b", logging.ERROR))
+
+            self.assertEqual(read(filename), "a\nb\n")
+            handler.close()
+
+    def test_writes_on_interval(self):
+        filename = "log.log"
+        with self.runner.isolated_filesystem():
+            handler = self.make_handler(filename, flush_interval=0.01)
+            handler.handle(make_record("a"))
+
+            deadline = time.monotonic() + 5
+            while not read(filename) and time.monotonic() < deadline:
+                time.sleep(0.01)
+
+            self.assertEqual(read(filename), "a\n")
+            handler.close()
+
+    def test_writes_on_close(self):
+        filename = "log.log"
+        with self.runner.isolated_filesystem():
+            handler = self.make_handler(filename)
+            handler.handle(make_record("a"))
+            handler.close()
+
+            self.assertEqual(read(filename), "a\n")
+
+    def test_reopens_after_close(self):
+        filename = "log.log"
+        with self.runner.isolated_filesystem():
+            handler = self.make_handler(filename, flush_interval=0.01)
+            handler.handle(make_record("a"))
+            handler.close()
+            handler.handle(make_record("b"))
+
+            deadline = time.monotonic() + 5
+            while read(filename) != "a\nb\n" and time.monotonic() < deadline:
+                time.sleep(0.01)
+
+            self.assertEqual(read(filename), "a\nb\n")
+            handler.close()
+
+    def test_factory(self):
+        filename = "log.log"
+        with self.runner.isolated_filesystem():
+            handler = create_file_handler(filename, buffered=True)
+            self.assertIsInstance(handler, BufferedFileHandler)
+            handler.close()
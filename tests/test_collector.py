@@ -0,0 +1,78 @@
+import logging
+import multiprocessing
+import os
+import unittest
+from click.testing import CliRunner
+from styled_logging import Collector, CollectorHandler, logging_context, setup
+from styled_logging.collector import _decode, _encode
+
+
+def work(address: str, name: str):
+    setup(collector=address, filename="ignored.log")
+    logging.info("skipped")
+    for i in range(10):
+        logging.warning("%s %d", name, i)
+
+    try:
+        raise ValueError(f"error in {name}")
+    except ValueError:
+        logging.exception("failed")
+
+
+class TestEncoding(unittest.TestCase):
+    def test_round_trip(self):
+        try:
+            raise ValueError("error")
+        except ValueError as e:
+            record = logging.makeLogRecord(
+                {"msg": "a %s", "args": ("b",), "exc_info": (ValueError, e, None)}
+            )
+        record.user = "me"
+
+        decoded = _decode(_encode(record))
+
+        self.assertEqual(decoded.getMessage(), "a b")
+        self.assertEqual(decoded.user, "me")
+        self.assertEqual(str(decoded.exc_info[1]), "ValueError: error")
+
+
+class TestCollector(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.runner = CliRunner()
+
+    def test_collects_from_processes(self):
+        with self.runner.isolated_filesystem():
+            with Collector(filename="log.log", console_level=logging.CRITICAL) as c:
+                workers = [
+                    multiprocessing.Process(target=work, args=(c.address, name))
+                    for name in "ab"
+                ]
+                for worker in workers:
+                    worker.start()
+                for worker in workers:
+                    worker.join()
+
+            with open("log.log", "r") as f:
+                lines = f.read().splitlines()
+
+            self.assertFalse(os.path.exists("ignored.log"))
+            for name in "ab":
+                messages = [line for line in lines if line.endswith(f"root:{name} 0")]
+                self.assertEqual(len(messages), 1)
+            self.assertFalse(any("skipped" in line for line in lines))
+            self.assertEqual(sum("ValueError: error in" in line for line in lines), 2)
+
+    def test_logging_context(self):
+        with self.runner.isolated_filesystem():
+            with Collector(filename="log.log", console_level=logging.CRITICAL) as c:
+                with logging_context(collector=c.address):
+                    logging.warning("message")
+
+            with open("log.log", "r") as f:
+                self.assertIn("message", f.read())
+
+    def test_handler_level(self):
+        collector = Collector(console_level=logging.DEBUG)
+        self.assertEqual(collector.handler().level, logging.DEBUG)
+        self.assertIsInstance(collector.handler(), CollectorHandler)
@@ -0,0 +1,86 @@
+import io
+import os
+import unittest
+from unittest import mock
+from styled_logging import style
+from styled_logging.color import (
+    COLORS_16,
+    COLORS_256,
+    NO_COLOR,
+    TRUECOLOR,
+    detect_color_depth,
+    set_color_depth,
+)
+
+
+class TestStyle(unittest.TestCase):
+    def setUp(self) -> None:
+        set_color_depth(TRUECOLOR)
+
+    def test_styles(self):
+        self.assertEqual(
+            style("text", fg="white", bg="red", bold=True),
+            "\033[37m\033[41m\033[1mtext\033[0m",
+        )
+
+    def test_no_reset(self):
+        self.assertEqual(style("text", fg=200, reset=False), "\033[38;5;200mtext")
+
+    def test_rgb_list(self):
+        self.assertEqual(style("text", fg=[1, 2, 3]), style("text", fg=(1, 2, 3)))
+
+    def test_repeated_calls(self):
+        first = style(1, fg="cyan", underline=True)
+        second = style(2, fg="cyan", underline=True)
+
+        self.assertEqual(first.replace("1", "2"), second)
+
+    def test_unknown_color(self):
+        for _ in range(2):
+            with self.subTest(), self.assertRaises(TypeError):
+                style("text", fg="mauve")
+
+
+class TestColorDepth(unittest.TestCase):
+    def tearDown(self) -> None:
+        set_color_depth(TRUECOLOR)
+
+    def test_downgrades_to_256(self):
+        set_color_depth(COLORS_256)
+        self.assertEqual(style("text", fg=(255, 0, 0)), "\033[38;5;196mtext\033[0m")
+        self.assertEqual(style("text", fg=(128, 128, 128)), "\033[38;5;244mtext\033[0m")
+
+    def test_downgrades_to_16(self):
+        set_color_depth(COLORS_16)
+        self.assertEqual(style("text", fg=(250, 10, 10)), "\033[91mtext\033[0m")
+        self.assertEqual(style("text", bg=196), "\033[101mtext\033[0m")
+        self.assertEqual(style("text", fg="cyan"), "\033[36mtext\033[0m")
+
+    def test_no_color(self):
+        set_color_depth(NO_COLOR)
+        self.assertEqual(style("text", fg="red", bold=True), "text")
+
+
+class FakeTerminal(io.StringIO):
+    def isatty(self):
+        return True
+
+
+class TestDetectColorDepth(unittest.TestCase):
+    def detect(self, stream=None, **env):
+        with mock.patch.dict(os.environ, env, clear=True):
+            return detect_color_depth(stream or FakeTerminal())
+
+    def test_not_a_terminal(self):
+        self.assertEqual(self.detect(io.StringIO(), TERM="xterm"), NO_COLOR)
+
+    def test_no_color(self):
+        self.assertEqual(self.detect(TERM="xterm", NO_COLOR="1"), NO_COLOR)
+
+    def test_dumb(self):
+        self.assertEqual(self.detect(TERM="dumb"), NO_COLOR)
+
+    def test_depths(self):
+        self.assertEqual(self.detect(TERM="xterm"), COLORS_16)
+        self.assertEqual(self.detect(TERM="xterm-256color"), COLORS_256)
+        self.assertEqual(self.detect(TERM="xterm", COLORTERM="truecolor"), TRUECOLOR)
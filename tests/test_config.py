@@ -0,0 +1,369 @@
+import io
+import logging
+import os
+import tempfile
+import threading
+import time
+import unittest
+from styled_logging import (
+    BackgroundHandler,
+    ConfigError,
+    LevelDispatcher,
+    RingBufferHandler,
+    SamplingFilter,
+    from_config,
+    prettify,
+    set_time_format,
+)
+from styled_logging.config import SwapHandler, build_config, validate_config
+
+
+class TestValidateConfig(unittest.TestCase):
+    def assertInvalid(self, config, message: str):
+        with self.assertRaises(ConfigError) as ctx:
+            validate_config(config)
+        self.assertEqual(str(ctx.exception), message)
+
+    def test_defaults(self):
+        self.assertDictEqual(validate_config({}), {"handlers": [{"type": "console"}]})
+
+    def test_levels(self):
+        config = validate_config(
+            {
+                "handlers": [
+                    {"level": "debug"},
+                    {"type": "file", "path": "a", "level": 25},
+                ],
+                "sampling": {"levels": {"INFO": 0.5}},
+            }
+        )
+
+        self.assertEqual(config["handlers"][0]["level"], logging.DEBUG)
+        self.assertEqual(config["handlers"][1]["level"], 25)
+        self.assertDictEqual(config["sampling"]["levels"], {logging.INFO: 0.5})
+
+    def test_errors(self):
+        self.assertInvalid([], "config: expected a table, got list")
+        self.assertInvalid(
+            {"handler": []},
+            "config: unknown option 'handler', expected one of "
+            "['asynchronous', 'background', 'handlers', 'rate_limit', 'sampling', "
+            "'time_format']",
+        )
+        self.assertInvalid(
+            {"handlers": []}, "config.handlers: expected at least one handler"
+        )
+        self.assertInvalid(
+            {"handlers": [{}, {"level": "VERBOSE"}]},
+            "config.handlers[1].level: unknown level 'VERBOSE'",
+        )
+        self.assertInvalid(
+            {"handlers": [{"type": "socket"}]},
+            "config.handlers[0]: unknown handler type 'socket', "
+            "expected one of ['console', 'file', 'ring']",
+        )
+        self.assertInvalid(
+            {"handlers": [{"type": "file"}]},
+            "config.handlers[0]: a file handler needs a path",
+        )
+        self.assertInvalid(
+            {"handlers": [{"type": "file", "path": "a", "format": "", "json": True}]},
+            "config.handlers[0]: a file handler can't use both format and json",
+        )
+        self.assertInvalid(
+            {"handlers": [{"type": "file", "path": "a", "max_bytes": True}]},
+            "config.handlers[0].max_bytes: expected int, got bool",
+        )
+        self.assertInvalid(
+            {"handlers": [{"type": "ring", "handler": {"color": "yes"}}]},
+            "config.handlers[0].handler.color: expected bool, got str",
+        )
+        self.assertInvalid(
+            {"sampling": {"loggers": {"x": {"INFO": "all"}}}},
+            "config.sampling.loggers.x.INFO: expected int or float, got str",
+        )
+
+
+class TestSwapHandler(unittest.TestCase):
+    def test_waits_for_records_in_flight(self):
+        entered, release = threading.Event(), threading.Event()
+        events = []
+
+        class Slow(logging.Handler):
+            def emit(self, record):
+                entered.set()
+                release.wait()
+                events.append(("old", record.getMessage()))
+
+            def close(self):
+                events.append(("closed", None))
+                super().close()
+
+        class New(logging.Handler):
+            def emit(self, record):
+                events.append(("new", record.getMessage()))
+
+        def make(msg):
+            return logging.makeLogRecord({"msg": msg})
+
+        handler = SwapHandler(Slow())
+        old = handler._current
+
+        logging_thread = threading.Thread(target=handler.handle, args=(make("a"),))
+        logging_thread.start()
+        entered.wait()
+
+        swap = threading.Thread(target=handler.swap, args=(New, New))
+        swap.start()
+        while handler._current is old:
+            time.sleep(0.001)
+
+        handler.handle(make("b"))
+        release.set()
+        swap.join()
+        logging_thread.join()
+        handler.handle(make("c"))
+
+        self.assertListEqual(
+            events, [("old", "a"), ("closed", None), ("new", "b"), ("new", "c")]
+        )
+
+
+class TestFromConfig(unittest.TestCase):
+    def setUp(self) -> None:
+        self.logger = logging.getLogger(f"{__name__}.{self.id()}")
+        self.logger.propagate = False
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+
+    def path(self, name: str) -> str:
+        return os.path.join(self.tmpdir.name, name)
+
+    def read(self, name: str) -> str:
+        with open(self.path(name)) as f:
+            return f.read()
+
+    def write_config(self, text: str) -> str:
+        # replaced at once, so the watcher never reads half a file
+        path, tmp = self.path("logging.toml"), self.path("logging.toml.tmp")
+        with open(tmp, "w") as f:
+            f.write(text)
+        os.utime(tmp, ns=(0, time.time_ns()))
+        os.replace(tmp, path)
+        return path
+
+    def test_builds_pipeline(self):
+        ctx = from_config(
+            {
+                "background": True,
+                "sampling": {"levels": {"DEBUG": 0}},
+                "handlers": [
+                    {"type": "console", "level": "DEBUG", "color": False},
+                    {
+                        "type": "file",
+                        "path": self.path("test.log"),
+                        "format": "%(message)s",
+                    },
+                    {"type": "ring", "capacity": 10},
+                ],
+            },
+            logger=self.logger,
+        )
+
+        console, file, ring = ctx.handlers
+        self.assertIsInstance(console, BackgroundHandler)
+        self.assertIsInstance(ring, BackgroundHandler)
+        self.assertIsInstance(ring.handler, RingBufferHandler)
+        self.assertIsInstance(ctx.handler.handler, LevelDispatcher)
+        self.assertIsInstance(ctx.handler.handler.filters[0], SamplingFilter)
+        console.handler.stream = io.StringIO()
+
+        with ctx:
+            self.assertEqual(self.logger.level, logging.DEBUG)
+            self.logger.debug("sampled out")
+            self.logger.info("info")
+            self.logger.warning("warning")
+
+        self.assertEqual(self.logger.level, logging.NOTSET)
+        self.assertEqual(console.handler.stream.getvalue(), "info\nWARN  | warning\n")
+        self.assertEqual(self.read("test.log"), "warning\n")
+
+    def test_console_formats(self):
+        ctx = from_config(
+            {"handlers": [{"color": False, "formats": {"INFO": "> %(message)s"}}]},
+            logger=self.logger,
+        )
+        (console,) = ctx.handlers
+        console.stream = io.StringIO()
+
+        with ctx:
+            self.logger.info("info")
+            self.logger.warning("warning")
+
+        self.assertEqual(console.stream.getvalue(), "> info\nWARN  | warning\n")
+
+    def test_resets_time_format(self):
+        self.addCleanup(set_time_format)
+        formatter = prettify(logging.Formatter)("%(asctime)s")
+        record = logging.makeLogRecord({"created": 0.0, "msecs": 0.0})
+
+        build_config(validate_config({"time_format": {"iso": True, "utc": True}}))
+        self.assertEqual(formatter.format(record), "1970-01-01T00:00:00.000Z")
+
+        build_config(validate_config({}))
+        self.assertNotIn("T", formatter.format(record))
+
+    def test_toml_file(self):
+        path = self.write_config(f"""
+            [[handlers]]
+            type = "file"
+            path = {self.path("test.log")!r}
+            level = "INFO"
+            json = true
+            """)
+
+        with from_config(path, logger=self.logger):
+            self.logger.info("info")
+
+        self.assertIn('"message":"info"', self.read("test.log"))
+
+    def test_invalid_toml(self):
+        path = self.write_config("handlers = [")
+
+        with self.assertRaises(ConfigError):
+            from_config(path)
+
+    def test_factory_errors(self):
+        with self.assertRaisesRegex(ConfigError, r"config\.handlers\[0\]: .*buffered"):
+            from_config(
+                {
+                    "handlers": [
+                        {"type": "file", "path": "a", "buffered": True, "max_bytes": 1}
+                    ]
+                }
+            )
+
+        with self.assertRaisesRegex(ConfigError, "config.sampling: .*between 0 and 1"):
+            from_config({"sampling": {"levels": {"INFO": 2}}})
+
+    def test_reload_requires_file(self):
+        with self.assertRaises(ValueError):
+            from_config({}, reload=True)
+
+    def test_apply_keeps_queued_records(self):
+        ctx = from_config(
+            {
+                "background": True,
+                "handlers": [
+                    {
+                        "type": "file",
+                        "path": self.path("a.log"),
+                        "format": "%(message)s",
+                    }
+                ],
+            },
+            logger=self.logger,
+        )
+        stop = threading.Event()
+        logged = []
+
+        def work():
+            i = 0
+            while not stop.is_set() or i < 1000:
+                self.logger.warning("%d", i)
+                logged.append(i)
+                i += 1
+
+        with ctx:
+            thread = threading.Thread(target=work)
+            thread.start()
+            ctx.apply(
+                {
+                    "handlers": [
+                        {
+                            "type": "file",
+                            "path": self.path("b.log"),
+                            "format": "%(message)s",
+                        }
+                    ]
+                }
+            )
+            stop.set()
+            thread.join()
+
+        written = self.read("a.log").split() + self.read("b.log").split()
+        self.assertEqual(sorted(map(int, written)), logged)
+        self.assertTrue(self.read("b.log"))
+
+    def test_failed_apply(self):
+        ctx = from_config(
+            {
+                "handlers": [
+                    {"type": "file", "path": self.path("a.log"), "level": "INFO"}
+                ]
+            },
+            logger=self.logger,
+        )
+
+        with ctx:
+            with self.assertRaises(ConfigError):
+                ctx.apply({"handlers": [{"level": "VERBOSE"}]})
+
+            with self.assertRaises(FileNotFoundError):
+                ctx.apply(
+                    {"handlers": [{"type": "file", "path": self.path("missing/b.log")}]}
+                )
+
+            self.logger.info("still logged")
+
+        self.assertIn("still logged", self.read("a.log"))
+
+    def test_watch_file(self):
+        def config(name: str) -> str:
+            return f"""
+                [[handlers]]
+                type = "file"
+                path = {self.path(name)!r}
+                format = "%(message)s"
+                """
+
+        path = self.write_config(config("a.log"))
+
+        with from_config(path, logger=self.logger, reload=True, interval=0.01) as ctx:
+            self.logger.warning("first")
+
+            self.write_config(config("b.log"))
+
+            deadline = time.monotonic() + 5
+            while ctx.handlers[0].baseFilename != self.path("b.log"):
+                self.assertLess(time.monotonic(), deadline)
+                time.sleep(0.01)
+
+            self.logger.warning("second")
+
+        self.assertEqual(self.read("a.log"), "first\n")
+        self.assertEqual(self.read("b.log"), "second\n")
+
+    def test_async(self):
+        import asyncio
+
+        ctx = from_config(
+            {
+                "asynchronous": True,
+                "handlers": [
+                    {
+                        "type": "file",
+                        "path": self.path("a.log"),
+                        "format": "%(message)s",
+                    }
+                ],
+            },
+            logger=self.logger,
+        )
+
+        async def main():
+            async with ctx:
+                self.logger.warning("warning")
+
+        asyncio.run(main())
+        self.assertEqual(self.read("a.log"), "warning\n")
@@ -1,6 +1,6 @@
 import logging
 import unittest
-from styled_logging import logging_context, create_console_handler
+from styled_logging import logging_context, create_console_handler, LevelDispatcher
 
 
 class TestLogContext(unittest.TestCase):
@@ -37,3 +37,52 @@ class TestLogContext(unittest.TestCase):
             self.assertEqual(logging.root.level, logging.INFO)
 
         self.assertEqual(logging.root.level, logging.DEBUG)
+
+
+class RecordingHandler(logging.Handler):
+    def __init__(self, level):
+        super().__init__(level)
+        self.levels = []
+
+    def handle(self, record):
+        self.levels.append(record.levelno)
+        return super().handle(record)
+
+    def emit(self, record):
+        pass
+
+
+class TestLevelDispatcher(unittest.TestCase):
+    def setUp(self) -> None:
+        self.logger = logging.getLogger(__name__)
+        self.debug = RecordingHandler(logging.DEBUG)
+        self.warning = RecordingHandler(logging.WARNING)
+
+    def test_visits_accepting_handlers(self):
+        with logging_context(
+            self.logger, handlers=[self.debug, self.warning], dispatch=True
+        ):
+            self.assertEqual(len(self.logger.handlers), 1)
+            self.logger.debug("debug")
+            self.logger.warning("warning")
+            self.logger.log(70, "custom")
+
+        self.assertListEqual(self.debug.levels, [logging.DEBUG, logging.WARNING, 70])
+        self.assertListEqual(self.warning.levels, [logging.WARNING, 70])
+
+    def test_sets_to_lowest(self):
+        logging.root.setLevel(logging.WARNING)
+        with logging_context(handlers=[self.debug, self.warning], dispatch=True):
+            self.assertEqual(logging.root.level, logging.DEBUG)
+
+        self.assertEqual(logging.root.level, logging.WARNING)
+
+    def test_refresh(self):
+        dispatcher = LevelDispatcher([self.debug, self.warning])
+        self.debug.setLevel(logging.ERROR)
+        dispatcher.refresh()
+
+        dispatcher.handle(logging.makeLogRecord({"levelno": logging.WARNING}))
+
+        self.assertListEqual(self.debug.levels, [])
+        self.assertEqual(dispatcher.level, logging.WARNING)
@@ -1,7 +1,13 @@
+import gc
 import logging
+import sys
+import textwrap
 import unittest
+import weakref
 
-from styled_logging.decorator import prettify
+from pretty_traceback import formatting
+
+from styled_logging.decorator import prettify, TracebackCache
 
 
 class TestPrettifyDecorator(unittest.TestCase):
@@ -18,3 +24,163 @@ class TestPrettifyDecorator(unittest.TestCase):
             pass
 
         self.assertIsNot(MyFormatter.formatException, logging.Formatter.formatException)
+
+
+class TestTracebackCache(unittest.TestCase):
+    def setUp(self) -> None:
+        try:
+            raise ValueError("error")
+        except ValueError as e:
+            self.exc = e
+
+        self.calls = 0
+
+    def render(self):
+        self.calls += 1
+        return "traceback"
+
+    def test_renders_once(self):
+        cache = TracebackCache()
+        for _ in range(3):
+            text = cache.get(self.exc, self.exc.__traceback__, (True, 4), self.render)
+            self.assertEqual(text, "traceback")
+
+        self.assertEqual(self.calls, 1)
+
+    def test_settings_are_separate(self):
+        cache = TracebackCache()
+        cache.get(self.exc, self.exc.__traceback__, (True, 4), self.render)
+        cache.get(self.exc, self.exc.__traceback__, (False, 4), self.render)
+
+        self.assertEqual(self.calls, 2)
+
+    def test_evicts(self):
+        cache = TracebackCache(maxsize=1)
+        cache.get(self.exc, self.exc.__traceback__, (True, 4), self.render)
+        cache.get(self.exc, self.exc.__traceback__, (False, 4), self.render)
+        cache.get(self.exc, self.exc.__traceback__, (True, 4), self.render)
+
+        self.assertEqual(len(cache), 1)
+        self.assertEqual(self.calls, 3)
+
+    def test_formatters_share_cache(self):
+        cache = TracebackCache()
+        formatters = [prettify(logging.Formatter, cache=cache)() for _ in range(2)]
+        ei = (type(self.exc), self.exc, self.exc.__traceback__)
+
+        first, second = (f.formatException(ei) for f in formatters)
+
+        self.assertEqual(first, second)
+        self.assertEqual(len(cache), 1)
+
+    def test_frames_are_released(self):
+        class Local:
+            pass
+
+        def fail():
+            local = Local()  # noqa: F841
+            raise ValueError("error")
+
+        cache = TracebackCache()
+        formatter = prettify(logging.Formatter, cache=cache)()
+
+        try:
+            fail()
+        except ValueError:
+            ei = sys.exc_info()
+
+        first = formatter.formatException(ei)
+        self.assertEqual(formatter.formatException(ei), first)
+
+        local = weakref.ref(ei[2].tb_next.tb_frame.f_locals["local"])
+        del ei
+        gc.collect()
+
+        self.assertIsNone(local())
+        self.assertEqual(len(cache), 1)
+
+    def test_other_traceback_is_not_cached(self):
+        cache = TracebackCache()
+        cache.get(self.exc, None, (True, 4), self.render)
+        cache.get(self.exc, None, (True, 4), self.render)
+
+        self.assertEqual(len(cache), 0)
+        self.assertEqual(self.calls, 2)
+
+    def test_reraised_is_rendered_again(self):
+        def fail():
+            raise ValueError("error")
+
+        def log_and_reraise():
+            try:
+                fail()
+            except ValueError:
+                first.append(formatter.formatException(sys.exc_info()))
+                raise
+
+        formatter = prettify(logging.Formatter, color=False, cache=TracebackCache())()
+        first = []
+
+        try:
+            log_and_reraise()
+        except ValueError:
+            second = formatter.formatException(sys.exc_info())
+
+        self.assertNotIn("test_reraised_is_rendered_again", first[0])
+        self.assertIn("test_reraised_is_rendered_again", second)
+
+
+def recurse(n):
+    recurse(n + 1)
+
+
+def chained(depth):
+    try:
+        if depth:
+            chained(depth - 1)
+        else:
+            raise KeyError("first")
+    except Exception as e:
+        raise ValueError(f"depth {depth}") from e
+
+
+class TestTracebackLimits(unittest.TestCase):
+    def format(self, func, **limits):
+        formatter = prettify(logging.Formatter, color=False, cache=None, **limits)()
+        try:
+            func()
+        except Exception:
+            return formatter.formatException(sys.exc_info())
+
+    def test_unlimited_matches_pretty_traceback(self):
+        try:
+            chained(2)
+        except Exception as e:
+            expected = textwrap.indent(
+                formatting.exc_to_traceback_str(e, e.__traceback__), "    "
+            )
+            ei = sys.exc_info()
+
+        formatter = prettify(logging.Formatter, color=False, cache=None)()
+        self.assertEqual(formatter.formatException(ei), expected)
+
+    def test_collapses_repeats(self):
+        text = self.format(lambda: recurse(0), max_repeats=3)
+
+        self.assertEqual(text.count("recurse(n + 1)"), 3)
+        self.assertRegex(text, r"repeated \d+ more times")
+        self.assertIn("RecursionError", text)
+
+    def test_caps_frames(self):
+        text = self.format(lambda: recurse(0), max_frames=10)
+
+        self.assertRegex(text, r"\d+ frames omitted")
+        self.assertLess(len(text.splitlines()), 20)
+
+    def test_limits_chain(self):
+        text = self.format(lambda: chained(5), max_chain=2)
+
+        self.assertIn("5 earlier exceptions omitted", text)
+        self.assertIn("ValueError: depth 5", text)
+        self.assertIn("ValueError: depth 4", text)
+        self.assertNotIn("depth 3", text)
@@ -1,4 +1,5 @@
 import logging
+import sys
 from textwrap import dedent
 from typing import Callable
 import unittest
@@ -9,6 +10,7 @@ from styled_logging import (
     DEFAULT_FORMATTERS,
     make_formatters,
     DEFAULT_FORMATS,
+    ERROR_FMT,
     prettify,
 )
 
@@ -180,3 +182,113 @@ class TestMakeFormatter(unittest.TestCase):
         for cls in formatters.values():
             with self.subTest():
                 self.assertIsInstance(cls, MyFormatter)
+
+
+class TestCompiledFormats(unittest.TestCase):
+    formats = [
+        "%(message)s",
+        "%(levelname)s:%(asctime)s:%(name)s:%(message)s",
+        "%(levelname)-8s | %(lineno)04d | 100%% %(message)s",
+        "%(name)s %(name)s %%",
+        *DEFAULT_FORMATS.values(),
+    ]
+
+    def make_record(self, level: int, exc_info=None):
+        return logging.LogRecord(
+            __name__, level, __file__, 12, "message %s", ("arg",), exc_info
+        )
+
+    def test_matches_formatter(self):
+        for fmt in self.formats:
+            with self.subTest(fmt=fmt):
+                plain = prettify(logging.Formatter)(fmt)
+                formatter = MultiFormatter({logging.INFO: plain, 1000: plain})
+                for level in (logging.INFO, 1000):
+                    record = self.make_record(level)
+                    self.assertEqual(formatter.format(record), plain.format(record))
+
+    def test_matches_formatter_with_exception(self):
+        plain = prettify(logging.Formatter)(ERROR_FMT)
+        formatter = MultiFormatter({logging.ERROR: plain})
+        try:
+            raise ValueError("error")
+        except ValueError:
+            record = self.make_record(logging.ERROR, sys.exc_info())
+
+        self.assertEqual(formatter.format(record), plain.format(record))
+
+    def test_missing_field(self):
+        formatter = MultiFormatter({logging.INFO: logging.Formatter("%(missing)s")})
+
+        with self.assertRaises(ValueError):
+            formatter.format(self.make_record(logging.INFO))
+
+    def test_custom_format_method(self):
+        class Upper(logging.Formatter):
+            def format(self, record):
+                return super().format(record).upper()
+
+        formatter = MultiFormatter({logging.INFO: prettify(Upper)("%(message)s")})
+
+        self.assertEqual(
+            formatter.format(self.make_record(logging.INFO)), "MESSAGE ARG"
+        )
+
+
+class TestSplicedTemplates(unittest.TestCase):
+    messages = [
+        ("plain", None),
+        ("100% done", None),
+        ("%d items, %5.2f%% done by %r", (3, 42.5, "worker")),
+        ("%-6s|%+04d|%x|%c", ("a", 7, 255, "z")),
+        ("%(key)s", ({"key": "mapping"},)),
+        ("%s", (["list"],)),
+        (42, None),
+    ]
+
+    def make_record(self, msg, args):
+        return logging.LogRecord(
+            __name__, logging.WARNING, __file__, 1, msg, args, None
+        )
+
+    def test_matches_formatter(self):
+        for fmt in ("%(message)s", "100%% [%(message)s]", DEFAULT_FORMATS[30]):
+            plain = prettify(logging.Formatter)(fmt)
+            formatter = MultiFormatter({logging.WARNING: plain})
+            for msg, args in self.messages:
+                with self.subTest(fmt=fmt, msg=msg):
+                    record = self.make_record(msg, args)
+                    expected = plain.format(record)
+                    message = record.message
+                    del record.message
+
+                    self.assertEqual(formatter.format(record), expected)
+                    self.assertEqual(record.message, message)
+
+    def test_argument_mismatch(self):
+        formatter = MultiFormatter({logging.WARNING: logging.Formatter("%(message)s")})
+
+        for msg, args in (("%s %s", ("one",)), ("%s", ("one", "two")), ("50%", (1,))):
+            with self.subTest(msg=msg):
+                with self.assertRaises((TypeError, ValueError)):
+                    formatter.format(self.make_record(msg, args))
+
+    def test_cache_info(self):
+        formatter = MultiFormatter({logging.WARNING: logging.Formatter("%(message)s")})
+
+        for i in range(10):
+            formatter.format(self.make_record("item %d", (i,)))
+
+        info = formatter.template_cache_info()
+        self.assertEqual((info.hits, info.misses, info.currsize), (9, 1, 1))
+        self.assertAlmostEqual(info.hit_rate, 0.9)
+
+    def test_cache_is_bounded(self):
+        formatter = MultiFormatter(
+            {logging.WARNING: logging.Formatter("%(message)s")}, template_cache_size=2
+        )
+
+        for i in range(10):
+            formatter.format(self.make_record(f"item {i} %d", (i,)))
+
+        self.assertEqual(formatter.template_cache_info().currsize, 2)
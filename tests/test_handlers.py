@@ -3,7 +3,13 @@ import io
 import logging
 import unittest
 from click.testing import CliRunner
-from styled_logging import logging_context, create_console_handler, create_file_handler
+from styled_logging import (
+    logging_context,
+    create_console_handler,
+    create_file_handler,
+    style,
+)
+from styled_logging.color import TRUECOLOR, set_color_depth
 
 
 class TestConsoleHandler(unittest.TestCase):
@@ -22,6 +28,33 @@ class TestConsoleHandler(unittest.TestCase):
                 self.assertEqual(buf.getvalue().strip(), "message")
 
 
+class TestConsoleColor(unittest.TestCase):
+    def format_warning(self, handler: logging.Handler):
+        record = logging.makeLogRecord({"msg": "message", "levelno": logging.WARNING})
+        return handler.format(record)
+
+    def test_plain_when_redirected(self):
+        with io.StringIO() as buf, contextlib.redirect_stderr(buf):
+            handler = create_console_handler()
+
+        self.assertEqual(self.format_warning(handler), "WARN  | message")
+        self.assertIn("\033[", style("message", fg="red"))
+
+    def test_match_style(self):
+        self.addCleanup(set_color_depth, TRUECOLOR)
+
+        with io.StringIO() as buf, contextlib.redirect_stderr(buf):
+            create_console_handler(color=True, match_style=True)
+
+        self.assertEqual(style("message", fg="red"), "message")
+
+    def test_forced_color(self):
+        with io.StringIO() as buf, contextlib.redirect_stderr(buf):
+            handler = create_console_handler(color=True)
+
+        self.assertIn("\033[", self.format_warning(handler))
+
+
 class TestFileHandler(unittest.TestCase):
     @classmethod
     def setUpClass(cls) -> None:
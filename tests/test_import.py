@@ -0,0 +1,93 @@
+import subprocess
+import sys
+import unittest
+
+# the modules styled_logging may load on top of what logging loads
+IMPORT_BUDGET = {
+    "typing",
+    "_typing",
+    "copy",
+    # copy looks for Jython on some versions
+    "org",
+    "org.python",
+    "org.python.core",
+    "contextvars",
+    "_contextvars",
+}
+
+LAZY_SUBMODULES = {
+    "binary",
+    "collector",
+    "config",
+    "ratelimit",
+    "rotating",
+    "structured",
+}
+
+
+def import_package(code: str = "", package: str = "styled_logging"):
+    """Import a package in a fresh interpreter, returning the -X importtime report"""
+    return subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {package}\n{code}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+
+def imported_modules(report: str):
+    return {
+        line.rsplit("|", 1)[-1].strip()
+        for line in report.splitlines()
+        if line.startswith("import time:")
+    }
+
+
+class TestImportTime(unittest.TestCase):
+    def test_traceback_library_is_lazy(self):
+        modules = imported_modules(import_package().stderr)
+
+        self.assertIn("styled_logging", modules)
+        self.assertFalse(any(m.startswith("pretty_traceback") for m in modules))
+
+    def test_asyncio_is_lazy(self):
+        modules = imported_modules(import_package().stderr)
+
+        self.assertNotIn("asyncio", modules)
+
+    def test_multiprocessing_is_lazy(self):
+        modules = imported_modules(import_package().stderr)
+
+        self.assertNotIn("multiprocessing", modules)
+
+    def test_import_budget(self):
+        modules = imported_modules(import_package().stderr)
+        stdlib = imported_modules(import_package(package="logging").stderr)
+
+        extra = {m for m in modules - stdlib if not m.startswith("styled_logging")}
+        self.assertLessEqual(extra, IMPORT_BUDGET)
+
+        loaded = {
+            m.rpartition(".")[2] for m in modules if m.startswith("styled_logging.")
+        }
+        self.assertFalse(loaded & LAZY_SUBMODULES)
+
+    def test_lazy_exports(self):
+        result = import_package(
+            "import sys\n"
+            "print(styled_logging.JsonFormatter.__module__)\n"
+            "print('styled_logging.binary' in sys.modules)"
+        )
+
+        self.assertListEqual(
+            result.stdout.split(), ["styled_logging.structured", "False"]
+        )
+
+    def test_default_formatters_are_lazy(self):
+        result = import_package(
+            "import styled_logging.formatters as f\n"
+            "print('DEFAULT_FORMATTERS' in vars(f))\n"
+            "print(styled_logging.DEFAULT_FORMATTERS is f.DEFAULT_FORMATTERS)"
+        )
+
+        self.assertListEqual(result.stdout.split(), ["False", "True"])
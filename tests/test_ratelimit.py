@@ -0,0 +1,127 @@
+import logging
+import time
+import unittest
+from unittest import mock
+from styled_logging import RateLimitFilter, logging_context
+from .helpers import ListHandler
+
+
+class TestRateLimitFilter(unittest.TestCase):
+    def setUp(self) -> None:
+        self.logger = logging.getLogger(f"{__name__}.{self.id()}")
+        self.logger.propagate = False
+        self.handler = ListHandler(logging.DEBUG)
+        self.now = 0.0
+        patcher = mock.patch("time.monotonic", lambda: self.now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def context(self, limiter: RateLimitFilter):
+        return logging_context(self.logger, handlers=[self.handler], filters=[limiter])
+
+    def test_suppresses_after_burst(self):
+        limiter = RateLimitFilter(rate=1, burst=3)
+        with self.context(limiter):
+            for i in range(10):
+                self.logger.error("failed %d", i)
+
+            self.now = 1.0
+            self.logger.error("failed %d", 10)
+
+        self.assertListEqual(
+            self.handler.messages,
+            [
+                "failed 0",
+                "failed 1",
+                "failed 2",
+                "failed 10",
+                "Suppressed 7 similar messages: failed %d",
+            ],
+        )
+        self.assertEqual(limiter.suppressed, 7)
+
+    def test_groups_are_separate(self):
+        with self.context(RateLimitFilter(rate=0, burst=1)):
+            self.logger.error("a")
+            self.logger.error("a")
+            self.logger.warning("a")
+            self.logger.error("b")
+
+        self.assertListEqual(
+            self.handler.messages, ["a", "a", "b", "Suppressed 1 similar messages: a"]
+        )
+
+    def test_groups_by_exception_origin(self):
+        def fail(exc_type):
+            try:
+                raise exc_type("error")
+            except Exception:
+                self.logger.exception("failed")
+
+        with self.context(RateLimitFilter(rate=0, burst=1)):
+            fail(ValueError)
+            fail(ValueError)
+            fail(KeyError)
+
+        self.assertEqual(len(self.handler.messages), 3)
+        self.assertEqual(
+            self.handler.messages[-1], "Suppressed 1 similar messages: failed"
+        )
+
+    def test_summary(self):
+        with self.context(RateLimitFilter(rate=0, burst=1, summary_interval=10)):
+            for _ in range(5):
+                self.logger.error("failed")
+
+            self.now = 20.0
+            self.logger.info("later")
+
+        self.assertListEqual(
+            self.handler.messages,
+            ["failed", "Suppressed 4 similar messages: failed", "later"],
+        )
+
+    def test_bounded_keys(self):
+        limiter = RateLimitFilter(max_keys=2)
+        with self.context(limiter):
+            for i in range(5):
+                self.logger.info(str(i))
+
+        self.assertEqual(len(limiter._buckets), 2)
+
+    def test_evicted_summary(self):
+        with self.context(RateLimitFilter(rate=0, burst=1, max_keys=1)):
+            self.logger.error("a")
+            self.logger.error("a")
+            self.logger.error("b")
+
+        self.assertListEqual(
+            self.handler.messages, ["a", "Suppressed 1 similar messages: a", "b"]
+        )
+
+    def test_summary_without_later_records(self):
+        limiter = RateLimitFilter(rate=0, burst=1, summary_interval=0.05)
+        with self.context(limiter):
+            self.logger.error("failed")
+            self.logger.error("failed")
+            self.now = 1.0
+
+            deadline = time.perf_counter() + 5
+            while len(self.handler.messages) < 2:
+                self.assertLess(time.perf_counter(), deadline)
+                time.sleep(0.01)
+
+        self.assertListEqual(
+            self.handler.messages, ["failed", "Suppressed 1 similar messages: failed"]
+        )
+        self.assertIsNone(limiter._timer)
+
+    def test_non_string_messages(self):
+        with self.context(RateLimitFilter(rate=0, burst=1)):
+            self.logger.error({"event": "a"})
+            self.logger.error({"event": "b"})
+
+        self.assertListEqual(
+            self.handler.messages,
+            ["{'event': 'a'}", "Suppressed 1 similar messages: dict messages"],
+        )
@@ -0,0 +1,203 @@
+import io
+import logging
+import os
+import sys
+import tempfile
+import unittest
+from styled_logging import (
+    MultiFormatter,
+    RawFileHandler,
+    RawStreamHandler,
+    create_console_handler,
+    create_file_handler,
+    instrument,
+    logging_context,
+)
+
+
+class TestRawHandlers(unittest.TestCase):
+    def setUp(self) -> None:
+        self.logger = logging.getLogger(f"{__name__}.{self.id()}")
+        self.logger.propagate = False
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+
+    def log(self, handler: logging.Handler):
+        records = [
+            logging.makeLogRecord(
+                {"levelno": level, "levelname": logging.getLevelName(level), **attrs}
+            )
+            for level, attrs in (
+                (logging.DEBUG, {"msg": "debug %s", "args": ("ünïcode",)}),
+                (logging.INFO, {"msg": "info %d%%", "args": (50,)}),
+                (logging.WARNING, {"msg": "warning"}),
+                (logging.ERROR, {"msg": "error %s", "args": ("x",), "stack_info": "s"}),
+            )
+        ]
+
+        try:
+            raise ValueError("raised")
+        except ValueError:
+            records.append(
+                self.logger.makeRecord(
+                    self.logger.name,
+                    logging.ERROR,
+                    __file__,
+                    0,
+                    "exception",
+                    (),
+                    sys.exc_info(),
+                )
+            )
+
+        for record in records:
+            handler.handle(record)
+
+    def text_output(self, formatter: logging.Formatter) -> str:
+        handler = logging.StreamHandler(io.StringIO())
+        handler.setLevel(logging.DEBUG)
+        handler.setFormatter(formatter)
+        self.log(handler)
+        return handler.stream.getvalue()
+
+    def raw_output(self, formatter: logging.Formatter) -> str:
+        path = os.path.join(self.tmpdir.name, "raw.log")
+
+        with open(path, "w", encoding="utf-8") as stream:
+            handler = RawStreamHandler(stream)
+            handler.setLevel(logging.DEBUG)
+            handler.setFormatter(formatter)
+            self.log(handler)
+
+        with open(path, encoding="utf-8") as f:
+            return f.read()
+
+    def test_matches_stream_handler(self):
+        formatters = {
+            "color": MultiFormatter(),
+            "uncached": MultiFormatter(template_cache_size=0),
+            "stdlib": logging.Formatter("%(levelname)s %(message)s"),
+        }
+
+        for name, formatter in formatters.items():
+            with self.subTest(name):
+                self.assertEqual(
+                    self.raw_output(formatter), self.text_output(formatter)
+                )
+
+    def test_uses_template_cache(self):
+        formatter = MultiFormatter()
+        handler = RawStreamHandler(open(os.devnull, "w"))
+        handler.setFormatter(formatter)
+
+        with logging_context(self.logger, handlers=[handler]):
+            for i in range(5):
+                self.logger.warning("item %d", i)
+        handler.stream.close()
+
+        info = formatter.template_cache_info()
+        self.assertEqual((info.hits, info.misses), (4, 1))
+
+    def test_stream_without_errors(self):
+        class Stream:
+            def __init__(self, f):
+                self.fileno = f.fileno
+                self.flush = f.flush
+
+        path = os.path.join(self.tmpdir.name, "test.log")
+
+        with open(path, "wb") as f:
+            handler = RawStreamHandler(Stream(f))
+            with logging_context(self.logger, handlers=[handler]):
+                self.logger.warning("warning")
+
+        with open(path, encoding="utf-8") as f:
+            self.assertEqual(f.read(), "warning\n")
+
+    def test_encodes_per_stream(self):
+        formatter = logging.Formatter("%(message)s")
+        path = os.path.join(self.tmpdir.name, "latin.log")
+
+        with open(path, "w", encoding="latin-1", errors="replace") as stream:
+            handler = RawStreamHandler(stream)
+            handler.setFormatter(formatter)
+            with logging_context(self.logger, handlers=[handler]):
+                self.logger.warning("é €")
+
+        with open(path, "rb") as f:
+            self.assertEqual(f.read(), "é ?\n".encode("latin-1"))
+
+    def test_text_stream_fallback(self):
+        handler = RawStreamHandler(io.StringIO())
+
+        with logging_context(self.logger, handlers=[handler]):
+            self.logger.warning("warning")
+
+        self.assertEqual(handler.stream.getvalue(), "warning\n")
+
+    def test_stream_replaced(self):
+        handler = create_console_handler(color=False)
+        handler.stream = io.StringIO()
+
+        with logging_context(self.logger, handlers=[handler]):
+            self.logger.warning("warning")
+
+        self.assertIsInstance(handler, RawStreamHandler)
+        self.assertIn("warning", handler.stream.getvalue())
+
+    def test_file_handler(self):
+        path = os.path.join(self.tmpdir.name, "test.log")
+        handler = create_file_handler(path)
+
+        self.assertIsInstance(handler, RawFileHandler)
+
+        with logging_context(self.logger, handlers=[handler]):
+            self.logger.warning("first")
+            self.logger.error("é")
+
+        with open(path, encoding="utf-8") as f:
+            lines = f.read().splitlines()
+
+        self.assertEqual(len(lines), 2)
+        self.assertTrue(lines[1].endswith("é"))
+
+    def test_file_handler_delay(self):
+        path = os.path.join(self.tmpdir.name, "delayed.log")
+        handler = RawFileHandler(path, delay=True)
+
+        self.assertFalse(os.path.exists(path))
+
+        with logging_context(self.logger, handlers=[handler]):
+            self.logger.warning("warning")
+
+        with open(path) as f:
+            self.assertEqual(f.read(), "warning\n")
+
+    def test_file_handler_reopens(self):
+        path = os.path.join(self.tmpdir.name, "reopened.log")
+
+        for mode, expected in (("a", "first\nsecond\n"), ("w", "first\n")):
+            with self.subTest(mode=mode):
+                handler = RawFileHandler(path, mode=mode)
+                handler.setFormatter(logging.Formatter("%(message)s"))
+                handler.handle(logging.makeLogRecord({"msg": "first"}))
+                handler.close()
+                handler.handle(logging.makeLogRecord({"msg": "second"}))
+                handler.close()
+
+                with open(path) as f:
+                    self.assertEqual(f.read(), expected)
+                os.remove(path)
+
+    def test_instrument_counts_bytes(self):
+        path = os.path.join(self.tmpdir.name, "stats.log")
+        handler = create_file_handler(path, stats=True)
+
+        with logging_context(self.logger, handlers=[handler]):
+            self.logger.warning("first %s", "é")
+            self.logger.error("second")
+
+        self.assertEqual(handler.stats.bytes, os.path.getsize(path))
+        self.assertDictEqual(
+            handler.stats.snapshot()["records"], {"WARNING": 1, "ERROR": 1}
+        )
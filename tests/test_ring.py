@@ -0,0 +1,85 @@
+import io
+import logging
+import unittest
+from styled_logging import (
+    RingBufferHandler,
+    create_console_handler,
+    create_ring_buffer_handler,
+    logging_context,
+)
+from .helpers import ListHandler
+
+
+class TestRingBufferHandler(unittest.TestCase):
+    def setUp(self) -> None:
+        self.logger = logging.getLogger(f"{__name__}.{self.id()}")
+        self.logger.propagate = False
+        self.target = ListHandler(logging.INFO)
+
+    def test_keeps_debug_until_error(self):
+        handler = RingBufferHandler(self.target, capacity=10)
+        with logging_context(self.logger, handlers=[handler]):
+            self.logger.debug("step 1")
+            self.logger.info("started")
+            self.logger.debug("step 2")
+
+            self.assertListEqual(self.target.messages, ["started"])
+            self.assertEqual(len(handler.records()), 2)
+
+            self.logger.error("failed")
+
+        self.assertListEqual(
+            self.target.messages, ["started", "step 1", "step 2", "failed"]
+        )
+        self.assertEqual(len(handler.records()), 0)
+
+    def test_overwrites_oldest(self):
+        handler = RingBufferHandler(self.target, capacity=3)
+        with logging_context(self.logger, handlers=[handler]):
+            for i in range(5):
+                self.logger.debug("step %d", i)
+
+            self.assertListEqual(
+                [r.getMessage() for r in handler.records()],
+                ["step 2", "step 3", "step 4"],
+            )
+
+            self.logger.critical("failed")
+
+        self.assertListEqual(
+            self.target.messages, ["step 2", "step 3", "step 4", "failed"]
+        )
+
+    def test_snapshots_kept_records(self):
+        handler = RingBufferHandler(self.target, capacity=3)
+        with logging_context(self.logger, handlers=[handler]):
+            items = [1]
+            self.logger.debug("items %s", items)
+            items.append(2)
+
+            self.logger.error("failed")
+
+        self.assertListEqual(self.target.messages, ["items [1]", "failed"])
+
+    def test_warning_does_not_trigger(self):
+        handler = RingBufferHandler(self.target, capacity=3)
+        with logging_context(self.logger, handlers=[handler]):
+            self.logger.debug("step")
+            self.logger.warning("careful")
+
+        self.assertListEqual(self.target.messages, ["careful"])
+
+    def test_rejects_empty_ring(self):
+        with self.assertRaises(ValueError):
+            RingBufferHandler(self.target, capacity=0)
+
+    def test_factory_formats_with_console_formatter(self):
+        console = create_console_handler(color=False)
+        console.stream = io.StringIO()
+        handler = create_ring_buffer_handler(console, capacity=5)
+
+        with logging_context(self.logger, handlers=[handler]):
+            self.logger.debug("step")
+            self.logger.error("failed")
+
+        self.assertEqual(console.stream.getvalue(), "DEBUG | step\nERROR | failed\n")
@@ -0,0 +1,108 @@
+import gzip
+import logging
+import os
+import time
+import unittest
+from unittest import mock
+from click.testing import CliRunner
+from styled_logging import RotatingFileHandler, create_file_handler
+
+
+def make_record(msg: str):
+    return logging.LogRecord("test", logging.INFO, __file__, 0, msg, None, None)
+
+
+class TestRotatingFileHandler(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.runner = CliRunner()
+
+    def make_handler(self, filename: str, **kwargs):
+        handler = RotatingFileHandler(filename, **kwargs)
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        return handler
+
+    def rotated(self):
+        return sorted(f for f in os.listdir() if f != "log.log")
+
+    def test_rotates_by_size(self):
+        with self.runner.isolated_filesystem():
+            handler = self.make_handler("log.log", max_bytes=10)
+            for msg in ("aaaa", "bbbb", "cccc"):
+                handler.handle(make_record(msg))
+            handler.close()
+
+            rotated = self.rotated()
+            self.assertEqual(len(rotated), 1)
+            self.assertTrue(rotated[0].endswith(".gz"))
+
+            with gzip.open(rotated[0], "rt") as f:
+                self.assertEqual(f.read(), "aaaa\nbbbb\n")
+
+            with open("log.log", "r") as f:
+                self.assertEqual(f.read(), "cccc\n")
+
+    def test_counts_bytes(self):
+        with self.runner.isolated_filesystem():
+            handler = self.make_handler("log.log", max_bytes=10, encoding="utf-8")
+            for msg in ("éé", "éé", "éé"):
+                handler.handle(make_record(msg))
+            handler.close()
+
+            rotated = self.rotated()
+            self.assertEqual(len(rotated), 1)
+
+            with gzip.open(rotated[0], "rb") as f:
+                self.assertEqual(f.read(), "éé\néé\n".encode("utf-8"))
+
+    def test_closes_before_renaming(self):
+        rename = os.rename
+
+        def check_closed(src, dst):
+            self.assertTrue(handler.stream.closed)
+            rename(src, dst)
+
+        with self.runner.isolated_filesystem():
+            handler = self.make_handler("log.log", max_bytes=1, compress=False)
+            with mock.patch("os.rename", check_closed):
+                handler.handle(make_record("a"))
+                handler.handle(make_record("b"))
+            handler.close()
+
+            self.assertEqual(len(self.rotated()), 1)
+
+    def test_rotates_by_time(self):
+        with self.runner.isolated_filesystem():
+            handler = self.make_handler("log.log", interval=0.01, compress=False)
+            handler.handle(make_record("a"))
+            time.sleep(0.02)
+            handler.handle(make_record("b"))
+            handler.close()
+
+            rotated = self.rotated()
+            self.assertEqual(len(rotated), 1)
+
+            with open(rotated[0], "r") as f:
+                self.assertEqual(f.read(), "a\n")
+
+    def test_keeps_backup_count(self):
+        with self.runner.isolated_filesystem():
+            handler = self.make_handler("log.log", max_bytes=1, backup_count=2)
+            for msg in "abcde":
+                handler.handle(make_record(msg))
+            handler.close()
+
+            rotated = self.rotated()
+            self.assertEqual(len(rotated), 2)
+
+            with gzip.open(rotated[-1], "rt") as f:
+                self.assertEqual(f.read(), "d\n")
+
+    def test_factory(self):
+        with self.runner.isolated_filesystem():
+            handler = create_file_handler("log.log", max_bytes=1024)
+            self.assertIsInstance(handler, RotatingFileHandler)
+            handler.close()
+
+            with self.assertRaises(ValueError):
+                create_file_handler("log.log", max_bytes=1024, buffered=True)
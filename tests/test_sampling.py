@@ -0,0 +1,84 @@
+import logging
+import unittest
+from styled_logging import SamplingFilter, logging_context
+from .helpers import ListHandler
+
+
+class TestSamplingFilter(unittest.TestCase):
+    def setUp(self) -> None:
+        self.logger = logging.getLogger(f"{__name__}.{self.id()}")
+        self.logger.propagate = False
+        self.handler = ListHandler(logging.DEBUG)
+
+    def context(self, sampling: SamplingFilter):
+        return logging_context(self.logger, handlers=[self.handler], sampling=sampling)
+
+    def test_deterministic(self):
+        sampling = SamplingFilter({logging.INFO: 0.1}, deterministic=True)
+        with self.context(sampling):
+            for i in range(100):
+                self.logger.info("%d", i)
+
+        self.assertListEqual(self.handler.messages, [str(i) for i in range(0, 100, 10)])
+        self.assertEqual(sampling.sampled_out, 90)
+        self.assertEqual(sampling.counts[("", logging.INFO)], 90)
+
+    def test_probabilistic(self):
+        sampling = SamplingFilter({logging.DEBUG: 0.5}, seed=0)
+        with self.context(sampling):
+            for i in range(1000):
+                self.logger.debug("%d", i)
+
+        self.assertEqual(len(self.handler.messages) + sampling.sampled_out, 1000)
+        self.assertTrue(400 < len(self.handler.messages) < 600)
+
+    def test_unsampled_levels_pass(self):
+        sampling = SamplingFilter({logging.DEBUG: 0, logging.INFO: 0})
+        with self.context(sampling):
+            self.logger.info("info")
+            self.logger.warning("warning")
+            self.logger.error("error")
+
+        self.assertListEqual(self.handler.messages, ["warning", "error"])
+
+    def test_logger_overrides(self):
+        child = self.logger.getChild("x.y")
+        sampling = SamplingFilter(
+            {logging.INFO: 0}, loggers={f"{self.logger.name}.x": {logging.INFO: 1}}
+        )
+        with self.context(sampling):
+            self.logger.info("parent")
+            child.info("child")
+
+        self.assertListEqual(self.handler.messages, ["child"])
+        self.assertEqual(sampling.counts[("", logging.INFO)], 1)
+
+    def test_runs_before_other_filters(self):
+        seen = []
+
+        def record_filter(record):
+            seen.append(record.getMessage())
+            return True
+
+        sampling = SamplingFilter({logging.INFO: 0})
+        with logging_context(
+            self.logger,
+            handlers=[self.handler],
+            sampling=sampling,
+            filters=[record_filter],
+        ):
+            self.logger.info("info")
+            self.logger.warning("warning")
+
+        self.assertListEqual(seen, ["warning"])
+
+    def test_deterministic_zero_drops_all(self):
+        sampling = SamplingFilter({logging.INFO: 0}, deterministic=True)
+        with self.context(sampling):
+            self.logger.info("info")
+
+        self.assertListEqual(self.handler.messages, [])
+
+    def test_rejects_bad_rate(self):
+        with self.assertRaises(ValueError):
+            SamplingFilter({logging.INFO: 2})
@@ -0,0 +1,107 @@
+import asyncio
+import logging
+import threading
+import unittest
+from styled_logging import logging_context, ScopedLoggingContext
+from .helpers import ListHandler
+
+
+class TestScopedContext(unittest.TestCase):
+    def setUp(self) -> None:
+        self.logger = logging.getLogger(f"{__name__}.{self.id()}")
+        self.logger.propagate = False
+        self.logger.setLevel(logging.DEBUG)
+
+    def test_scoped_to_thread(self):
+        handlers = [ListHandler(logging.DEBUG), ListHandler(logging.DEBUG)]
+        entered = threading.Barrier(2)
+
+        def work(name: str, handler: logging.Handler):
+            with logging_context(self.logger, handlers=[handler], scoped=True):
+                entered.wait()
+                self.logger.debug(name)
+                entered.wait()
+
+        threads = [
+            threading.Thread(target=work, args=(name, handler))
+            for name, handler in zip("ab", handlers)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertListEqual([h.messages for h in handlers], [["a"], ["b"]])
+
+    def test_scoped_to_task(self):
+        handlers = [ListHandler(logging.DEBUG), ListHandler(logging.INFO)]
+
+        async def work(name: str, handler: logging.Handler):
+            with ScopedLoggingContext(self.logger, handlers=[handler]):
+                await asyncio.sleep(0)
+                self.logger.debug(f"{name} debug")
+                await asyncio.sleep(0)
+                self.logger.info(f"{name} info")
+
+        async def main():
+            await asyncio.gather(*(work(n, h) for n, h in zip("ab", handlers)))
+
+        asyncio.run(main())
+
+        self.assertListEqual(
+            [h.messages for h in handlers], [["a debug", "a info"], ["b info"]]
+        )
+
+    def test_nested(self):
+        outer, inner = ListHandler(), ListHandler()
+
+        with ScopedLoggingContext(self.logger, handlers=[outer]):
+            with ScopedLoggingContext(self.logger, handlers=[inner]):
+                self.logger.warning("both")
+            self.logger.warning("outer")
+
+        self.logger.warning("none")
+
+        self.assertListEqual(outer.messages, ["both", "outer"])
+        self.assertListEqual(inner.messages, ["both"])
+
+    def test_other_threads_unaffected(self):
+        global_handler, scoped = ListHandler(logging.INFO), ListHandler(logging.DEBUG)
+        self.logger.addHandler(global_handler)
+        self.addCleanup(self.logger.removeHandler, global_handler)
+        entered, logged = threading.Event(), threading.Event()
+
+        def work():
+            with ScopedLoggingContext(self.logger, handlers=[scoped]):
+                entered.set()
+                logged.wait()
+                self.logger.debug("scoped")
+
+        thread = threading.Thread(target=work)
+        thread.start()
+        entered.wait()
+
+        self.logger.debug("main")
+        self.logger.info("info")
+        logged.set()
+        thread.join()
+
+        self.assertListEqual(global_handler.messages, ["info"])
+        self.assertListEqual(scoped.messages, ["scoped"])
+        self.assertEqual(self.logger.level, logging.DEBUG)
+        self.assertListEqual(self.logger.handlers, [global_handler])
+
+    def test_leaves_logger_as_it_was(self):
+        self.logger.setLevel(logging.WARNING)
+        scoped = ListHandler(logging.DEBUG)
+
+        with ScopedLoggingContext(self.logger, handlers=[scoped]):
+            with ScopedLoggingContext(self.logger, handlers=[ListHandler()]):
+                self.assertEqual(len(self.logger.handlers), 1)
+                self.logger.info("below the logger level")
+            self.logger.warning("warning")
+
+        self.assertListEqual(scoped.messages, ["warning"])
+        self.assertEqual(self.logger.level, logging.WARNING)
+        # so logging.lastResort and basicConfig work again
+        self.assertListEqual(self.logger.handlers, [])
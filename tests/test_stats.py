@@ -0,0 +1,66 @@
+import io
+import logging
+import os
+import tempfile
+import unittest
+from styled_logging import (
+    create_console_handler,
+    create_file_handler,
+    instrument,
+    logging_context,
+)
+
+
+class TestInstrument(unittest.TestCase):
+    def setUp(self) -> None:
+        self.logger = logging.getLogger(f"{__name__}.{self.id()}")
+        self.logger.propagate = False
+
+    def test_console_stats(self):
+        handler = create_console_handler(color=False, stats=True)
+        handler.stream = io.StringIO()
+
+        with logging_context(self.logger, handlers=[handler]):
+            self.logger.info("first")
+            self.logger.info("second")
+            self.logger.error("é")
+
+        snapshot = handler.stats.snapshot()
+
+        self.assertDictEqual(snapshot["records"], {"INFO": 2, "ERROR": 1})
+        self.assertEqual(
+            snapshot["bytes"], len(handler.stream.getvalue().encode("utf-8"))
+        )
+        self.assertGreater(snapshot["format_time"], 0)
+        self.assertGreaterEqual(snapshot["emit_time"], 0)
+        self.assertNotIn("queue_depth", snapshot)
+
+    def test_background_stats(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "test.log")
+            handler = create_file_handler(path, background=True, stats=True)
+
+            with logging_context(self.logger, handlers=[handler]):
+                self.logger.warning("warning")
+
+            snapshot = handler.stats.snapshot()
+
+        self.assertDictEqual(snapshot["records"], {"WARNING": 1})
+        self.assertEqual(snapshot["queue_depth"], 0)
+        self.assertEqual(snapshot["dropped"], 0)
+
+    def test_disabled_by_default(self):
+        handler = create_console_handler(color=False)
+
+        self.assertFalse(hasattr(handler, "stats"))
+        self.assertNotIn("emit", vars(handler))
+
+    def test_instrument_any_handler(self):
+        handler = logging.StreamHandler(io.StringIO())
+        stats = instrument(handler)
+
+        with logging_context(self.logger, handlers=[handler]):
+            self.logger.warning("message")
+
+        self.assertIs(handler.stats, stats)
+        self.assertEqual(stats.bytes, len("message\n"))
@@ -0,0 +1,65 @@
+import json
+import logging
+import sys
+import unittest
+from click.testing import CliRunner
+from styled_logging import JsonFormatter, create_file_handler, logging_context
+
+
+class TestJsonFormatter(unittest.TestCase):
+    def setUp(self) -> None:
+        self.formatter = JsonFormatter()
+
+    def make_record(self, exc_info=None, **extra):
+        record = logging.LogRecord(
+            __name__, logging.ERROR, __file__, 0, "message %s", ("arg",), exc_info
+        )
+        record.__dict__.update(extra)
+        return record
+
+    def test_fields(self):
+        data = json.loads(self.formatter.format(self.make_record(user="me", n=1)))
+
+        self.assertEqual(data["level"], "ERROR")
+        self.assertEqual(data["name"], __name__)
+        self.assertEqual(data["message"], "message arg")
+        self.assertEqual(data["user"], "me")
+        self.assertEqual(data["n"], 1)
+        self.assertIn("time", data)
+        self.assertNotIn("exc_info", data)
+
+    def test_unserializable_extra(self):
+        data = json.loads(self.formatter.format(self.make_record(obj=object())))
+
+        self.assertTrue(data["obj"].startswith("<object"))
+
+    def test_exception(self):
+        try:
+            raise ValueError("error")
+        except ValueError:
+            record = self.make_record(sys.exc_info())
+
+        data = json.loads(self.formatter.format(record))
+
+        self.assertIn("ValueError: error", data["exc_info"])
+        self.assertNotIn("\033[", data["exc_info"])
+
+
+class TestJsonFileHandler(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.runner = CliRunner()
+
+    def test_logs_json_lines(self):
+        filename = "log.log"
+        with self.runner.isolated_filesystem():
+            with logging_context(
+                handlers=[create_file_handler(filename, level=logging.INFO, json=True)]
+            ):
+                logging.info("first")
+                logging.warning("second")
+
+            with open(filename, "r") as f:
+                lines = [json.loads(line) for line in f]
+
+            self.assertListEqual([d["message"] for d in lines], ["first", "second"])
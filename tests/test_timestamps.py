@@ -0,0 +1,65 @@
+import logging
+import re
+import unittest
+from unittest import mock
+from styled_logging import prettify, set_time_format
+from styled_logging.timestamps import TimestampCache
+
+
+def make_record(created: float):
+    record = logging.makeLogRecord({"msg": "message"})
+    record.created = created
+    record.msecs = int((created - int(created)) * 1000) + 0.0
+    return record
+
+
+class TestTimestampCache(unittest.TestCase):
+    def test_matches_logging_formatter(self):
+        pretty = prettify(logging.Formatter)("%(asctime)s %(message)s")
+        plain = logging.Formatter("%(asctime)s %(message)s")
+
+        for created in (1700000000.0, 1700000000.5, 1700000001.25, 1700003600.999):
+            record = make_record(created)
+            self.assertEqual(pretty.format(record), plain.format(record))
+
+    def test_matches_datefmt(self):
+        pretty = prettify(logging.Formatter)("%(asctime)s", datefmt="%d/%m %H:%M:%S")
+        plain = logging.Formatter("%(asctime)s", datefmt="%d/%m %H:%M:%S")
+        record = make_record(1700000000.5)
+
+        self.assertEqual(pretty.format(record), plain.format(record))
+
+    def test_formats_each_second_once(self):
+        cache = TimestampCache()
+        with mock.patch("time.strftime", return_value="time") as strftime:
+            for created in (1.0, 1.1, 1.9, 2.0, 2.5):
+                cache.format(created, (created % 1) * 1000)
+
+        self.assertEqual(strftime.call_count, 2)
+
+    def test_iso_utc(self):
+        cache = TimestampCache(utc=True, iso=True)
+
+        self.assertEqual(cache.format(0.25, 250), "1970-01-01T00:00:00.250Z")
+
+    def test_iso_local(self):
+        cache = TimestampCache(iso=True)
+
+        self.assertRegex(
+            cache.format(1700000000.5, 500),
+            r"^\d{4}-\d\d-\d\dT\d\d:\d\d:\d\d\.500[+-]\d\d:\d\d$",
+        )
+
+    def test_set_time_format(self):
+        self.addCleanup(set_time_format)
+        formatter = prettify(logging.Formatter)("%(asctime)s")
+
+        set_time_format(iso=True, utc=True)
+
+        self.assertEqual(formatter.format(make_record(0.0)), "1970-01-01T00:00:00.000Z")
+
+    def test_custom_converter_is_respected(self):
+        formatter = prettify(logging.Formatter)("%(asctime)s")
+        formatter.converter = lambda secs: (2000, 1, 1, 0, 0, 0, 0, 1, 0)
+
+        self.assertTrue(formatter.format(make_record(0.0)).startswith("2000-01-01"))